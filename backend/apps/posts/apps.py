@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class PostsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.posts"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import install_sqlite_triggers
+
+        post_migrate.connect(install_sqlite_triggers, sender=self)
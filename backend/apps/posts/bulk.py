@@ -0,0 +1,148 @@
+"""Bulk post import shared by ``POST /api/posts/bulk/`` and ``import_posts``.
+
+A batch costs a fixed number of statements whatever its size: referenced
+categories and tags are resolved by ``taxonomy_cache`` (at most one query
+each, for ids missing from its snapshot), then one slug probe per collision
+round, one multi-row ``INSERT`` for the posts and one for their tag rows,
+plus one ``UPDATE`` per distinct category/tag count delta. ``Post.save()``
+and the signals do not run, so content metrics are filled in here and the
+post counts and response cache are updated explicitly.
+"""
+
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from . import cache as response_cache
+from . import taxonomy, taxonomy_cache
+from .models import SLUG_INSERT_ATTEMPTS, Category, Post, Tag
+
+BULK_MAX_POSTS = 1000
+
+
+class PostImportSerializer(serializers.Serializer):
+    """One imported post; same input fields as ``PostSerializer``.
+
+    ``category`` and ``tags_input`` are only type-checked here; the batch
+    resolves them against ``taxonomy_cache``.
+    """
+
+    title = serializers.CharField(max_length=255)
+    content = serializers.CharField()
+    is_published = serializers.BooleanField(default=False)
+    category = serializers.IntegerField(required=False, allow_null=True)
+    tags_input = serializers.ListField(
+        child=serializers.IntegerField(), required=False, default=list
+    )
+
+
+def _slugs_by_pk(model, ids):
+    found = taxonomy_cache.instances(model, ids)
+    return {pk: instance.slug for pk, instance in found.items()}
+
+
+def _does_not_exist(pk):
+    # Same wording as PrimaryKeyRelatedField.
+    return f'Invalid pk "{pk}" - object does not exist.'
+
+
+def validate_batch(items):
+    """Validate raw post dicts.
+
+    Returns ``(rows, errors)``: the validated data of every valid item
+    (plus the ``category_slug`` / ``tag_slugs`` it resolved to) and a
+    ``{index: errors}`` dict for the rest.
+    """
+    validated, errors = {}, {}
+    for index, item in enumerate(items):
+        serializer = PostImportSerializer(data=item)
+        if serializer.is_valid():
+            validated[index] = serializer.validated_data
+        else:
+            errors[index] = serializer.errors
+
+    categories = _slugs_by_pk(
+        Category,
+        {data["category"] for data in validated.values() if data.get("category")},
+    )
+    tags = _slugs_by_pk(
+        Tag, {pk for data in validated.values() for pk in data["tags_input"]}
+    )
+    for index, data in list(validated.items()):
+        item_errors = {}
+        category = data.get("category")
+        if category is not None and category not in categories:
+            item_errors["category"] = [_does_not_exist(category)]
+        bad_tags = [pk for pk in data["tags_input"] if pk not in tags]
+        if bad_tags:
+            item_errors["tags_input"] = [_does_not_exist(pk) for pk in bad_tags]
+        if item_errors:
+            errors[index] = item_errors
+            del validated[index]
+            continue
+        data["category_slug"] = categories.get(category)
+        data["tag_slugs"] = [tags[pk] for pk in data["tags_input"]]
+
+    return list(validated.values()), errors
+
+
+def import_batch(rows, author):
+    """Create posts for validated ``rows`` and return them.
+
+    If a concurrent writer takes one of the allocated slugs before the
+    insert, the batch is rolled back to its savepoint, given fresh slugs
+    and inserted again.
+    """
+    if not rows:
+        return []
+
+    titles = [data["title"] for data in rows]
+    posts = []
+    for data, slug in zip(rows, Post.generate_unique_slugs(titles)):
+        post = Post(
+            title=data["title"],
+            slug=slug,
+            content=data["content"],
+            is_published=data["is_published"],
+            category_id=data.get("category"),
+            author=author,
+        )
+        post.refresh_content_metrics()
+        posts.append(post)
+
+    for attempt in range(SLUG_INSERT_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                _insert(posts, rows)
+            break
+        except IntegrityError:
+            slugs = [post.slug for post in posts]
+            last_attempt = attempt == SLUG_INSERT_ATTEMPTS - 1
+            if last_attempt or not Post.objects.filter(slug__in=slugs).exists():
+                raise
+            for post, slug in zip(posts, Post.generate_unique_slugs(titles)):
+                post.pk, post.slug = None, slug
+
+    response_cache.bump(_list_scopes(rows))
+    return posts
+
+
+def _insert(posts, rows):
+    tag_ids = [list(dict.fromkeys(data["tags_input"])) for data in rows]
+    Post.objects.bulk_create(posts)
+    Post.tags.through.objects.bulk_create(
+        Post.tags.through(post_id=post.pk, tag_id=tag_id)
+        for post, post_tag_ids in zip(posts, tag_ids)
+        for tag_id in post_tag_ids
+    )
+    # bulk_create sends no signals, so the category/tag counts move here.
+    taxonomy.posts_created(posts, tag_ids)
+
+
+def _list_scopes(rows):
+    """New posts only show up in lists: the feed and their filter scopes."""
+    scopes = {response_cache.LIST_SCOPE}
+    for data in rows:
+        if data["category_slug"]:
+            scopes.add(f"category:{data['category_slug']}")
+        scopes.update(f"tag:{slug}" for slug in data["tag_slugs"])
+    return scopes
@@ -0,0 +1,196 @@
+"""Versioned response cache for anonymous post reads.
+
+Cached responses are keyed by the full request path (so every query
+parameter counts) plus the current value of one or more *generation*
+counters. Writes never delete cached entries; they bump the generations
+that cover the changed post, which orphans exactly the affected entries:
+
+- ``list``: the unfiltered post list (including search/ordering/pages)
+- ``category:<slug>`` / ``tag:<slug>``: lists filtered by that slug
+- ``post:<slug>``: the post's detail page
+- ``taxonomy``: every cached response, since posts render their category
+  and tag names; bumped by category/tag writes (see ``taxonomy_cache``)
+
+Orphaned entries simply age out through the cache timeout. Generations
+only mean anything when every worker reads them from the same cache, so
+the response cache is off unless ``POST_CACHE_SHARED`` is set.
+"""
+
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+KEY_PREFIX = "posts"
+CACHE_HEADER = "X-Cache"
+
+LIST_SCOPE = "list"
+TAXONOMY_SCOPE = "taxonomy"
+CATEGORY_FILTER_PARAM = "category__slug"
+TAG_FILTER_PARAM = "tags__slug"
+TAGS_FILTER_PARAM = "tags"
+
+
+class CacheStats:
+    """Process-local hit/miss counters for the response cache."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+stats = CacheStats()
+
+
+def _generation_key(scope):
+    return f"{KEY_PREFIX}:gen:{scope}"
+
+
+def _seed():
+    # Time-based seeds keep an evicted generation from restarting at a value
+    # whose entries may still be cached.
+    return time.time_ns()
+
+
+def get_generations(scopes):
+    """Return the current generation for each scope, seeding missing ones."""
+    keys = [_generation_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        for key in missing:
+            cache.add(key, _seed(), timeout=None)
+        found.update(cache.get_many(missing))
+    return [found.get(key, 0) for key in keys]
+
+
+def bump(scopes):
+    """Advance the given generations now and again once the transaction commits.
+
+    The immediate bump stops stale hits while the write is in flight; the
+    deferred one discards anything re-cached from pre-commit data.
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+
+    def _bump():
+        for scope in scopes:
+            key = _generation_key(scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _seed(), timeout=None)
+
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def post_scopes(slug, category_slugs=(), tag_slugs=()):
+    """Return every generation scope that shows the given post."""
+    scopes = {LIST_SCOPE, f"post:{slug}"}
+    scopes.update(f"category:{category}" for category in category_slugs if category)
+    scopes.update(f"tag:{tag}" for tag in tag_slugs if tag)
+    return scopes
+
+
+def taxonomy_scopes(model_name, slugs):
+    """Return the scopes showing a category or tag (``model_name``) by slug."""
+    scopes = {LIST_SCOPE}
+    scopes.update(f"{model_name}:{slug}" for slug in slugs if slug)
+    return scopes
+
+
+def list_scopes(request):
+    """Return the generation scopes a list request depends on.
+
+    Filtered lists depend only on their filter generations, so a write in
+    one category leaves the other categories' cached pages untouched.
+    """
+    params = request.query_params
+    scopes = []
+    if params.get(CATEGORY_FILTER_PARAM):
+        scopes.append(f"category:{params[CATEGORY_FILTER_PARAM]}")
+    if params.get(TAG_FILTER_PARAM):
+        scopes.append(f"tag:{params[TAG_FILTER_PARAM]}")
+    tag_slugs = {slug.strip() for slug in params.get(TAGS_FILTER_PARAM, "").split(",")}
+    scopes.extend(f"tag:{slug}" for slug in sorted(tag_slugs) if slug)
+    return scopes or [LIST_SCOPE]
+
+
+def _response_key(kind, request, generations):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    version = ".".join(str(generation) for generation in generations)
+    return f"{KEY_PREFIX}:resp:{kind}:{version}:{path}"
+
+
+def cached_response(kind, request, scopes, render):
+    """Serve an anonymous GET from the cache, or call ``render`` and store it.
+
+    Only ``200`` responses for anonymous users are cached, since
+    authenticated responses may carry per-user data. Nothing is cached
+    unless ``POST_CACHE_SHARED`` says every worker sees the same cache.
+    """
+    if request.user.is_authenticated or not settings.POST_CACHE_SHARED:
+        return render()
+
+    key = _response_key(kind, request, get_generations([*scopes, TAXONOMY_SCOPE]))
+    data = cache.get(key)
+    if data is not None:
+        stats.record(hit=True)
+        return Response(data, headers={CACHE_HEADER: "HIT"})
+
+    stats.record(hit=False)
+    response = render()
+    if response.status_code == 200:
+        cache.set(key, response.data, timeout=settings.POST_RESPONSE_CACHE_TIMEOUT)
+        response[CACHE_HEADER] = "MISS"
+    return response
+
+
+class CachedPostListMixin:
+    """Cache anonymous ``list()`` responses by query string and filter scopes."""
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(
+            "list",
+            request,
+            list_scopes(request),
+            lambda: super(CachedPostListMixin, self).list(request, *args, **kwargs),
+        )
+
+
+class CachedPostDetailMixin:
+    """Cache anonymous ``retrieve()`` responses per post slug."""
+
+    def retrieve(self, request, *args, **kwargs):
+        slug = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return cached_response(
+            "detail",
+            request,
+            [f"post:{slug}"],
+            lambda: super(CachedPostDetailMixin, self).retrieve(
+                request, *args, **kwargs
+            ),
+        )
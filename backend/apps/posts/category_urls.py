@@ -3,5 +3,5 @@ from django.urls import path
 from .views import CategoryListCreateAPIView
 
 urlpatterns = [
-    path("", CategoryListCreateAPIView.as_view()),
+    path("", CategoryListCreateAPIView.as_view(), name="category-list-create"),
 ]
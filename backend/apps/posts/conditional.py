@@ -0,0 +1,70 @@
+"""ETag / Last-Modified support for read endpoints.
+
+Each endpoint computes its validators cheaply (a row lookup, or the
+response-cache generations for lists) before any serialization happens, so a
+matching ``If-None-Match`` / ``If-Modified-Since`` is answered with ``304``
+without building the response body.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(request, *parts):
+    """Build a strong ETag from the request path, the negotiated media type
+    (JSON and MessagePack bodies differ) and the validator parts."""
+    media_type = getattr(request, "accepted_media_type", "")
+    raw = "|".join(str(part) for part in (request.get_full_path(), media_type, *parts))
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def conditional_response(request, etag, last_modified, render):
+    """Return ``304`` when the client's validators match, else ``render()``.
+
+    ``last_modified`` is an aware datetime or ``None``. Validators are
+    attached to both the ``304`` and the full ``200`` response.
+    """
+    headers = {"ETag": etag}
+    timestamp = None
+    if last_modified is not None:
+        timestamp = int(last_modified.timestamp())
+        headers["Last-Modified"] = http_date(timestamp)
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if not_modified is not None:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response = render()
+    if response.status_code == status.HTTP_200_OK:
+        for name, value in headers.items():
+            response[name] = value
+    return response
+
+
+class ConditionalGetMixin:
+    """Answer conditional GETs on generic views before serializing.
+
+    Views implement ``get_validators(request, *args, **kwargs)`` returning
+    ``(etag, last_modified)``, or ``None`` to skip conditional handling
+    (for example when the object does not exist and the normal 404 path
+    should run).
+    """
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+        etag, last_modified = validators
+        return conditional_response(
+            request,
+            etag,
+            last_modified,
+            lambda: super(ConditionalGetMixin, self).get(request, *args, **kwargs),
+        )
+
+    def get_validators(self, request, *args, **kwargs):
+        raise NotImplementedError
@@ -0,0 +1,132 @@
+"""Sparse fieldsets (``?fields=`` / ``?omit=``) for post read endpoints.
+
+Trimming only the serializer output would still read every column, so the
+view also narrows the queryset: unused columns are left out of the
+``SELECT`` via ``.only()`` and unused ``select_related`` joins and
+prefetches are dropped.
+"""
+
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+# Model columns each serializer field reads. ``pk`` is always loaded.
+POST_FIELD_COLUMNS = {
+    "title": ("title",),
+    "slug": ("slug",),
+    "content": ("content",),
+    "excerpt": ("excerpt",),
+    "word_count": ("word_count",),
+    "reading_time_minutes": ("reading_time_minutes",),
+    "author": ("author", "author__username"),
+    "category": ("category",),
+    # Names and slugs come from ``taxonomy_cache``, not a join.
+    "categories": ("category",),
+    "is_published": ("is_published",),
+    "status": ("is_published",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+    "likes_count": ("likes_count",),
+    "comments_count": ("comments_count",),
+}
+
+# Queryset annotations each serializer field reads when present (see
+# ``likes.with_liked_by_me``); serializers fall back when they are missing.
+POST_FIELD_ANNOTATIONS = {
+    "liked_by_me": ("liked_by_me",),
+    "likes_count": ("likes_delta",),
+}
+
+# Relations (select_related / prefetch roots) each serializer field needs.
+POST_FIELD_RELATIONS = {
+    "author": "author",
+    "tags": "tags",
+    "comments": "comments",
+    "comments_next": "comments",
+}
+
+# Always loaded: keyset pagination and lookups read these.
+ALWAYS_LOADED = ("slug", "created_at", "updated_at")
+
+
+def _split(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def _lookup_root(lookup):
+    path = getattr(lookup, "prefetch_through", lookup)
+    return path.split("__", 1)[0]
+
+
+def narrow_queryset(queryset, fields):
+    """Restrict columns, joins and prefetches to what ``fields`` render."""
+    columns = set(ALWAYS_LOADED)
+    relations = set()
+    for name in fields:
+        columns.update(POST_FIELD_COLUMNS.get(name, ()))
+        if name in POST_FIELD_RELATIONS:
+            relations.add(POST_FIELD_RELATIONS[name])
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        joins = [name for name in select_related if name in relations]
+        queryset = queryset.select_related(None)
+        if joins:
+            queryset = queryset.select_related(*joins)
+
+    lookups = [
+        lookup
+        for lookup in queryset._prefetch_related_lookups
+        if _lookup_root(lookup) in relations
+    ]
+    queryset = queryset.prefetch_related(None).prefetch_related(*lookups)
+    return queryset.only(*columns)
+
+
+class SparseFieldsetMixin:
+    """Honour ``?fields=a,b`` and ``?omit=c`` on GET requests.
+
+    The selected field names are passed to the serializer through its
+    context (see ``SparseFieldsSerializerMixin``), and ``get_queryset``
+    implementations call ``self.narrow_queryset()`` on their result.
+    """
+
+    def get_sparse_fields(self):
+        """Return the set of fields to render, or ``None`` for all of them."""
+        if hasattr(self, "_sparse_fields"):
+            return self._sparse_fields
+
+        self._sparse_fields = None
+        params = self.request.query_params
+        if self.request.method != "GET" or not (
+            params.get(FIELDS_PARAM) or params.get(OMIT_PARAM)
+        ):
+            return None
+
+        serializer = self.get_serializer_class()()
+        available = {
+            name for name, field in serializer.fields.items() if not field.write_only
+        }
+        requested = _split(params.get(FIELDS_PARAM, "")) or set(available)
+        omitted = _split(params.get(OMIT_PARAM, ""))
+
+        unknown = (requested | omitted) - available
+        if unknown:
+            raise ValidationError(
+                {"fields": [f"Unknown field: {name}" for name in sorted(unknown)]}
+            )
+
+        self._sparse_fields = requested - omitted
+        return self._sparse_fields
+
+    def narrow_queryset(self, queryset):
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+        return narrow_queryset(queryset, fields)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["sparse_fields"] = self.get_sparse_fields()
+        return context
@@ -0,0 +1,107 @@
+"""Filters for the post and comment lists.
+
+Tag filters never join ``posts_post_tags`` into the outer query, so a post
+matching several tags is not repeated and no ``DISTINCT`` sort is needed:
+
+- ``tags_mode=any`` (default) uses one ``EXISTS`` subquery per post
+- ``tags_mode=all`` uses ``pk IN (... GROUP BY post_id HAVING COUNT = n)``
+
+Both are served by the ``(tag_id, post_id)`` index on the through table
+(see migration ``0009_post_tags_tag_post_idx``).
+
+Comment lists take ``since``/``before`` timestamp windows, which narrow the
+``(post_id, created_at, id)`` index range the keyset pages walk.
+"""
+
+import django_filters
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from .models import Post
+
+TAGS_MODE_ANY = "any"
+TAGS_MODE_ALL = "all"
+
+# Query parameter -> exclusive ``created_at`` bound.
+COMMENT_WINDOW_PARAMS = {"since": "gt", "before": "lt"}
+
+
+def _split_slugs(value):
+    return sorted({slug.strip() for slug in value.split(",") if slug.strip()})
+
+
+def filter_by_tags(queryset, slugs, mode=TAGS_MODE_ANY):
+    """Keep posts tagged with any (or all) of ``slugs``."""
+    through = Post.tags.through.objects
+    if mode == TAGS_MODE_ALL:
+        # (post, tag) is unique, so the row count per post is its match count.
+        matching = (
+            through.filter(tag__slug__in=slugs)
+            .values("post_id")
+            .annotate(matched=Count("tag_id"))
+            .filter(matched=len(slugs))
+            .values("post_id")
+        )
+        return queryset.filter(pk__in=matching)
+
+    return queryset.filter(
+        Exists(through.filter(post_id=OuterRef("pk"), tag__slug__in=slugs))
+    )
+
+
+class PostFilter(django_filters.FilterSet):
+    """Category and tag filters for the post list."""
+
+    category__slug = django_filters.CharFilter(field_name="category__slug")
+    tags__slug = django_filters.CharFilter(method="filter_tag")
+    tags = django_filters.CharFilter(method="filter_tags")
+    tags_mode = django_filters.ChoiceFilter(
+        choices=[(TAGS_MODE_ANY, "Any"), (TAGS_MODE_ALL, "All")],
+        method="filter_tags_mode",
+    )
+
+    class Meta:
+        model = Post
+        fields = ["category__slug", "tags__slug", "tags", "tags_mode"]
+
+    def filter_tag(self, queryset, name, value):
+        return filter_by_tags(queryset, [value])
+
+    def filter_tags(self, queryset, name, value):
+        slugs = _split_slugs(value)
+        if not slugs:
+            return queryset
+        mode = self.form.cleaned_data.get("tags_mode") or TAGS_MODE_ANY
+        return filter_by_tags(queryset, slugs, mode)
+
+    def filter_tags_mode(self, queryset, name, value):
+        # Applied by ``filter_tags``; on its own the mode filters nothing.
+        return queryset
+
+
+def comment_window(params):
+    """Return the ``created_at`` lookups for the ``since``/``before`` params.
+
+    Comments are kept if created strictly after ``since`` / before
+    ``before``. Both take ISO 8601 datetimes; naive values are read in the
+    current time zone. Polling clients pass the newest ``created_at`` they
+    hold as ``since`` to fetch only new comments. Raises ``ValidationError``
+    for malformed values.
+    """
+    bounds = {}
+    for param, lookup in COMMENT_WINDOW_PARAMS.items():
+        raw = params.get(param)
+        if not raw:
+            continue
+        try:
+            value = parse_datetime(raw)
+        except ValueError:
+            value = None
+        if value is None:
+            raise ValidationError({param: ["Enter a valid ISO 8601 datetime."]})
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+        bounds[f"created_at__{lookup}"] = value
+    return bounds
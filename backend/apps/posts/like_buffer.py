@@ -0,0 +1,302 @@
+"""Write-behind buffering for likes on hot posts.
+
+With ``POST_LIKE_WRITE_BEHIND`` enabled, like/unlike requests do not touch
+the ``Like`` table or the post's counter row. They append an intent to the
+configured buffer (``POST_LIKE_BUFFER``) and answer with an optimistic
+count. ``flush()`` (run by ``manage.py flush_like_buffer``) later claims a
+batch of intents, keeps the last one per ``(post, user)``, and applies the
+batch with one ``bulk_create(ignore_conflicts=True)``, one ``DELETE`` per
+post, one counter recount for every touched post and one trending update.
+``ignore_conflicts`` and the ``(post, user)`` unique constraint keep a like
+unique however many times it is replayed.
+
+Intents are acknowledged (removed from the buffer) in the same transaction
+that applies them, so a flush that crashes leaves them pending and the next
+flush replays them; applying an intent twice is harmless.
+
+Until then a user's own pending intents override the ``Like`` table in
+their ``liked_by_me`` reads (``LikeBuffer.liked_by_user``) and shift the
+``likes_count`` they see, and recording one bumps the user's
+``pending_scope`` so their ETags revalidate.
+
+Backends implement ``LikeBuffer``. ``DatabaseLikeBuffer`` keeps intents in
+the ``PendingLike`` table and survives restarts; ``MemoryLikeBuffer`` is an
+in-process stand-in for tests only, since ``flush_like_buffer`` runs in a
+process of its own (settings refuse it when write-behind is enabled).
+"""
+
+import functools
+import itertools
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    BooleanField,
+    Case,
+    Count,
+    Exists,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Now
+from django.utils.module_loading import import_string
+
+from . import cache as response_cache
+from . import trending
+from .models import Like, PendingLike, Post, delete_rows
+from .signals import invalidate_posts
+
+FLUSH_BATCH_SIZE = 1000
+
+# ``key`` identifies the intent within its buffer, for acknowledgement.
+LikeIntent = namedtuple("LikeIntent", ["key", "post_id", "user_id", "liked"])
+
+
+class LikeBuffer:
+    """Interface of a write-behind like buffer."""
+
+    def record(self, post_id, user_id, liked):
+        """Append a like (``liked=True``) or unlike intent."""
+        raise NotImplementedError
+
+    def pending_state(self, post_id, user_id):
+        """Return the latest pending intent's ``liked``, or ``None``."""
+        raise NotImplementedError
+
+    def liked_by_user(self, user_id, stored):
+        """Return a ``liked_by_me`` expression for posts read by ``user_id``.
+
+        ``stored`` is the expression reading the ``Like`` table; the user's
+        latest pending intent on a post takes precedence over it.
+        """
+        raise NotImplementedError
+
+    def claim(self, limit):
+        """Return up to ``limit`` of the oldest intents, oldest first.
+
+        Called inside the flush transaction; claimed intents stay pending
+        until ``acknowledge()``.
+        """
+        raise NotImplementedError
+
+    def acknowledge(self, intents):
+        """Drop applied intents from the buffer."""
+        raise NotImplementedError
+
+
+class DatabaseLikeBuffer(LikeBuffer):
+    """Durable buffer backed by the ``PendingLike`` table.
+
+    Recording is a plain append, so bursts on a hot post never wait on the
+    post row or the ``Like`` unique index. Claiming locks the batch
+    (``SELECT ... FOR UPDATE`` where supported) so concurrent flushers
+    apply intents in order.
+    """
+
+    def record(self, post_id, user_id, liked):
+        PendingLike.objects.create(post_id=post_id, user_id=user_id, liked=liked)
+
+    def pending_state(self, post_id, user_id):
+        return (
+            PendingLike.objects.filter(post_id=post_id, user_id=user_id)
+            .order_by("-pk")
+            .values_list("liked", flat=True)
+            .first()
+        )
+
+    def liked_by_user(self, user_id, stored):
+        latest = (
+            PendingLike.objects.filter(post=OuterRef("pk"), user_id=user_id)
+            .order_by("-pk")
+            .values("liked")[:1]
+        )
+        return Coalesce(
+            Subquery(latest, output_field=BooleanField()),
+            stored,
+            output_field=BooleanField(),
+        )
+
+    def claim(self, limit):
+        rows = (
+            PendingLike.objects.select_for_update()
+            .order_by("pk")
+            .values_list("pk", "post_id", "user_id", "liked")[:limit]
+        )
+        return [LikeIntent(*row) for row in rows]
+
+    def acknowledge(self, intents):
+        PendingLike.objects.filter(pk__in=[intent.key for intent in intents]).delete()
+
+
+class MemoryLikeBuffer(LikeBuffer):
+    """In-process buffer for tests; intents are lost when the process exits.
+
+    Only a ``flush()`` in the same process sees them, so it cannot back
+    ``flush_like_buffer``.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+        self._intents = {}
+        self._latest = {}
+
+    def record(self, post_id, user_id, liked):
+        with self._lock:
+            intent = LikeIntent(next(self._sequence), post_id, user_id, liked)
+            self._intents[intent.key] = intent
+            self._latest[post_id, user_id] = intent
+
+    def pending_state(self, post_id, user_id):
+        with self._lock:
+            intent = self._latest.get((post_id, user_id))
+        return None if intent is None else intent.liked
+
+    def liked_by_user(self, user_id, stored):
+        by_state = {True: [], False: []}
+        with self._lock:
+            for (post_id, pending_user), intent in self._latest.items():
+                if pending_user == user_id:
+                    by_state[intent.liked].append(post_id)
+        cases = [
+            When(pk__in=post_ids, then=Value(liked))
+            for liked, post_ids in by_state.items()
+            if post_ids
+        ]
+        if not cases:
+            return stored
+        return Case(*cases, default=stored, output_field=BooleanField())
+
+    def claim(self, limit):
+        with self._lock:
+            return list(itertools.islice(self._intents.values(), limit))
+
+    def acknowledge(self, intents):
+        with self._lock:
+            for intent in intents:
+                self._intents.pop(intent.key, None)
+                pair = (intent.post_id, intent.user_id)
+                if self._latest.get(pair) is intent:
+                    del self._latest[pair]
+
+
+@functools.cache
+def _load(path):
+    return import_string(path)()
+
+
+def get_buffer():
+    """Return the buffer configured by ``POST_LIKE_BUFFER`` (one per process)."""
+    return _load(settings.POST_LIKE_BUFFER)
+
+
+def pending_scope(user_id):
+    """Return the response-cache scope bumped by the user's buffered toggles."""
+    return f"pending-likes:{user_id}"
+
+
+def pending_scopes(user):
+    """Return the scopes a per-user ETag must include for ``user``."""
+    if settings.POST_LIKE_WRITE_BEHIND and user.is_authenticated:
+        return [pending_scope(user.pk)]
+    return []
+
+
+def toggle(slug, user, liked, buffer=None):
+    """Buffer a like or unlike; return ``(post_id, changed, likes_count)``.
+
+    ``changed`` and the count are optimistic: they account for this user's
+    pending intents but not for other users' unflushed ones. Returns
+    ``None`` if no such post exists.
+    """
+    buffer = buffer or get_buffer()
+    row = (
+        Post.objects.filter(slug=slug)
+        .annotate(stored=Exists(Like.objects.filter(post=OuterRef("pk"), user=user)))
+        .values_list("pk", "likes_count", "stored")
+        .first()
+    )
+    if row is None:
+        return None
+
+    post_id, likes_count, stored = row
+    current = buffer.pending_state(post_id, user.pk)
+    if current is None:
+        current = stored
+    changed = current != liked
+    if changed:
+        buffer.record(post_id, user.pk, liked)
+        response_cache.bump([pending_scope(user.pk)])
+    return post_id, changed, max(likes_count + int(liked) - int(stored), 0)
+
+
+def flush(batch_size=FLUSH_BATCH_SIZE, buffer=None):
+    """Apply one batch of buffered intents; return how many were applied."""
+    buffer = buffer or get_buffer()
+    with transaction.atomic():
+        intents = buffer.claim(batch_size)
+        if not intents:
+            return 0
+
+        # The newest intent per (post, user) decides; older ones cancel out.
+        final = {}
+        for intent in intents:
+            final[intent.post_id, intent.user_id] = intent.liked
+        post_ids = {post_id for post_id, _ in final}
+        existing = set(
+            Like.objects.filter(
+                post_id__in=post_ids, user_id__in={user_id for _, user_id in final}
+            ).values_list("post_id", "user_id")
+        )
+
+        added = [
+            pair for pair, liked in final.items() if liked and pair not in existing
+        ]
+        removed = [
+            pair for pair, liked in final.items() if not liked and pair in existing
+        ]
+        # ignore_conflicts still guards against likes written since the read.
+        Like.objects.bulk_create(
+            [Like(post_id=post_id, user_id=user_id) for post_id, user_id in added],
+            ignore_conflicts=True,
+        )
+        unliked = {}
+        for post_id, user_id in removed:
+            unliked.setdefault(post_id, []).append(user_id)
+        for post_id, user_ids in unliked.items():
+            # No per-like signals: the cache is bumped once below.
+            delete_rows(Like.objects.filter(post_id=post_id, user_id__in=user_ids))
+
+        _recount_likes(post_ids)
+        heat = {}
+        for post_id, _ in added:
+            heat[post_id] = heat.get(post_id, 0) + trending.LIKE_WEIGHT
+        for post_id, _ in removed:
+            heat[post_id] = heat.get(post_id, 0) - trending.LIKE_WEIGHT
+        trending.add_activity(heat)
+        buffer.acknowledge(intents)
+
+    invalidate_posts(post_ids)
+    return len(intents)
+
+
+def _recount_likes(post_ids):
+    """Set ``likes_count`` from the ``Like`` table for the given posts.
+
+    Recounting (an index-only count per post) rather than applying deltas
+    keeps counters exact even when a replayed intent was already applied.
+    """
+    counts = (
+        Like.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Post.objects.filter(pk__in=post_ids).update(
+        likes_count=Coalesce(Subquery(counts), 0), last_activity_at=Now()
+    )
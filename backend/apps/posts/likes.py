@@ -0,0 +1,153 @@
+"""Like state: single-statement toggles and batched status reads.
+
+A like is a single ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` that
+resolves the post by slug in a subquery, and an unlike a single ``DELETE``
+with the same subquery. Only when a row actually changed is the stored
+counter moved, by an ``UPDATE ... RETURNING`` that also hands back the new
+count; repeat clicks read the count instead. Either way a toggle costs two
+statements in one transaction, and concurrent likes on a hot post only
+contend on the counter row for the duration of that ``UPDATE``.
+
+``post_save`` / ``post_delete`` do not fire for these writes, so callers
+invalidate the response cache themselves.
+
+Reads never count the likes table: ``likes_count`` is the stored counter
+and whether the current user liked a post is an indexed ``EXISTS`` on the
+``(post, user)`` unique constraint, annotated onto the post query itself.
+Under write-behind the user's buffered toggle adjusts both, in that same
+annotation.
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BooleanField, Exists, IntegerField, OuterRef, Value
+from django.db.models.functions import Cast
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import like_buffer
+from .models import Like, Post
+
+LIKE_STATUS_MAX_SLUGS = 300
+
+POST_TABLE = connection.ops.quote_name(Post._meta.db_table)
+LIKE_TABLE = connection.ops.quote_name(Like._meta.db_table)
+
+
+def _fetch(sql, params):
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchone()
+
+
+def _now():
+    return connection.ops.adapt_datetimefield_value(timezone.now())
+
+
+def _shift_likes(post_id, delta):
+    """Move ``likes_count`` by ``delta`` (clamped at zero); return the new count."""
+    (likes_count,) = _fetch(
+        f"UPDATE {POST_TABLE} SET likes_count = CASE WHEN likes_count + %s > 0 "
+        "THEN likes_count + %s ELSE 0 END, last_activity_at = %s "
+        "WHERE id = %s RETURNING likes_count",
+        [delta, delta, _now(), post_id],
+    )
+    return likes_count
+
+
+def _unchanged(slug):
+    """Return ``(post_id, False, likes_count)`` for ``slug``, or ``None``."""
+    row = _fetch(f"SELECT id, likes_count FROM {POST_TABLE} WHERE slug = %s", [slug])
+    if row is None:
+        return None
+    post_id, likes_count = row
+    return post_id, False, likes_count
+
+
+def like(slug, user_id):
+    """Like the post at ``slug``; return ``(post_id, created, likes_count)``.
+
+    Returns ``None`` if no such post exists.
+    """
+    with transaction.atomic():
+        inserted = _fetch(
+            f"INSERT INTO {LIKE_TABLE} (post_id, user_id, created_at) "
+            f"SELECT id, %s, %s FROM {POST_TABLE} WHERE slug = %s "
+            "ON CONFLICT (post_id, user_id) DO NOTHING RETURNING post_id",
+            [user_id, _now(), slug],
+        )
+        if inserted:
+            (post_id,) = inserted
+            return post_id, True, _shift_likes(post_id, 1)
+
+    return _unchanged(slug)
+
+
+def unlike(slug, user_id):
+    """Unlike the post at ``slug``; return ``(post_id, removed, likes_count)``.
+
+    Returns ``None`` if no such post exists.
+    """
+    with transaction.atomic():
+        deleted = _fetch(
+            f"DELETE FROM {LIKE_TABLE} WHERE user_id = %s "
+            f"AND post_id = (SELECT id FROM {POST_TABLE} WHERE slug = %s) "
+            "RETURNING post_id",
+            [user_id, slug],
+        )
+        if deleted:
+            (post_id,) = deleted
+            return post_id, True, _shift_likes(post_id, -1)
+
+    return _unchanged(slug)
+
+
+def with_liked_by_me(queryset, user):
+    """Annotate posts with ``liked_by_me`` for ``user``.
+
+    Anonymous users get a constant ``false`` column, so no subquery runs.
+    With write-behind likes, the user's unflushed intents take precedence,
+    and ``likes_delta`` (-1, 0 or 1) carries the change they make to the
+    stored ``likes_count``; read counts through ``shown_likes_count``.
+    """
+    if not user.is_authenticated:
+        return queryset.annotate(liked_by_me=Value(False, output_field=BooleanField()))
+    stored = Exists(Like.objects.filter(post=OuterRef("pk"), user=user))
+    if not settings.POST_LIKE_WRITE_BEHIND:
+        return queryset.annotate(liked_by_me=stored)
+    liked = like_buffer.get_buffer().liked_by_user(user.pk, stored)
+    return queryset.annotate(
+        liked_by_me=liked,
+        likes_delta=Cast(liked, IntegerField()) - Cast(stored, IntegerField()),
+    )
+
+
+def shown_likes_count(likes_count, likes_delta=0):
+    """Return the count a reader sees: stored plus their pending toggle."""
+    return max(likes_count + likes_delta, 0)
+
+
+class LikeStatusRequestSerializer(serializers.Serializer):
+    """The post slugs a batch like-status request asks about."""
+
+    slugs = serializers.ListField(
+        child=serializers.SlugField(),
+        allow_empty=False,
+        max_length=LIKE_STATUS_MAX_SLUGS,
+        help_text=f"Post slugs to look up (at most {LIKE_STATUS_MAX_SLUGS}).",
+    )
+
+
+def like_statuses(slugs, user):
+    """Return ``{slug: {"liked": ..., "likes_count": ...}}`` in one query.
+
+    Slugs that match no post are left out.
+    """
+    rows = with_liked_by_me(Post.objects.filter(slug__in=set(slugs)), user)
+    columns = ["slug", "likes_count", "liked_by_me"]
+    if "likes_delta" in rows.query.annotations:
+        columns.append("likes_delta")
+    return {
+        slug: {"liked": liked, "likes_count": shown_likes_count(likes_count, *delta)}
+        for slug, likes_count, liked, *delta in rows.values_list(*columns)
+    }
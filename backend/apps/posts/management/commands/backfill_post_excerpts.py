@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts.models import CONTENT_METRIC_FIELDS, Post
+
+
+class Command(BaseCommand):
+    help = "Compute excerpt, word count and reading time for existing posts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of posts to process per batch (default: 500)",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only process posts that have no excerpt yet",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        posts = Post.objects.order_by("pk").only("pk", "content")
+        if options["missing_only"]:
+            posts = posts.filter(excerpt="")
+
+        processed = 0
+        last_pk = 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+
+            for post in batch:
+                post.refresh_content_metrics()
+            Post.objects.bulk_update(batch, CONTENT_METRIC_FIELDS)
+
+            last_pk = batch[-1].pk
+            processed += len(batch)
+            self.stdout.write(f"Processed {processed} posts...")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {processed} posts."))
@@ -0,0 +1,95 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.posts.models import Category, Post, Tag
+from apps.posts.rendering import post_records, render_posts
+from apps.posts.serializers import PostSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rendering a post list through PostSerializer and through "
+        "the values-based fast path"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=1000,
+            help="Number of posts to seed and render (default: 1000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per path; the best time is reported (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        # Seed inside a transaction that is always rolled back.
+        with transaction.atomic():
+            self._seed(options["posts"])
+            results = {
+                "serializer": self._best(self._serializer, options["repeat"]),
+                "fast path": self._best(self._fast_path, options["repeat"]),
+            }
+            transaction.set_rollback(True)
+
+        baseline = results["serializer"]
+        for label, seconds in results.items():
+            self.stdout.write(
+                f"{label:>10}: {seconds * 1000:8.1f} ms ({baseline / seconds:4.1f}x)"
+            )
+
+    def _serializer(self):
+        queryset = Post.objects.select_related("author", "category").prefetch_related(
+            "tags"
+        )
+        return PostSerializer(queryset, many=True).data
+
+    def _fast_path(self):
+        return render_posts(list(post_records(Post.objects.all())))
+
+    def _best(self, render, repeat):
+        timings = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def _seed(self, count):
+        user = User.objects.create(
+            username="bench-user", email="bench-user@example.com"
+        )
+        categories = Category.objects.bulk_create(
+            Category(name=f"Bench Category {i}", slug=f"bench-category-{i}")
+            for i in range(5)
+        )
+        tags = Tag.objects.bulk_create(
+            Tag(name=f"Bench Tag {i}", slug=f"bench-tag-{i}") for i in range(10)
+        )
+        posts = Post.objects.bulk_create(
+            Post(
+                title=f"Bench post {i}",
+                slug=f"bench-post-{i}",
+                content="Benchmark content. " * 50,
+                excerpt="Benchmark content.",
+                word_count=100,
+                author=user,
+                category=categories[i % len(categories)] if i % 3 else None,
+                is_published=True,
+            )
+            for i in range(count)
+        )
+        Post.tags.through.objects.bulk_create(
+            Post.tags.through(post_id=post.pk, tag_id=tags[(i + j) % len(tags)].pk)
+            for i, post in enumerate(posts)
+            for j in range(3)
+        )
@@ -0,0 +1,103 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apps.posts.models import Comment, Post
+from apps.posts.rendering import post_records, render_posts
+from apps.posts.serializers import CommentSerializer, PostDetailSerializer
+from config.renderers import MessagePackRenderer, ORJSONRenderer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare encode time of the stdlib JSON, orjson and MessagePack "
+        "renderers for a large post list and a detail page with many comments"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=1000,
+            help="Posts in the list payload (default: 1000)",
+        )
+        parser.add_argument(
+            "--comments",
+            type=int,
+            default=1000,
+            help="Comments on the detail payload (default: 1000)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per renderer; the best time is reported (default: 5)",
+        )
+
+    def handle(self, *args, **options):
+        # Seed inside a transaction that is always rolled back.
+        with transaction.atomic():
+            post = self._seed(options["posts"], options["comments"])
+            payloads = {
+                "post list": render_posts(list(post_records(Post.objects.all()))),
+                # Detail embeds only the newest comments; encode the whole
+                # thread so --comments still sizes the payload.
+                "post detail": {
+                    **PostDetailSerializer(post).data,
+                    "comments": CommentSerializer(
+                        post.comments.select_related("user"), many=True
+                    ).data,
+                },
+            }
+            transaction.set_rollback(True)
+
+        renderers = {
+            "json": JSONRenderer(),
+            "orjson": ORJSONRenderer(),
+            "msgpack": MessagePackRenderer(),
+        }
+        for payload, data in payloads.items():
+            self.stdout.write(f"{payload}:")
+            baseline = None
+            for label, renderer in renderers.items():
+                seconds, size = self._best(renderer, data, options["repeat"])
+                baseline = baseline or seconds
+                self.stdout.write(
+                    f"  {label:>8}: {seconds * 1000:8.2f} ms "
+                    f"({baseline / seconds:4.1f}x, {size} bytes)"
+                )
+
+    def _best(self, renderer, data, repeat):
+        timings = []
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            body = renderer.render(data)
+            timings.append(time.perf_counter() - started)
+        return min(timings), len(body)
+
+    def _seed(self, count, comments):
+        user = User.objects.create(
+            username="bench-user", email="bench-user@example.com"
+        )
+        posts = Post.objects.bulk_create(
+            Post(
+                title=f"Bench post {i}",
+                slug=f"bench-post-{i}",
+                content="Benchmark content. " * 50,
+                excerpt="Benchmark content.",
+                word_count=100,
+                author=user,
+                is_published=True,
+            )
+            for i in range(max(count, 1))
+        )
+        Comment.objects.bulk_create(
+            Comment(post=posts[0], user=user, content=f"Comment {i}")
+            for i in range(comments)
+        )
+        return posts[0]
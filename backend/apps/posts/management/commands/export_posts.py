@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.posts.export import EXPORT_CHUNK_SIZE, EXPORT_SECTIONS, export_lines
+
+
+class Command(BaseCommand):
+    help = "Stream published posts (and optionally comments/likes) as NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="File to write to (default: stdout)",
+        )
+        parser.add_argument(
+            "--include",
+            default="",
+            help="Comma-separated extra sections: comments, likes",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"Rows fetched per database round trip (default: {EXPORT_CHUNK_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        include = [name for name in options["include"].split(",") if name]
+        unknown = set(include) - set(EXPORT_SECTIONS)
+        if unknown:
+            raise CommandError(f"Unknown sections: {', '.join(sorted(unknown))}")
+
+        lines = export_lines(include, chunk_size=options["chunk_size"])
+        if not options["output"]:
+            for line in lines:
+                self.stdout.write(line.decode(), ending="")
+            return
+
+        count = 0
+        with open(options["output"], "wb") as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported {count} records to {options['output']}")
+        )
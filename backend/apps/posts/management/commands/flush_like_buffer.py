@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.posts.like_buffer import FLUSH_BATCH_SIZE, flush
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply buffered like/unlike intents (POST_LIKE_WRITE_BEHIND) in "
+        "batches; intents left by an interrupted flush are replayed"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=FLUSH_BATCH_SIZE,
+            help=f"Intents applied per transaction (default: {FLUSH_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0,
+            help="Keep running, flushing every INTERVAL seconds (default: flush once)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options["batch_size"], 1)
+        interval = options["interval"]
+
+        while True:
+            applied = batches = 0
+            while flushed := flush(batch_size):
+                applied += flushed
+                batches += 1
+            if applied or not interval:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Applied {applied} like intents in {batches} batches."
+                    )
+                )
+            if not interval:
+                break
+            time.sleep(interval)
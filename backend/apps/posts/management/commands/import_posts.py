@@ -0,0 +1,76 @@
+import sys
+
+import orjson
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.posts.bulk import BULK_MAX_POSTS, import_batch, validate_batch
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Import posts from an NDJSON file (one post object per line) in "
+        "batches; invalid lines are reported and skipped"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file to read, or - for stdin")
+        parser.add_argument(
+            "--author",
+            required=True,
+            help="Username of the user the posts are created for",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BULK_MAX_POSTS,
+            help=f"Posts per transaction (default: {BULK_MAX_POSTS})",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(username=options["author"])
+        except User.DoesNotExist:
+            raise CommandError(f"Unknown user: {options['author']}")
+
+        batch_size = max(options["batch_size"], 1)
+        created = skipped = 0
+        with self._open(options["path"]) as source:
+            batch = []
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    batch.append((line_number, orjson.loads(line)))
+                except orjson.JSONDecodeError as exc:
+                    self.stderr.write(f"line {line_number}: invalid JSON ({exc})")
+                    skipped += 1
+                if len(batch) >= batch_size:
+                    imported, rejected = self._import(batch, author)
+                    created, skipped = created + imported, skipped + rejected
+                    batch = []
+            if batch:
+                imported, rejected = self._import(batch, author)
+                created, skipped = created + imported, skipped + rejected
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Imported {created} posts, skipped {skipped}.")
+        )
+
+    def _open(self, path):
+        if path == "-":
+            return open(sys.stdin.fileno(), "rb", closefd=False)
+        try:
+            return open(path, "rb")
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+    def _import(self, batch, author):
+        """Import one batch; returns ``(created, skipped)``."""
+        rows, errors = validate_batch([item for _, item in batch])
+        for index, item_errors in errors.items():
+            self.stderr.write(f"line {batch[index][0]}: {dict(item_errors)}")
+        posts = import_batch(rows, author)
+        return len(posts), len(errors)
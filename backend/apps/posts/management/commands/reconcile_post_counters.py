@@ -0,0 +1,134 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.posts.models import Category, Comment, Like, Post, Tag
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute drifted Post.likes_count / Post.comments_count and "
+        "Category/Tag.posts_count counters"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of posts to check per batch (default: 1000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted posts without writing any changes",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        dry_run = options["dry_run"]
+
+        checked = 0
+        fixed = 0
+        last_pk = 0
+
+        while True:
+            # Lock each batch so concurrent like/comment writes cannot be
+            # overwritten between counting and saving.
+            with transaction.atomic():
+                posts = Post.objects.filter(pk__gt=last_pk)
+                if not dry_run:
+                    posts = posts.select_for_update()
+                batch = list(
+                    posts.order_by("pk").only("pk", "likes_count", "comments_count")[
+                        :batch_size
+                    ]
+                )
+                if not batch:
+                    break
+
+                last_pk = batch[-1].pk
+                checked += len(batch)
+                fixed += self._reconcile_batch(batch, dry_run)
+
+        with transaction.atomic():
+            categories = self._reconcile_posts_counts(
+                Category,
+                Post.objects.filter(category=OuterRef("pk"), is_published=True),
+                "category",
+                dry_run,
+            )
+            tags = self._reconcile_posts_counts(
+                Tag,
+                Post.tags.through.objects.filter(
+                    tag=OuterRef("pk"), post__is_published=True
+                ),
+                "tag",
+                dry_run,
+            )
+
+        verb = "Would fix" if dry_run else "Fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} posts. {verb} {fixed} posts, "
+                f"{categories} categories and {tags} tags."
+            )
+        )
+
+    def _reconcile_batch(self, batch, dry_run):
+        """Compare stored counters against real counts for one batch of posts."""
+        pks = [post.pk for post in batch]
+        likes = self._counts(Like, pks)
+        comments = self._counts(Comment, pks)
+
+        drifted = []
+        for post in batch:
+            actual_likes = likes.get(post.pk, 0)
+            actual_comments = comments.get(post.pk, 0)
+            if (post.likes_count, post.comments_count) != (
+                actual_likes,
+                actual_comments,
+            ):
+                post.likes_count = actual_likes
+                post.comments_count = actual_comments
+                drifted.append(post)
+
+        if drifted and not dry_run:
+            Post.objects.bulk_update(drifted, ["likes_count", "comments_count"])
+
+        return len(drifted)
+
+    @staticmethod
+    def _counts(model, pks):
+        """Return a ``{post_id: count}`` map for ``model`` rows on the given posts."""
+        rows = (
+            model.objects.filter(post_id__in=pks)
+            .order_by()
+            .values("post_id")
+            .annotate(total=Count("pk"))
+            .values_list("post_id", "total")
+        )
+        return dict(rows)
+
+    @staticmethod
+    def _reconcile_posts_counts(model, published, group_by, dry_run):
+        """Fix ``posts_count`` on ``model`` rows; return how many drifted.
+
+        ``published`` holds the rows counted for each outer ``model`` row,
+        grouped by its ``group_by`` field. Categories and tags are few, so
+        each table is checked in one statement rather than in batches.
+        """
+        counts = (
+            published.order_by()
+            .values(group_by)
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        actual = Coalesce(Subquery(counts), 0)
+        drifted = model.objects.annotate(actual=actual).exclude(posts_count=F("actual"))
+        if dry_run:
+            return drifted.count()
+        return model.objects.filter(pk__in=drifted.values("pk")).update(
+            posts_count=actual
+        )
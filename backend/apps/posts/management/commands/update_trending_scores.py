@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from apps.posts import trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Decay trending scores by the time since the last run (schedule it, "
+        "e.g. hourly), or rebuild them from recent likes and comments"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--decay",
+            type=float,
+            default=1,
+            metavar="HOURS",
+            help="Hours of decay to apply; match the schedule interval (default: 1)",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute every score from scratch instead of decaying",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            scored = trending.rebuild()
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt trending scores for {scored} posts.")
+            )
+            return
+
+        hours = options["decay"]
+        trending.decay(hours)
+        self.stdout.write(
+            self.style.SUCCESS(f"Decayed trending scores by {hours:g} hours.")
+        )
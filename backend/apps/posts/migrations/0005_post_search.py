@@ -0,0 +1,112 @@
+# Generated by Django 6.0.2 on 2026-10-17 04:30
+
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE posts_post ADD COLUMN search_vector tsvector",
+    """
+    CREATE FUNCTION posts_post_search_vector_refresh() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER posts_post_search_vector_insert
+    BEFORE INSERT ON posts_post
+    FOR EACH ROW EXECUTE FUNCTION posts_post_search_vector_refresh()
+    """,
+    """
+    CREATE TRIGGER posts_post_search_vector_update
+    BEFORE UPDATE OF title, content ON posts_post
+    FOR EACH ROW
+    WHEN (OLD.title IS DISTINCT FROM NEW.title
+          OR OLD.content IS DISTINCT FROM NEW.content)
+    EXECUTE FUNCTION posts_post_search_vector_refresh()
+    """,
+    """
+    UPDATE posts_post SET search_vector =
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    """,
+    "CREATE INDEX posts_post_search_vector_gin ON posts_post USING gin (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP TRIGGER IF EXISTS posts_post_search_vector_update ON posts_post",
+    "DROP TRIGGER IF EXISTS posts_post_search_vector_insert ON posts_post",
+    "DROP FUNCTION IF EXISTS posts_post_search_vector_refresh()",
+    "ALTER TABLE posts_post DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE posts_post_fts USING fts5(
+        title, content, content='posts_post', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER posts_post_fts_insert AFTER INSERT ON posts_post BEGIN
+        INSERT INTO posts_post_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_post_fts_delete AFTER DELETE ON posts_post BEGIN
+        INSERT INTO posts_post_fts(posts_post_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER posts_post_fts_update AFTER UPDATE OF title, content ON posts_post
+    BEGIN
+        INSERT INTO posts_post_fts(posts_post_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_post_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "INSERT INTO posts_post_fts(posts_post_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS posts_post_fts_update",
+    "DROP TRIGGER IF EXISTS posts_post_fts_delete",
+    "DROP TRIGGER IF EXISTS posts_post_fts_insert",
+    "DROP TABLE IF EXISTS posts_post_fts",
+]
+
+STATEMENTS = {
+    'postgresql': (POSTGRES_FORWARD, POSTGRES_REVERSE),
+    'sqlite': (SQLITE_FORWARD, SQLITE_REVERSE),
+}
+
+
+def _run(schema_editor, index):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for sql in statements[index]:
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, 0)
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, 1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-17 09:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Index the auto-created post/tag through table by (tag_id, post_id).
+
+    The unique (post_id, tag_id) index serves lookups from a post; tag
+    filters start from the tag and need the reverse order.
+    """
+
+    dependencies = [
+        ('posts', '0008_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX posts_post_tags_tag_post_idx '
+            'ON posts_post_tags (tag_id, post_id)',
+            'DROP INDEX posts_post_tags_tag_post_idx',
+        ),
+    ]
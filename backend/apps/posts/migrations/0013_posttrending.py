@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_pendinglike'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostTrending',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='posts.post')),
+                ('score', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-score', '-post'], name='posttrending_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_posts_counts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Category = apps.get_model('posts', 'Category')
+    Tag = apps.get_model('posts', 'Tag')
+
+    published = Post.objects.filter(is_published=True)
+    category_counts = (
+        published.filter(category=OuterRef('pk'))
+        .order_by()
+        .values('category')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    tag_counts = (
+        Post.tags.through.objects.filter(tag=OuterRef('pk'), post__is_published=True)
+        .order_by()
+        .values('tag')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Category.objects.update(posts_count=Coalesce(Subquery(category_counts), 0))
+    Tag.objects.update(posts_count=Coalesce(Subquery(tag_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_posttrending'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='tag',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['-posts_count', 'name'], name='category_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['-posts_count', 'name'], name='tag_popular_idx'),
+        ),
+        migrations.RunPython(backfill_posts_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-17 16:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_taxonomy_posts_count'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_changed_idx',
+        ),
+    ]
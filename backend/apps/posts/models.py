@@ -1,14 +1,72 @@
+import math
+import re
 import uuid
 
 from django.conf import settings
-from django.db import models
-from django.utils.text import slugify
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+from django.utils import timezone
+from django.utils.html import strip_tags
+from django.utils.text import Truncator, slugify
+
+EXCERPT_LENGTH = 280
+WORDS_PER_MINUTE = 200
+CONTENT_METRIC_FIELDS = ("excerpt", "word_count", "reading_time_minutes")
+# Written only through ``UPDATE`` statements, never by ``Post.save()``.
+COUNTER_FIELDS = frozenset({"likes_count", "comments_count", "last_activity_at"})
+SLUG_LENGTH = 50
+SLUG_SUFFIX_LENGTH = 8
+SLUG_CANDIDATES = 3
+SLUG_INSERT_ATTEMPTS = 3
+# Fixed routes next to ``<slug>/`` in ``posts/urls.py``; a post with one of
+# these slugs could never be reached at its detail URL.
+RESERVED_SLUGS = frozenset({"my-posts", "export", "bulk", "like-status", "trending"})
+# Comment paths are fixed-width, zero-padded ids, one segment per level.
+COMMENT_PATH_STEP = 10
+COMMENT_PATH_LENGTH = 255
+COMMENT_MAX_DEPTH = COMMENT_PATH_LENGTH // COMMENT_PATH_STEP - 1
+
+
+def _suffixed_slug(base):
+    suffix = uuid.uuid4().hex[:SLUG_SUFFIX_LENGTH]
+    return f"{base[: SLUG_LENGTH - SLUG_SUFFIX_LENGTH - 1]}-{suffix}"
+
+
+def delete_rows(queryset):
+    """Delete the rows matched by ``queryset`` with one ``DELETE``; return
+    how many were deleted.
+
+    ``QuerySet.delete()`` loads every row and sends ``pre_delete`` /
+    ``post_delete`` for each one whenever receivers are connected. Bulk
+    writers (comment subtrees, like flushes, tag diffs) instead apply the
+    side effects of those receivers once for the whole batch, so they
+    delete through this plain statement. Cascades are not followed.
+    """
+    model = queryset.model
+    ops = connections[queryset.db].ops
+    table = ops.quote_name(model._meta.db_table)
+    pk = ops.quote_name(model._meta.pk.column)
+    sql, params = queryset.order_by().values_list("pk").query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({sql})", params)
+        return cursor.rowcount
 
 
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(unique=True)
 
+    # Published posts in the category, maintained by ``taxonomy`` and
+    # repaired by ``reconcile_post_counters``.
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Popularity listing: ORDER BY posts_count DESC, name
+            models.Index(fields=["-posts_count", "name"], name="category_popular_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -17,6 +75,14 @@ class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(unique=True)
 
+    # Published posts carrying the tag; see ``Category.posts_count``.
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-posts_count", "name"], name="tag_popular_idx"),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -46,30 +112,220 @@ class Post(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized counters, maintained by the like/comment views and
+    # repaired by the ``reconcile_post_counters`` management command.
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+    # Touched together with the counters so conditional GETs notice like and
+    # comment activity that does not change ``updated_at``.
+    last_activity_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    # Derived from ``content`` in ``save()`` so list pages can skip the body.
+    excerpt = models.CharField(max_length=300, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_time_minutes = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Public feed: WHERE is_published ORDER BY created_at, id (keyset
+            # pagination walks it in either direction).
+            models.Index(
+                fields=["-created_at", "-id"],
+                condition=models.Q(is_published=True),
+                name="post_published_created_idx",
+            ),
+            # Category feed: WHERE is_published AND category_id = ? ORDER BY ...
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                condition=models.Q(is_published=True),
+                name="post_published_category_idx",
+            ),
+            # My posts: WHERE author_id = ? ORDER BY created_at / updated_at
+            models.Index(
+                fields=["author", "-created_at", "-id"], name="post_author_created_idx"
+            ),
+            models.Index(
+                fields=["author", "-updated_at", "-id"], name="post_author_updated_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded body so save() can tell whether it changed.
+        instance._loaded_content = instance.__dict__.get("content")
+        return instance
+
     def save(self, *args, **kwargs):
-        if not self.slug:  # Only generate slug if not already set (immutable)
+        generate_slug = not self.slug
+        if generate_slug:  # Only generate slug if not already set (immutable)
             self.slug = self._generate_unique_slug()
-        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None and not self._state.adding:
+            # A full save of a loaded post would write back counters that
+            # likes and comments have moved since it was read.
+            skipped = COUNTER_FIELDS | self.get_deferred_fields()
+            update_fields = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skipped
+            ]
+            kwargs["update_fields"] = update_fields
+        saving_content = update_fields is None or "content" in update_fields
+        if saving_content and self._content_changed():
+            self.refresh_content_metrics()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *CONTENT_METRIC_FIELDS}
+        if generate_slug:
+            self._insert_with_unique_slug(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        self._loaded_content = self.content
+
+    def _content_changed(self):
+        if "content" in self.get_deferred_fields():
+            return False
+        if self._state.adding or not hasattr(self, "_loaded_content"):
+            return True
+        return self.content != self._loaded_content
+
+    def refresh_content_metrics(self):
+        """Recompute ``excerpt``, ``word_count`` and ``reading_time_minutes``."""
+        text = " ".join(strip_tags(self.content or "").split())
+        self.word_count = len(re.findall(r"\w+", text))
+        self.reading_time_minutes = math.ceil(self.word_count / WORDS_PER_MINUTE)
+        self.excerpt = Truncator(text).chars(EXCERPT_LENGTH)
+
+    @classmethod
+    def adjust_counters(cls, pk, likes=0, comments=0):
+        """Shift the stored counters of a post by the given deltas.
+
+        Runs as a single ``UPDATE`` with ``F()`` expressions so concurrent
+        writers never lose increments. Counters are clamped at zero and
+        ``last_activity_at`` is refreshed in the same statement.
+        """
+        updates = {}
+        if likes:
+            updates["likes_count"] = Greatest(F("likes_count") + likes, 0)
+        if comments:
+            updates["comments_count"] = Greatest(F("comments_count") + comments, 0)
+        if updates:
+            cls.objects.filter(pk=pk).update(last_activity_at=Now(), **updates)
+
+    def assign_tags(self, tags, current=None):
+        """Make ``tags`` (instances or ids) the post's tags, writing only the diff.
+
+        Reads the current tag ids from the through table unless ``current``
+        gives them (``()`` for a post just created), then issues at most one
+        ``DELETE`` and one multi-row ``INSERT``. ``tags.set()`` would read
+        the set through a join and re-check it before inserting. The same
+        ``m2m_changed`` signals are sent, so cache invalidation and the
+        category/tag post counts still follow.
+        """
+        through = Post.tags.through
+        wanted = {getattr(tag, "pk", tag) for tag in tags}
+        if current is None:
+            current = through.objects.filter(post_id=self.pk).values_list(
+                "tag_id", flat=True
+            )
+        current = set(current)
+        removed, added = current - wanted, wanted - current
+
+        db = through.objects.db
+        signal = {
+            "sender": through,
+            "instance": self,
+            "reverse": False,
+            "model": Tag,
+            "using": db,
+        }
+        with transaction.atomic(using=db, savepoint=False):
+            if removed:
+                models.signals.m2m_changed.send(
+                    action="pre_remove", pk_set=removed, **signal
+                )
+                delete_rows(through.objects.filter(post_id=self.pk, tag_id__in=removed))
+                models.signals.m2m_changed.send(
+                    action="post_remove", pk_set=removed, **signal
+                )
+            if added:
+                models.signals.m2m_changed.send(
+                    action="pre_add", pk_set=added, **signal
+                )
+                through.objects.bulk_create(
+                    through(post_id=self.pk, tag_id=tag_id) for tag_id in added
+                )
+                models.signals.m2m_changed.send(
+                    action="post_add", pk_set=added, **signal
+                )
+        getattr(self, "_prefetched_objects_cache", {}).pop("tags", None)
 
     def _generate_unique_slug(self):
         """Generate a unique slug from title with random suffix if needed."""
-        base_slug = slugify(self.title)[:50]  # Limit base slug length
+        return self.generate_unique_slugs([self.title])[0]
+
+    def _insert_with_unique_slug(self, *args, **kwargs):
+        """Insert, re-allocating the slug if a concurrent insert took it.
 
-        # If base slug is unique, use it
-        if not Post.objects.filter(slug=base_slug).exists():
-            return base_slug
+        The insert runs in a savepoint so a unique violation on ``slug``
+        leaves any surrounding transaction usable for the retry.
+        """
+        for attempt in range(SLUG_INSERT_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                last_attempt = attempt == SLUG_INSERT_ATTEMPTS - 1
+                if last_attempt or not Post.objects.filter(slug=self.slug).exists():
+                    raise
+                self.slug = self._generate_unique_slug()
 
-        # Generate slug with random suffix
-        while True:
-            random_suffix = str(uuid.uuid4().hex)[:8]
-            unique_slug = f"{base_slug}-{random_suffix}"
-            if not Post.objects.filter(slug=unique_slug).exists():
-                return unique_slug
+    @classmethod
+    def generate_unique_slugs(cls, titles):
+        """Return one unique slug per title, for a whole batch at once.
+
+        Every title gets its plain slug plus ``SLUG_CANDIDATES`` randomly
+        suffixed ones, and all candidates are checked with a single ``IN``
+        query, so a title shared by thousands of posts still costs one
+        round trip. Another round only happens if every candidate of a
+        title is taken.
+        """
+        bases = [slugify(title)[:SLUG_LENGTH] for title in titles]
+        slugs = [None] * len(bases)
+        claimed = set(RESERVED_SLUGS)
+        pending = list(range(len(bases)))
+        first_round = True
+        while pending:
+            options = {
+                i: ([bases[i]] if first_round else [])
+                + [_suffixed_slug(bases[i]) for _ in range(SLUG_CANDIDATES)]
+                for i in pending
+            }
+            candidates = {slug for choices in options.values() for slug in choices}
+            claimed.update(
+                cls.objects.filter(slug__in=candidates).values_list("slug", flat=True)
+            )
+            retry = []
+            for i in pending:
+                free = next((slug for slug in options[i] if slug not in claimed), None)
+                if free is None:
+                    retry.append(i)
+                else:
+                    slugs[i] = free
+                    claimed.add(free)
+            pending = retry
+            first_round = False
+        return slugs
 
     def __str__(self):
         return self.title
 
 
+def comment_path_segment(pk):
+    return f"{pk:0{COMMENT_PATH_STEP}d}"
+
+
 class Comment(models.Model):
     post = models.ForeignKey("Post", on_delete=models.CASCADE, related_name="comments")
 
@@ -77,9 +333,70 @@ class Comment(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="comments"
     )
 
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="replies",
+    )
+    # Materialized path: the padded ids of every ancestor, then this comment.
+    # Sorting a post's comments by path yields threads in display order (each
+    # reply right after its parent, siblings oldest first), and a subtree is
+    # one contiguous path range.
+    path = models.CharField(max_length=COMMENT_PATH_LENGTH, default="", editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Top-level pages: WHERE post_id = ? AND parent_id IS NULL
+            # [AND created_at > since] ORDER BY created_at DESC, id DESC.
+            models.Index(
+                fields=["post", "-created_at", "-id"],
+                condition=models.Q(parent__isnull=True),
+                name="comment_root_created_idx",
+            ),
+            # Threads: WHERE post_id = ? AND path >= ? AND path < ? ORDER BY path
+            models.Index(fields=["post", "path"], name="comment_post_path_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding or self.path:
+            return super().save(*args, **kwargs)
+
+        # The path ends with our own id, so it is written right after the
+        # insert, in the same transaction.
+        prefix = self.parent.path if self.parent_id else ""
+        self.depth = self.parent.depth + 1 if self.parent_id else 0
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.path = prefix + comment_path_segment(self.pk)
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
+
+    def subtree_range(self):
+        """Return ``(low, high)`` so ``low <= path < high`` is this subtree.
+
+        Every descendant's path starts with ours, and the next sibling's
+        path (our last segment plus one) sorts after all of them.
+        """
+        head, last = self.path[:-COMMENT_PATH_STEP], self.path[-COMMENT_PATH_STEP:]
+        return self.path, head + comment_path_segment(int(last) + 1)
+
+    def delete_subtree(self):
+        """Delete this comment and all of its replies; return how many.
+
+        Runs as a single range ``DELETE`` (see ``delete_rows``), without
+        loading the subtree or sending per-comment ``post_delete`` signals,
+        so callers adjust counters and caches once for the whole subtree.
+        """
+        low, high = self.subtree_range()
+        return delete_rows(
+            Comment.objects.filter(post_id=self.post_id, path__gte=low, path__lt=high)
+        )
+
     def __str__(self):
         return f"Comment by {self.user}"
 
@@ -98,3 +415,53 @@ class Like(models.Model):
 
     def __str__(self):
         return f"{self.user} likes {self.post}"
+
+
+class PostTrending(models.Model):
+    """Time-decayed activity score of a post, backing the trending feed.
+
+    Maintained incrementally by ``trending.add_activity`` and decayed or
+    rebuilt by ``update_trending_scores``; posts without recent activity
+    have no row.
+    """
+
+    post = models.OneToOneField(
+        "Post", on_delete=models.CASCADE, primary_key=True, related_name="trending"
+    )
+    score = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            # Trending feed: ORDER BY score DESC, post_id DESC
+            models.Index(fields=["-score", "-post"], name="posttrending_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"Post {self.post_id} trending at {self.score:.2f}"
+
+
+class PendingLike(models.Model):
+    """A like or unlike waiting in the write-behind buffer.
+
+    Only used by ``like_buffer.DatabaseLikeBuffer``; rows are deleted by
+    the flush that applies them.
+    """
+
+    post = models.ForeignKey("Post", on_delete=models.CASCADE, related_name="+")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    liked = models.BooleanField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Latest pending intent of a user on a post.
+            models.Index(
+                fields=["post", "user", "-id"], name="pendinglike_post_user_idx"
+            ),
+        ]
+
+    def __str__(self):
+        action = "like" if self.liked else "unlike"
+        return f"Pending {action} of post {self.post_id} by user {self.user_id}"
@@ -0,0 +1,248 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def encode_cursor_token(value, pk, reverse=False):
+    """Return the opaque cursor for the row at ``(value, pk)``.
+
+    Walking forward from it yields the rows after that position in the
+    list's ordering; ``reverse`` walks back towards the start instead.
+    """
+    payload = json.dumps({"v": value.isoformat(), "id": pk, "r": int(reverse)})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (cursor) pagination over ``(<ordering field>, id)``.
+
+    The ordering field is taken from the queryset's first ``order_by`` term,
+    so ``OrderingFilter`` keeps working in both directions. Each page is a
+    bounded index range scan, so latency does not depend on how deep the
+    client has paged, and no ``COUNT(*)`` is issued.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering_fields = ("created_at", "updated_at")
+    default_ordering = "-created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(queryset)
+
+        position = self.decode_cursor(request)
+        reverse = False
+        if position is not None:
+            value, pk, reverse = position
+            queryset = queryset.filter(self._after(value, pk, reverse))
+
+        # Walking backwards means flipping the sort, then flipping the page.
+        descending = self.descending != reverse
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}pk")
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        """Return ``(field, descending)`` from the queryset's leading ordering.
+
+        Orderings a cursor cannot encode, such as the relevance rank of a
+        ``?search=``, are rejected rather than silently replaced.
+        """
+        ordering = queryset.query.order_by or (self.default_ordering,)
+        term = ordering[0] if isinstance(ordering[0], str) else self.default_ordering
+        field = term.lstrip("-")
+        if field not in self.ordering_fields:
+            allowed = ", ".join(self.ordering_fields)
+            message = (
+                f"Cursor pagination cannot order by {field}; pass "
+                f"ordering= one of {allowed}, or use page numbers."
+            )
+            raise ValidationError({"pagination": [message]})
+        return field, term.startswith("-")
+
+    def _after(self, value, pk, reverse):
+        """Filter selecting rows strictly past ``(value, pk)`` in walk order.
+
+        The redundant ``field <= value`` bound lets the database turn the
+        row comparison into a single index range scan.
+        """
+        op = "lt" if self.descending != reverse else "gt"
+        bound = {f"{self.field}__{op}e": value}
+        return Q(**bound) & (
+            Q(**{f"{self.field}__{op}": value}) | Q(**{f"pk__{op}": pk})
+        )
+
+    def encode_cursor(self, obj, reverse):
+        token = encode_cursor_token(getattr(obj, self.field), obj.pk, reverse)
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "page")
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            return (
+                datetime.fromisoformat(payload["v"]),
+                int(payload["id"]),
+                bool(payload.get("r")),
+            )
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class CommentThreadPagination(KeysetPagination):
+    """Forward-only keyset pages over comments in thread (``path``) order.
+
+    Paths are unique, so the last path on a page is the whole cursor and
+    each page is one range scan of the ``(post, path)`` index.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        after = self.decode_cursor(request)
+        if after is not None:
+            queryset = queryset.filter(path__gt=after)
+
+        results = list(queryset.order_by("path")[: self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.has_previous = False
+        self.page = results[: self.page_size]
+        return self.page
+
+    def encode_cursor(self, obj, reverse):
+        token = base64.urlsafe_b64encode(obj.path.encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            path = base64.urlsafe_b64decode(token.encode()).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not path.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+        return path
+
+
+class PostPagination(PageNumberPagination):
+    """Page-number pagination with an opt-in keyset mode.
+
+    Requests carrying ``?pagination=cursor`` or a ``cursor`` token are paged
+    by ``KeysetPagination``; everything else keeps the classic
+    ``count``/``next``/``previous`` page-number envelope.
+    """
+
+    mode_query_param = "pagination"
+    cursor_class = KeysetPagination
+
+    def use_cursor(self, request):
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == "cursor"
+            or self.cursor_class.cursor_query_param in params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_class()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        return parameters + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` to page with opaque keyset cursors.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": self.cursor_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor token taken from a `next`/`previous` link.",
+                "schema": {"type": "string"},
+            },
+        ]
@@ -0,0 +1,130 @@
+"""Fast read-only rendering for post list GETs.
+
+``PostSerializer`` builds a model instance per row and runs a field
+object per attribute. List GETs instead read ``values_list()`` rows into
+``PostRecord`` objects (``__slots__``, no model machinery), fetch the tag
+ids of the page with one query, resolve category and tag names through
+``taxonomy_cache``, and build the response dicts directly.
+The output matches ``PostSerializer`` field for field, including sparse
+fieldsets; ``tests.FastPostRenderingTestCase`` checks the two paths
+against each other.
+"""
+
+from django.db.models.query import ValuesListIterable
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from . import likes, taxonomy_cache
+from .fieldsets import ALWAYS_LOADED, POST_FIELD_ANNOTATIONS, POST_FIELD_COLUMNS
+from .serializers import PostSerializer
+
+# Rendered fields, in serializer order (write-only fields never render).
+LIST_FIELDS = tuple(name for name in PostSerializer.Meta.fields if name != "tags_input")
+
+RECORD_COLUMNS = (
+    ("pk",)
+    + tuple(
+        dict.fromkeys(
+            column for columns in POST_FIELD_COLUMNS.values() for column in columns
+        )
+    )
+    + tuple(name for names in POST_FIELD_ANNOTATIONS.values() for name in names)
+)
+
+
+class PostRecord:
+    """One post row, with an attribute per selected column."""
+
+    __slots__ = RECORD_COLUMNS
+
+    def __init__(self, columns, values):
+        for column, value in zip(columns, values):
+            setattr(self, column, value)
+
+
+class PostRecordIterable(ValuesListIterable):
+    """Yield ``PostRecord`` objects instead of tuples.
+
+    Paginators keep working on the queryset (slicing, ``count()``, keyset
+    filters) and read ``pk``/``created_at`` from the records like from
+    model instances.
+    """
+
+    def __iter__(self):
+        columns = self.queryset._fields
+        for values in super().__iter__():
+            yield PostRecord(columns, values)
+
+
+def post_records(queryset, fields=LIST_FIELDS):
+    """Return ``queryset`` as a lazy queryset of ``PostRecord`` objects."""
+    columns = ["pk", *ALWAYS_LOADED]
+    for name in fields:
+        columns.extend(POST_FIELD_COLUMNS.get(name, ()))
+        columns.extend(
+            annotation
+            for annotation in POST_FIELD_ANNOTATIONS.get(name, ())
+            if annotation in queryset.query.annotations
+        )
+    queryset = queryset.select_related(None).prefetch_related(None)
+    queryset = queryset.values_list(*dict.fromkeys(columns))
+    queryset._iterable_class = PostRecordIterable
+    return queryset
+
+
+def tag_map(post_ids):
+    """Return ``{post_id: [tag dict, ...]}`` for the given posts.
+
+    One query reads the tag ids from the through table; names and slugs are
+    resolved by ``taxonomy_cache``.
+    """
+    return {
+        post_id: taxonomy_cache.tag_dicts(tag_ids)
+        for post_id, tag_ids in taxonomy_cache.tag_ids_by_post(post_ids).items()
+    }
+
+
+def render_posts(records, fields=LIST_FIELDS):
+    """Render ``records`` exactly as ``PostSerializer(many=True).data`` would."""
+    fields = [name for name in LIST_FIELDS if name in fields]
+    tags = tag_map([record.pk for record in records]) if "tags" in fields else {}
+    to_datetime = serializers.DateTimeField().to_representation
+
+    renderers = {
+        "id": lambda record: record.pk,
+        "author": lambda record: record.author__username,
+        "categories": lambda record: taxonomy_cache.category_dicts(record.category),
+        "tags": lambda record: tags.get(record.pk, []),
+        "status": lambda record: "published" if record.is_published else "draft",
+        "created_at": lambda record: to_datetime(record.created_at),
+        "updated_at": lambda record: to_datetime(record.updated_at),
+        "likes_count": lambda record: likes.shown_likes_count(
+            record.likes_count, getattr(record, "likes_delta", 0)
+        ),
+        "liked_by_me": lambda record: getattr(record, "liked_by_me", False),
+    }
+    getters = [(name, renderers.get(name) or _column_getter(name)) for name in fields]
+    return [{name: getter(record) for name, getter in getters} for record in records]
+
+
+def _column_getter(name):
+    return lambda record: getattr(record, name)
+
+
+class FastPostListMixin:
+    """Serve list GETs through ``post_records`` / ``render_posts``.
+
+    Sits above the generic list view; writes and the OpenAPI schema still
+    go through the serializer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is None:
+            fields = LIST_FIELDS
+        records = post_records(self.filter_queryset(self.get_queryset()), fields)
+
+        page = self.paginate_queryset(records)
+        if page is not None:
+            return self.get_paginated_response(render_posts(page, fields))
+        return Response(render_posts(list(records), fields))
@@ -0,0 +1,141 @@
+"""Full-text search over posts.
+
+PostgreSQL uses a weighted ``tsvector`` column (title ``A``, content ``B``)
+with a GIN index; SQLite uses an FTS5 external-content table. Both are
+created and kept in sync by database triggers (see migration
+``0005_post_search``), so every write path -- ``save()``, ``update()`` and
+``bulk_create()`` -- refreshes the index. Other databases fall back to
+DRF's ``icontains`` search.
+"""
+
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import BooleanField, FloatField, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
+
+SEARCH_CONFIG = "english"
+FTS_TABLE = "posts_post_fts"
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF title, content ON posts_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO {FTS_TABLE}(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+class PostgresSearchEngine:
+    """Matches and ranks posts against the stored ``search_vector`` column."""
+
+    def search(self, queryset, text):
+        table = queryset.model._meta.db_table
+        query = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+        match = RawSQL(
+            f"{table}.search_vector @@ {query}", [text], output_field=BooleanField()
+        )
+        rank = RawSQL(
+            f"ts_rank({table}.search_vector, {query})",
+            [text],
+            output_field=FloatField(),
+        )
+        return queryset.filter(match).annotate(search_rank=rank)
+
+
+class SQLiteSearchEngine:
+    """Matches and ranks posts through the ``posts_post_fts`` FTS5 table."""
+
+    def search(self, queryset, text):
+        match = self.to_match_expression(text)
+        if not match:
+            # Still annotated: the filter orders by ``search_rank`` next.
+            return queryset.none().annotate(search_rank=Value(0.0))
+        table = queryset.model._meta.db_table
+        ids = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+        )
+        # bm25() is lower-is-better; negate it so both engines sort descending.
+        rank = RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}, {TITLE_WEIGHT}, {CONTENT_WEIGHT}) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"AND {FTS_TABLE}.rowid = {table}.id)",
+            [match],
+            output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=ids).annotate(search_rank=rank)
+
+    @staticmethod
+    def to_match_expression(text):
+        """Quote each word as an FTS5 prefix term so user input cannot inject syntax."""
+        words = re.findall(r"\w+", text)
+        return " ".join(f'"{word}"*' for word in words)
+
+
+SEARCH_ENGINES = {
+    "postgresql": PostgresSearchEngine,
+    "sqlite": SQLiteSearchEngine,
+}
+
+
+def get_search_engine():
+    """Return the search engine for the default database, or ``None``."""
+    engine_class = SEARCH_ENGINES.get(connection.vendor)
+    return engine_class() if engine_class else None
+
+
+class PostSearchFilter(SearchFilter):
+    """``?search=`` backed by the database's full-text index.
+
+    Results are ordered by relevance unless the client passes an explicit
+    ``ordering``. Place this backend after ``OrderingFilter`` so the rank
+    ordering is not overridden.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        engine = get_search_engine()
+        if engine is None:
+            return super().filter_queryset(request, queryset, view)
+
+        text = " ".join(self.get_search_terms(request))
+        if not text:
+            return queryset
+
+        queryset = engine.search(queryset, text)
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by("-search_rank", *queryset.query.order_by)
+        return queryset
+
+
+def install_sqlite_triggers(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """``post_migrate`` hook that re-creates the FTS5 sync triggers.
+
+    SQLite's schema editor rebuilds ``posts_post`` for most column changes,
+    which silently drops the triggers installed by ``0005_post_search``.
+    """
+    conn = connections[using]
+    if conn.vendor != "sqlite" or FTS_TABLE not in conn.introspection.table_names():
+        return
+    with conn.cursor() as cursor:
+        for sql in SQLITE_TRIGGERS:
+            cursor.execute(sql)
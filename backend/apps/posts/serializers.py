@@ -1,9 +1,103 @@
+from django.db.models import Exists, OuterRef
+from django.urls import reverse
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+from . import likes, taxonomy_cache
+from .models import COMMENT_MAX_DEPTH, Category, Comment, Post, Tag
+from .pagination import KeysetPagination, encode_cursor_token
+
+# Newest comments embedded in post detail; the rest are paged through the
+# comments endpoint starting at ``comments_next``.
+EMBEDDED_COMMENTS = 10
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field for ``Category`` / ``Tag`` resolved by ``taxonomy_cache``.
+
+    Validates ids against the process-local snapshot instead of issuing a
+    query per id; ``queryset`` still drives the schema and browsable API.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        instance = taxonomy_cache.instance(self.queryset.model, pk)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        """Validate ``many=True`` lists in one batch."""
+        list_kwargs = {k: v for k, v in kwargs.items() if k in MANY_RELATION_KWARGS}
+        return CachedManyPrimaryKeyRelatedField(
+            child_relation=cls(*args, **kwargs), **list_kwargs
+        )
+
+
+class CachedManyPrimaryKeyRelatedField(serializers.ManyRelatedField):
+    """List of ``Category`` / ``Tag`` ids validated as a whole.
+
+    Ids are type-checked one by one, then resolved together through
+    ``taxonomy_cache.instances`` (at most one ``id__in`` query), and every
+    unknown id is reported in a single error list. Duplicates collapse.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+            try:
+                pks.append(int(item))
+            except (TypeError, ValueError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+        pks = list(dict.fromkeys(pks))
+
+        found = taxonomy_cache.instances(child.queryset.model, pks)
+        missing = [pk for pk in pks if pk not in found]
+        if missing:
+            message = child.error_messages["does_not_exist"]
+            raise serializers.ValidationError(
+                [message.format(pk_value=pk) for pk in missing],
+                code="does_not_exist",
+            )
+        return [found[pk] for pk in pks]
+
+
+class LikesCountField(serializers.IntegerField):
+    """``likes_count`` plus the reader's buffered toggle (``likes_delta``)."""
+
+    def get_attribute(self, instance):
+        return likes.shown_likes_count(
+            instance.likes_count, getattr(instance, "likes_delta", 0)
+        )
+
 
-from .models import Category, Comment, Post, Tag
+class SparseFieldsSerializerMixin:
+    """Drop fields not listed in ``context["sparse_fields"]`` (when given)."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        keep = self.context.get("sparse_fields")
+        if keep is not None:
+            for name in set(self.fields) - set(keep):
+                if not self.fields[name].write_only:
+                    self.fields.pop(name)
 
-class PostSerializer(serializers.ModelSerializer):
+
+class PostSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for listing and creating blog posts."""
 
     title = serializers.CharField(
@@ -17,7 +111,7 @@ class PostSerializer(serializers.ModelSerializer):
     author = serializers.ReadOnlyField(
         source="author.username", help_text="Username of the post author (read-only)."
     )
-    category = serializers.PrimaryKeyRelatedField(
+    category = CachedPrimaryKeyRelatedField(
         queryset=Category.objects.all(),
         required=False,
         allow_null=True,
@@ -29,7 +123,7 @@ class PostSerializer(serializers.ModelSerializer):
     tags = serializers.SerializerMethodField(
         help_text="List of tags associated with this post."
     )
-    tags_input = serializers.PrimaryKeyRelatedField(
+    tags_input = CachedPrimaryKeyRelatedField(
         queryset=Tag.objects.all(),
         many=True,
         required=False,
@@ -43,44 +137,49 @@ class PostSerializer(serializers.ModelSerializer):
     status = serializers.SerializerMethodField(
         help_text="Post status: draft, published, or archived."
     )
-    likes_count = serializers.IntegerField(
-        source="likes.count",
+    excerpt = serializers.CharField(
+        read_only=True,
+        help_text="Plain-text preview of the content (read-only).",
+    )
+    word_count = serializers.IntegerField(
+        read_only=True, help_text="Number of words in the content (read-only)."
+    )
+    reading_time_minutes = serializers.IntegerField(
+        read_only=True, help_text="Estimated reading time in minutes (read-only)."
+    )
+    likes_count = LikesCountField(
         read_only=True,
         help_text="Total number of likes on this post (read-only).",
     )
     comments_count = serializers.IntegerField(
-        source="comments.count",
         read_only=True,
         help_text="Total number of comments on this post (read-only).",
     )
+    liked_by_me = serializers.SerializerMethodField(
+        help_text="Whether the current user liked this post; false when anonymous."
+    )
 
     def get_categories(self, obj):
         """Return category as a list for frontend compatibility."""
-        if obj.category:
-            return [
-                {
-                    "id": obj.category.id,
-                    "name": obj.category.name,
-                    "slug": obj.category.slug,
-                }
-            ]
-        return []
+        return taxonomy_cache.category_dicts(obj.category_id)
 
     def get_tags(self, obj):
         """Return tags with full data for frontend."""
-        return [
-            {"id": tag.id, "name": tag.name, "slug": tag.slug} for tag in obj.tags.all()
-        ]
+        return taxonomy_cache.tag_dicts(taxonomy_cache.post_tag_ids(obj))
 
     def get_status(self, obj):
         """Return status based on is_published field."""
         return "published" if obj.is_published else "draft"
 
+    def get_liked_by_me(self, obj):
+        """Read the ``liked_by_me`` annotation; posts loaded without it are unliked."""
+        return getattr(obj, "liked_by_me", False)
+
     def create(self, validated_data):
         """Handle tags during creation."""
         tags_data = validated_data.pop("tags_input", [])
         post = Post.objects.create(**validated_data)
-        post.tags.set(tags_data)
+        post.assign_tags(tags_data, current=())
         return post
 
     def update(self, instance, validated_data):
@@ -92,7 +191,7 @@ class PostSerializer(serializers.ModelSerializer):
         instance.save()
 
         if tags_data is not None:
-            instance.tags.set(tags_data)
+            instance.assign_tags(tags_data)
 
         return instance
 
@@ -103,6 +202,9 @@ class PostSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "content",
+            "excerpt",
+            "word_count",
+            "reading_time_minutes",
             "author",
             "category",
             "categories",
@@ -114,6 +216,7 @@ class PostSerializer(serializers.ModelSerializer):
             "updated_at",
             "likes_count",
             "comments_count",
+            "liked_by_me",
         ]
         read_only_fields = (
             "id",
@@ -123,8 +226,12 @@ class PostSerializer(serializers.ModelSerializer):
             "categories",
             "status",
             "tags",
+            "excerpt",
+            "word_count",
+            "reading_time_minutes",
             "likes_count",
             "comments_count",
+            "liked_by_me",
         )
         extra_kwargs = {
             "created_at": {
@@ -136,7 +243,7 @@ class PostSerializer(serializers.ModelSerializer):
         }
 
 
-class PostDetailSerializer(serializers.ModelSerializer):
+class PostDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     """Serializer for retrieving and updating a single post."""
 
     title = serializers.CharField(
@@ -149,7 +256,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
     author = serializers.ReadOnlyField(
         source="author.username", help_text="Username of the post author (read-only)."
     )
-    category = serializers.PrimaryKeyRelatedField(
+    category = CachedPrimaryKeyRelatedField(
         queryset=Category.objects.all(),
         required=False,
         allow_null=True,
@@ -161,7 +268,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
     tags = serializers.SerializerMethodField(
         help_text="List of tags associated with this post."
     )
-    tags_input = serializers.PrimaryKeyRelatedField(
+    tags_input = CachedPrimaryKeyRelatedField(
         queryset=Tag.objects.all(),
         many=True,
         required=False,
@@ -174,47 +281,80 @@ class PostDetailSerializer(serializers.ModelSerializer):
     status = serializers.SerializerMethodField(
         help_text="Post status: draft, published, or archived."
     )
-    likes_count = serializers.IntegerField(
-        source="likes.count",
+    excerpt = serializers.CharField(
+        read_only=True,
+        help_text="Plain-text preview of the content (read-only).",
+    )
+    word_count = serializers.IntegerField(
+        read_only=True, help_text="Number of words in the content (read-only)."
+    )
+    reading_time_minutes = serializers.IntegerField(
+        read_only=True, help_text="Estimated reading time in minutes (read-only)."
+    )
+    likes_count = LikesCountField(
         read_only=True,
         help_text="Total number of likes on this post (read-only).",
     )
     comments_count = serializers.IntegerField(
-        source="comments.count",
         read_only=True,
         help_text="Total number of comments on this post (read-only).",
     )
+    liked_by_me = serializers.SerializerMethodField(
+        help_text="Whether the current user liked this post; false when anonymous."
+    )
     comments = serializers.SerializerMethodField(
-        help_text="List of comments for this post, ordered by creation date (newest first)."
+        help_text=(
+            f"The newest {EMBEDDED_COMMENTS} top-level comments on this post, "
+            "newest first."
+        )
+    )
+    comments_next = serializers.SerializerMethodField(
+        help_text="URL of the next page of older comments, or null if none."
     )
 
     def get_categories(self, obj):
         """Return category as a list for frontend compatibility."""
-        if obj.category:
-            return [
-                {
-                    "id": obj.category.id,
-                    "name": obj.category.name,
-                    "slug": obj.category.slug,
-                }
-            ]
-        return []
+        return taxonomy_cache.category_dicts(obj.category_id)
 
     def get_tags(self, obj):
         """Return tags with full data for frontend."""
-        return [
-            {"id": tag.id, "name": tag.name, "slug": tag.slug} for tag in obj.tags.all()
-        ]
+        return taxonomy_cache.tag_dicts(taxonomy_cache.post_tag_ids(obj))
 
     def get_status(self, obj):
         """Return status based on is_published field."""
         return "published" if obj.is_published else "draft"
 
+    def get_liked_by_me(self, obj):
+        """Read the ``liked_by_me`` annotation; posts loaded without it are unliked."""
+        return getattr(obj, "liked_by_me", False)
+
+    def _recent_comments(self, obj):
+        """Return up to ``EMBEDDED_COMMENTS + 1`` newest comments.
+
+        Uses the ``recent_comments`` prefetch set up by the detail view and
+        falls back to one bounded query when the post was loaded without it.
+        """
+        if not hasattr(obj, "recent_comments"):
+            obj.recent_comments = list(recent_comments_queryset(obj.comments.all()))
+        return obj.recent_comments
+
     def get_comments(self, obj):
-        """Return comments for this post, ordered by newest first."""
-        comments = obj.comments.all().order_by("-created_at")
+        """Return the newest comments for this post, newest first."""
+        comments = self._recent_comments(obj)[:EMBEDDED_COMMENTS]
         return CommentSerializer(comments, many=True).data
 
+    def get_comments_next(self, obj):
+        """Link to the comments endpoint, continuing after the last embedded one."""
+        comments = self._recent_comments(obj)
+        if len(comments) <= EMBEDDED_COMMENTS:
+            return None
+        last = comments[EMBEDDED_COMMENTS - 1]
+        token = encode_cursor_token(last.created_at, last.pk)
+        url = reverse("post-comments", kwargs={"slug": obj.slug})
+        url = f"{url}?{KeysetPagination.cursor_query_param}={token}"
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
     def update(self, instance, validated_data):
         """Handle tags during update."""
         tags_data = validated_data.pop("tags_input", None)
@@ -224,7 +364,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
         instance.save()
 
         if tags_data is not None:
-            instance.tags.set(tags_data)
+            instance.assign_tags(tags_data)
 
         return instance
 
@@ -235,6 +375,9 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "title",
             "slug",
             "content",
+            "excerpt",
+            "word_count",
+            "reading_time_minutes",
             "author",
             "category",
             "categories",
@@ -244,7 +387,9 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "status",
             "likes_count",
             "comments_count",
+            "liked_by_me",
             "comments",
+            "comments_next",
             "created_at",
             "updated_at",
         ]
@@ -255,9 +400,14 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "categories",
             "status",
             "tags",
+            "excerpt",
+            "word_count",
+            "reading_time_minutes",
             "likes_count",
             "comments_count",
+            "liked_by_me",
             "comments",
+            "comments_next",
         )
         extra_kwargs = {
             "created_at": {
@@ -307,6 +457,28 @@ class TagSerializer(serializers.ModelSerializer):
         }
 
 
+class CategoryCountSerializer(CategorySerializer):
+    """A category with its number of published posts (``?counts=true``)."""
+
+    posts_count = serializers.IntegerField(
+        read_only=True, help_text="Number of published posts in the category."
+    )
+
+    class Meta(CategorySerializer.Meta):
+        fields = [*CategorySerializer.Meta.fields, "posts_count"]
+
+
+class TagCountSerializer(TagSerializer):
+    """A tag with its number of published posts (``?counts=true``)."""
+
+    posts_count = serializers.IntegerField(
+        read_only=True, help_text="Number of published posts with the tag."
+    )
+
+    class Meta(TagSerializer.Meta):
+        fields = [*TagSerializer.Meta.fields, "posts_count"]
+
+
 class CommentSerializer(serializers.ModelSerializer):
     """Serializer for post comments."""
 
@@ -314,13 +486,68 @@ class CommentSerializer(serializers.ModelSerializer):
         read_only=True, help_text="Username of the comment author (read-only)."
     )
     content = serializers.CharField(help_text="The text content of the comment.")
+    parent = serializers.PrimaryKeyRelatedField(
+        queryset=Comment.objects.only("pk", "post_id", "path", "depth"),
+        required=False,
+        allow_null=True,
+        help_text="ID of the comment this replies to, or null for a top-level comment.",
+    )
+    has_replies = serializers.SerializerMethodField(
+        help_text="Whether replies exist; load them from the replies endpoint."
+    )
 
     class Meta:
         model = Comment
-        fields = ["id", "user", "content", "created_at"]
+        fields = [
+            "id",
+            "user",
+            "parent",
+            "depth",
+            "content",
+            "created_at",
+            "has_replies",
+        ]
+        read_only_fields = ["depth"]
         extra_kwargs = {
             "id": {"help_text": "Unique identifier for the comment."},
+            "depth": {"help_text": "Nesting level; 0 for top-level comments."},
             "created_at": {
                 "help_text": "Timestamp when the comment was created (read-only)."
             },
         }
+
+    def get_has_replies(self, obj):
+        """Read the ``has_replies`` annotation; unannotated rows are new."""
+        return getattr(obj, "has_replies", False)
+
+    def validate_parent(self, parent):
+        """Replies stay on the parent's post and within the path length."""
+        if parent is None:
+            return parent
+        post = self.context.get("post")
+        if post is not None and parent.post_id != post.pk:
+            raise serializers.ValidationError("Parent comment is on another post.")
+        if parent.depth >= COMMENT_MAX_DEPTH:
+            raise serializers.ValidationError(
+                f"Replies cannot be nested more than {COMMENT_MAX_DEPTH} levels deep."
+            )
+        return parent
+
+
+def with_reply_flags(queryset):
+    """Annotate comments with ``has_replies`` (an indexed ``EXISTS``)."""
+    return queryset.annotate(
+        has_replies=Exists(Comment.objects.filter(parent=OuterRef("pk")))
+    )
+
+
+def recent_comments_queryset(queryset):
+    """Bound ``queryset`` to the newest top-level comments in post detail.
+
+    One row past ``EMBEDDED_COMMENTS`` is read to tell whether older
+    comments exist. Works as a sliced ``Prefetch`` queryset.
+    """
+    queryset = with_reply_flags(queryset.filter(parent__isnull=True))
+    return queryset.select_related("user").order_by("-created_at", "-id")[
+        : EMBEDDED_COMMENTS + 1
+    ]
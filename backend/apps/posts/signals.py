@@ -0,0 +1,181 @@
+"""Invalidate cached post responses whenever posts, likes or comments change,
+and keep the taxonomy cache, trending scores and category/tag post counts
+in step."""
+
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from . import cache as response_cache
+from . import taxonomy, taxonomy_cache, trending
+from .models import Category, Comment, Like, Post, Tag
+
+# Saving any of these can move a post in or out of the category/tag counts.
+COUNTED_POST_FIELDS = {"is_published", "category", "category_id"}
+
+
+def _scopes_for(post_ids):
+    """Return the cache scopes covering the stored state of the given posts."""
+    rows = Post.objects.filter(pk__in=post_ids).values_list(
+        "slug", "category__slug", "tags__slug"
+    )
+    scopes = set()
+    for slug, category_slug, tag_slug in rows:
+        scopes |= response_cache.post_scopes(slug, [category_slug], [tag_slug])
+    return scopes
+
+
+def invalidate_posts(post_ids):
+    """Invalidate the given posts after writes that bypass model signals."""
+    response_cache.bump(_scopes_for(post_ids))
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_scopes(sender, instance, raw=False, **kwargs):
+    """Capture the pre-update scopes so moving a post out of a category
+    also invalidates the category it left."""
+    if raw or instance.pk is None:
+        return
+    instance._cache_scopes_before = _scopes_for([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    scopes = instance.__dict__.pop("_cache_scopes_before", set())
+    response_cache.bump(scopes | _scopes_for([instance.pk]))
+
+
+@receiver(pre_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    # Tags are still attached in pre_delete; they are gone by post_delete.
+    response_cache.bump(_scopes_for([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("pre_clear", "post_add", "post_remove"):
+        return
+
+    if reverse:
+        # tag.posts.<op>(...): the tag's lists plus every touched post.
+        scopes = _scopes_for(pk_set) if pk_set else set()
+        scopes.add(f"tag:{instance.slug}")
+        if action == "pre_clear":
+            scopes |= _scopes_for(instance.posts.values("pk"))
+    else:
+        scopes = _scopes_for([instance.pk])
+        if pk_set:
+            tag_slugs = Tag.objects.filter(pk__in=pk_set).values_list("slug", flat=True)
+            scopes |= response_cache.post_scopes(instance.slug, tag_slugs=tag_slugs)
+    response_cache.bump(scopes)
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_delete, sender=Like)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_post_engagement(sender, instance, **kwargs):
+    """Likes and comments change counts shown in both lists and detail."""
+    if kwargs.get("raw"):
+        return
+    response_cache.bump(_scopes_for([instance.post_id]))
+
+
+def _trending_weight(sender):
+    return trending.LIKE_WEIGHT if sender is Like else trending.COMMENT_WEIGHT
+
+
+@receiver(post_save, sender=Like)
+@receiver(post_save, sender=Comment)
+def heat_trending_post(sender, instance, created, raw=False, **kwargs):
+    """New likes and comments raise the post's trending score."""
+    if created and not raw:
+        trending.add_activity({instance.post_id: _trending_weight(sender)})
+
+
+@receiver(post_delete, sender=Like)
+@receiver(post_delete, sender=Comment)
+def cool_trending_post(sender, instance, **kwargs):
+    """Removed likes and comments take their weight back off the score."""
+    trending.add_activity({instance.post_id: -_trending_weight(sender)})
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_counted_state(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._counted_state_before = taxonomy.stored_state(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Publishing, unpublishing and recategorizing move the post counts."""
+    if raw:
+        return
+    before = instance.__dict__.pop("_counted_state_before", None)
+    if update_fields is not None and not COUNTED_POST_FIELDS & set(update_fields):
+        return
+    taxonomy.post_changed(
+        instance.pk, before, (instance.is_published, instance.category_id)
+    )
+
+
+@receiver(pre_delete, sender=Post)
+def uncount_deleted_post(sender, instance, **kwargs):
+    # Tags are still attached in pre_delete, as for the cache scopes above.
+    taxonomy.post_changed(instance.pk, taxonomy.stored_state(instance.pk), None)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def count_post_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    """Count tag links as they are added, removed or cleared.
+
+    Removals are counted before they happen, from the links that actually
+    exist; additions after, where ``pk_set`` only holds the new links.
+    """
+    if action not in ("post_add", "pre_remove", "pre_clear"):
+        return
+    if reverse:
+        links = sender.objects.filter(tag_id=instance.pk)
+        if pk_set is not None:
+            links = links.filter(post_id__in=pk_set)
+    else:
+        links = sender.objects.filter(post_id=instance.pk)
+        if pk_set is not None:
+            links = links.filter(tag_id__in=pk_set)
+    taxonomy.tag_links_changed(links, 1 if action == "post_add" else -1)
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Tag)
+def remember_taxonomy_slug(sender, instance, raw=False, **kwargs):
+    """Capture the stored slug so a renamed category/tag also invalidates
+    the lists filtered by its old slug."""
+    if raw or instance.pk is None:
+        return
+    instance._cache_slug_before = (
+        sender.objects.filter(pk=instance.pk).values_list("slug", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_taxonomy_cache(sender, instance, **kwargs):
+    """Category and tag writes make every process reload its snapshot and
+    refresh the cached responses that show the old name or slug."""
+    slug_before = instance.__dict__.pop("_cache_slug_before", None)
+    response_cache.bump(
+        response_cache.taxonomy_scopes(
+            sender._meta.model_name, [slug_before, instance.slug]
+        )
+    )
+    taxonomy_cache.invalidate()
@@ -3,5 +3,5 @@ from django.urls import path
 from .views import TagListCreateAPIView
 
 urlpatterns = [
-    path("", TagListCreateAPIView.as_view()),
+    path("", TagListCreateAPIView.as_view(), name="tag-list-create"),
 ]
@@ -0,0 +1,142 @@
+"""Published-post counts per category and tag.
+
+``Category.posts_count`` and ``Tag.posts_count`` are materialized counters.
+They move when a post is published, unpublished, recategorized, retagged
+or deleted (through the ``signals`` receivers) and when posts are imported
+in bulk, so listing categories or tags by popularity reads the
+``(-posts_count, name)`` index instead of grouping posts at read time.
+
+Queryset ``update()`` calls on posts bypass the receivers;
+``reconcile_post_counters`` recomputes the counters from scratch.
+"""
+
+from collections import Counter
+
+from django.db.models import F
+from django.db.models.functions import Greatest
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import Category, Post, Tag
+
+# Rows returned by a ``?counts=true`` listing, by default and at most.
+POPULAR_LIMIT = 100
+POPULAR_MAX_LIMIT = 500
+
+TRUE_VALUES = ("1", "true", "yes")
+
+
+def shift_counts(model, deltas):
+    """Add ``{pk: delta}`` to the rows' ``posts_count``, clamped at zero.
+
+    Rows sharing a delta move together in one ``UPDATE``.
+    """
+    by_delta = {}
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            by_delta.setdefault(delta, []).append(pk)
+    for delta, pks in by_delta.items():
+        model.objects.filter(pk__in=pks).update(
+            posts_count=Greatest(F("posts_count") + delta, 0)
+        )
+
+
+def stored_state(post_id):
+    """Return the stored ``(is_published, category_id)`` of a post, or ``None``."""
+    return (
+        Post.objects.filter(pk=post_id)
+        .values_list("is_published", "category_id")
+        .first()
+    )
+
+
+def post_changed(post_id, before, after):
+    """Move the counters for a post going from state ``before`` to ``after``.
+
+    Both are ``(is_published, category_id)`` tuples, ``None`` for a post
+    that does not exist yet (``before``) or any more (``after``). Tags only
+    move when the post is published or unpublished: a new post has none
+    yet, and retagging is counted by ``tag_links_changed``.
+    """
+    was_published = bool(before and before[0])
+    is_published = bool(after and after[0])
+
+    categories = Counter()
+    if was_published:
+        categories[before[1]] -= 1
+    if is_published:
+        categories[after[1]] += 1
+    shift_counts(Category, categories)
+
+    if before is not None and was_published != is_published:
+        tag_ids = Post.tags.through.objects.filter(post_id=post_id).values_list(
+            "tag_id", flat=True
+        )
+        shift_counts(Tag, dict.fromkeys(tag_ids, 1 if is_published else -1))
+
+
+def tag_links_changed(links, delta):
+    """Count ``delta`` for every published post among the ``links`` rows.
+
+    ``links`` is a queryset of ``Post.tags.through`` rows about to be
+    removed (``delta=-1``) or just added (``delta=1``).
+    """
+    tag_ids = links.filter(post__is_published=True).values_list("tag_id", flat=True)
+    shift_counts(
+        Tag, {tag_id: delta * count for tag_id, count in Counter(tag_ids).items()}
+    )
+
+
+def posts_created(posts, tag_ids):
+    """Count posts inserted without signals; ``tag_ids`` holds one list per post."""
+    categories = Counter()
+    tags = Counter()
+    for post, post_tag_ids in zip(posts, tag_ids):
+        if post.is_published:
+            categories[post.category_id] += 1
+            tags.update(post_tag_ids)
+    shift_counts(Category, categories)
+    shift_counts(Tag, tags)
+
+
+class PostCountListMixin:
+    """Serve ``?counts=true`` list GETs from the ``posts_count`` counters.
+
+    In that mode rows without published posts are skipped, the rest come
+    most popular first (ties by name) with ``posts_count`` included, and
+    pagination gives way to a single capped list of ``?limit=`` rows.
+    """
+
+    count_serializer_class = None
+
+    def counts_requested(self):
+        raw = self.request.query_params.get("counts", "")
+        return self.request.method == "GET" and raw.lower() in TRUE_VALUES
+
+    def get_serializer_class(self):
+        if self.counts_requested():
+            return self.count_serializer_class
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        if not self.counts_requested():
+            return super().list(request, *args, **kwargs)
+
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .filter(posts_count__gt=0)
+            .order_by("-posts_count", "name")[: self.get_limit(request)]
+        )
+        return Response(self.get_serializer(rows, many=True).data)
+
+    def get_limit(self, request):
+        raw = request.query_params.get("limit")
+        if not raw:
+            return POPULAR_LIMIT
+        try:
+            limit = int(raw)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            raise ValidationError({"limit": ["Enter a positive integer."]})
+        return min(limit, POPULAR_MAX_LIMIT)
@@ -0,0 +1,209 @@
+"""Process-local cache of the ``Category`` and ``Tag`` tables.
+
+Both tables are tiny and rarely written, yet nearly every post read or
+write resolves category/tag ids to names and slugs. Each process keeps a
+snapshot of both tables, stamped with the ``taxonomy`` generation of the
+shared response cache (see ``cache``). Category and tag writes bump that
+generation through the ``signals`` receivers, and a process whose stamp
+no longer matches reloads both tables (two queries).
+
+The stamp is checked once per request: the first lookup in a request
+compares it and pins the snapshot until the request finishes. Outside a
+request every lookup compares it. An id missing from the snapshot forces
+one reload per request (outside a request, one per stamp), so rows written
+without signals (``bulk_create``) or committed just after another process
+reloaded are still found. Batches resolve their ids with ``instances()``,
+which reads the snapshot once and looks the misses up together.
+
+Renames made with queryset ``update()`` are not noticed until the next
+signalled category/tag write; call ``invalidate()`` after such writes. Like
+the response cache, the stamp is bumped again on commit, so a process that
+reloaded while a write was still in flight reloads once more.
+
+The generation only reaches other processes through a shared cache. Without
+one (``POST_CACHE_SHARED`` off) the stamp is a clock bucket instead, so each
+snapshot is reloaded after at most ``UNSHARED_SNAPSHOT_TTL`` seconds, and
+``instances()``/``instance()`` read ids from the database rather than the
+snapshot, so writes never reference a row another process deleted.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.dispatch import receiver
+
+from . import cache as response_cache
+from .models import Category, Post, Tag
+
+# Seconds a snapshot is trusted when other processes cannot bump its stamp.
+UNSHARED_SNAPSHOT_TTL = 30
+
+# ``categories`` / ``tags`` map ids to ``(id, name, slug)`` rows.
+Snapshot = namedtuple("Snapshot", ["version", "categories", "tags"])
+
+
+class _RequestState(threading.local):
+    in_request = False
+    snapshot = None
+    # Stamp of the last reload forced by an unknown id.
+    missed_version = None
+
+
+_request = _RequestState()
+_lock = threading.Lock()
+_shared = None
+
+
+def _rows(model):
+    return {row[0]: row for row in model.objects.values_list("id", "name", "slug")}
+
+
+def _load(version):
+    global _shared
+    snapshot = Snapshot(version, _rows(Category), _rows(Tag))
+    with _lock:
+        _shared = snapshot
+    return snapshot
+
+
+def _stamp():
+    if not settings.POST_CACHE_SHARED:
+        return int(time.monotonic() // UNSHARED_SNAPSHOT_TTL)
+    (version,) = response_cache.get_generations([response_cache.TAXONOMY_SCOPE])
+    return version
+
+
+def current(reload=False):
+    """Return the snapshot, reloading it if its stamp is out of date."""
+    snapshot = _request.snapshot
+    if snapshot is None or reload:
+        version = _stamp()
+        snapshot = _shared
+        if reload or snapshot is None or snapshot.version != version:
+            snapshot = _load(version)
+        if _request.in_request:
+            _request.snapshot = snapshot
+    return snapshot
+
+
+def invalidate():
+    """Mark every process's snapshot stale after a category/tag write."""
+    global _shared
+    with _lock:
+        _shared = None
+    _request.snapshot = None
+    response_cache.bump([response_cache.TAXONOMY_SCOPE])
+
+
+def _lookup(table, pk):
+    snapshot = current()
+    row = getattr(snapshot, table).get(pk)
+    if row is None and _request.missed_version != snapshot.version:
+        # Unknown id: the row may postdate the snapshot, so reload once.
+        snapshot = current(reload=True)
+        _request.missed_version = snapshot.version
+        row = getattr(snapshot, table).get(pk)
+    return row
+
+
+def category_row(pk):
+    """Return ``(id, name, slug)`` of a category, or ``None``."""
+    return _lookup("categories", pk)
+
+
+def tag_row(pk):
+    """Return ``(id, name, slug)`` of a tag, or ``None``."""
+    return _lookup("tags", pk)
+
+
+def _as_dict(row):
+    return {"id": row[0], "name": row[1], "slug": row[2]}
+
+
+def category_dicts(category_id):
+    """Render a post's ``categories`` field from its ``category_id``."""
+    row = category_row(category_id) if category_id is not None else None
+    return [_as_dict(row)] if row else []
+
+
+def tag_dicts(tag_ids):
+    """Render a post's ``tags`` field from its tag ids, in id order."""
+    rows = (tag_row(pk) for pk in sorted(tag_ids))
+    return [_as_dict(row) for row in rows if row]
+
+
+def tag_ids_by_post(post_ids):
+    """Return ``{post_id: [tag_id, ...]}`` from the through table alone.
+
+    One query against the ``(post_id, tag_id)`` unique index; names and
+    slugs come from the snapshot, so ``posts_tag`` is never joined.
+    """
+    tag_ids = {}
+    rows = Post.tags.through.objects.filter(post_id__in=post_ids).values_list(
+        "post_id", "tag_id"
+    )
+    for post_id, tag_id in rows:
+        tag_ids.setdefault(post_id, []).append(tag_id)
+    return tag_ids
+
+
+def post_tag_ids(post):
+    """Return the tag ids of ``post``, from a ``tags`` prefetch when present."""
+    prefetched = getattr(post, "_prefetched_objects_cache", {}).get("tags")
+    if prefetched is not None:
+        return [tag.pk for tag in prefetched]
+    return tag_ids_by_post([post.pk]).get(post.pk, [])
+
+
+def instances(model, pks):
+    """Return ``{pk: instance}`` for the ``pks`` of ``model`` that exist.
+
+    Ids missing from the snapshot are looked up together with one
+    ``id__in`` query rather than a reload per id. Without a shared cache
+    every id is, since the snapshot may still hold rows deleted elsewhere.
+    """
+    if settings.POST_CACHE_SHARED:
+        snapshot = current()
+        known = snapshot.categories if model is Category else snapshot.tags
+    else:
+        known = {}
+    rows = {pk: known[pk] for pk in pks if pk in known}
+    missing = [pk for pk in pks if pk not in known]
+    if missing:
+        found = model.objects.filter(pk__in=missing).values_list("id", "name", "slug")
+        rows.update((row[0], row) for row in found)
+    return {
+        pk: model.from_db(model.objects.db, ["id", "name", "slug"], row)
+        for pk, row in rows.items()
+    }
+
+
+def instance(model, pk):
+    """Return a ``Category`` or ``Tag`` built from the snapshot, or ``None``.
+
+    Serializers assign these to ``Post.category`` / ``Post.tags`` instead of
+    fetching the row; only ``id``, ``name`` and ``slug`` are loaded.
+    """
+    if not settings.POST_CACHE_SHARED:
+        return instances(model, [pk]).get(pk)
+    row = category_row(pk) if model is Category else tag_row(pk)
+    if row is None:
+        return None
+    return model.from_db(model.objects.db, ["id", "name", "slug"], row)
+
+
+@receiver(request_started)
+def _begin_request(sender, **kwargs):
+    _request.in_request = True
+    _request.snapshot = None
+    _request.missed_version = None
+
+
+@receiver(request_finished)
+def _end_request(sender, **kwargs):
+    _request.in_request = False
+    _request.snapshot = None
+    _request.missed_version = None
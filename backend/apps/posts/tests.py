@@ -1,14 +1,61 @@
+import datetime
+import decimal
+import json
+import tempfile
+import uuid
+from io import StringIO
+from unittest import mock
+
+import msgpack
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import slugify
 from rest_framework import status
-from rest_framework.test import APITestCase
-
-from .models import Category, Comment, Like, Post, Tag
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from config.renderers import ORJSONRenderer
+
+from . import cache as response_cache
+from . import like_buffer, likes, taxonomy_cache, trending
+from .bulk import import_batch, validate_batch
+from .likes import LIKE_STATUS_MAX_SLUGS
+from .models import (
+    Category,
+    Comment,
+    Like,
+    PendingLike,
+    Post,
+    PostTrending,
+    Tag,
+    delete_rows,
+)
+from .rendering import post_records, render_posts
+from .serializers import EMBEDDED_COMMENTS, PostSerializer
 
 User = get_user_model()
 
 
+def capture_sql(action):
+    """Call ``action()``; return its result and the SQL of every query it ran."""
+    with CaptureQueriesContext(connection) as queries:
+        result = action()
+    return result, [query["sql"] for query in queries.captured_queries]
+
+
+class CacheResetAPITestCase(APITestCase):
+    """API test case that starts every test with an empty cache"""
+
+    def setUp(self):
+        cache.clear()
+
+
 class PostAPITestCase(APITestCase):
     """Test cases for Post APIs"""
 
@@ -261,8 +308,8 @@ class CommentAPITestCase(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["content"], "Test comment")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["content"], "Test comment")
 
     def test_list_comments_authenticated(self):
         """Authenticated users can view comments"""
@@ -271,7 +318,7 @@ class CommentAPITestCase(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
 
     def test_create_comment_unauthenticated(self):
         """Unauthenticated users cannot create comments"""
@@ -442,6 +489,26 @@ class LikeAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_like_toggle_statements(self):
+        """A like is one upsert plus one counter update returning the count"""
+        self.client.force_authenticate(user=self.user2)
+        url = reverse("post-like", kwargs={"slug": self.post.slug})
+        response, queries = capture_sql(lambda: self.client.post(url))
+
+        self.assertEqual(response.data["likes_count"], 1)
+        like_sql = [sql for sql in queries if "posts_like" in sql]
+        self.assertEqual(len(like_sql), 1)
+        self.assertIn("ON CONFLICT", like_sql[0])
+
+        unlike_url = reverse("post-unlike", kwargs={"slug": self.post.slug})
+        response, queries = capture_sql(lambda: self.client.post(unlike_url))
+
+        self.assertTrue(response.data["was_removed"])
+        self.assertEqual(response.data["likes_count"], 0)
+        like_sql = [sql for sql in queries if "posts_like" in sql]
+        self.assertEqual(len(like_sql), 1)
+        self.assertTrue(like_sql[0].startswith("DELETE"))
+
 
 class CategoryAPITestCase(APITestCase):
     """Test cases for Category APIs"""
@@ -656,8 +723,6 @@ class ModelTestCase(TestCase):
         Like.objects.create(post=self.post, user=self.user)
 
         # Try to create duplicate like - should raise IntegrityError
-        from django.db import IntegrityError
-
         with self.assertRaises(IntegrityError):
             Like.objects.create(post=self.post, user=self.user)
 
@@ -669,3 +734,2378 @@ class ModelTestCase(TestCase):
         self.assertEqual(self.post.tags.count(), 2)
         self.assertIn(self.tag, self.post.tags.all())
         self.assertIn(tag2, self.post.tags.all())
+
+
+class PostListQueryCountTestCase(APITestCase):
+    """Query-count guards for the post list endpoints"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reader", email="reader@test.com", password="testpass123"
+        )
+        self.tag = Tag.objects.create(name="Python", slug="python")
+
+    def _create_posts(self, count):
+        for i in range(count):
+            post = Post.objects.create(
+                title=f"Post {i}",
+                content="Body",
+                author=self.user,
+                is_published=True,
+            )
+            post.tags.add(self.tag)
+            Like.objects.create(post=post, user=self.user)
+            Comment.objects.create(post=post, user=self.user, content="Hi")
+            Post.adjust_counters(post.pk, likes=1, comments=1)
+
+    def test_post_list_query_count_is_constant(self):
+        """Listing posts should not issue per-row COUNT queries"""
+        url = reverse("post-list-create")
+
+        self._create_posts(1)
+        # The category/tag snapshot loads once per process, not per request.
+        taxonomy_cache.current()
+        # count, page of posts, tag ids
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        self._create_posts(4)
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertEqual(response.data["results"][0]["likes_count"], 1)
+        self.assertEqual(response.data["results"][0]["comments_count"], 1)
+
+    def test_my_posts_query_count_is_constant(self):
+        """Listing my posts should not issue per-row COUNT queries"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse("my-posts")
+
+        self._create_posts(1)
+        taxonomy_cache.current()
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+        self._create_posts(4)
+        with self.assertNumQueries(3):
+            self.client.get(url)
+
+
+class PostCounterTestCase(APITestCase):
+    """Test cases for the denormalized like/comment counters on Post"""
+
+    def setUp(self):
+        self.user1 = User.objects.create_user(
+            username="counter1", email="counter1@test.com", password="testpass123"
+        )
+        self.user2 = User.objects.create_user(
+            username="counter2", email="counter2@test.com", password="testpass123"
+        )
+        self.post = Post.objects.create(
+            title="Counted Post",
+            content="Body",
+            author=self.user1,
+            is_published=True,
+        )
+
+    def test_like_and_unlike_maintain_likes_count(self):
+        """Like/unlike endpoints should keep Post.likes_count in sync"""
+        self.client.force_authenticate(user=self.user2)
+        like_url = reverse("post-like", kwargs={"slug": self.post.slug})
+        unlike_url = reverse("post-unlike", kwargs={"slug": self.post.slug})
+
+        response = self.client.post(like_url)
+        self.assertEqual(response.data["likes_count"], 1)
+        response = self.client.post(like_url)
+        self.assertEqual(response.data["likes_count"], 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+        response = self.client.post(unlike_url)
+        self.assertEqual(response.data["likes_count"], 0)
+        response = self.client.post(unlike_url)
+        self.assertEqual(response.data["likes_count"], 0)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_comment_create_and_delete_maintain_comments_count(self):
+        """Comment endpoints should keep Post.comments_count in sync"""
+        self.client.force_authenticate(user=self.user2)
+        url = reverse("post-comments", kwargs={"slug": self.post.slug})
+
+        response = self.client.post(url, {"content": "First"})
+        self.client.post(url, {"content": "Second"})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 2)
+
+        delete_url = reverse("comment-delete", kwargs={"id": response.data["id"]})
+        self.client.delete(delete_url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+
+    def test_edit_save_keeps_counters_moved_since_load(self):
+        """Saving a stale post instance must not roll back its counters"""
+        stale = Post.objects.get(pk=self.post.pk)
+        self.client.force_authenticate(user=self.user2)
+        self.client.post(reverse("post-like", kwargs={"slug": self.post.slug}))
+        self.client.post(
+            reverse("post-comments", kwargs={"slug": self.post.slug}),
+            {"content": "First"},
+        )
+        activity_at = Post.objects.get(pk=self.post.pk).last_activity_at
+
+        stale.title = "Edited"
+        stale.save()
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, "Edited")
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.comments_count, 1)
+        self.assertEqual(self.post.last_activity_at, activity_at)
+
+    def test_reconcile_post_counters_command(self):
+        """reconcile_post_counters should repair drifted counters"""
+        Like.objects.create(post=self.post, user=self.user1)
+        Like.objects.create(post=self.post, user=self.user2)
+        Comment.objects.create(post=self.post, user=self.user1, content="Hi")
+        other = Post.objects.create(
+            title="Other", content="Body", author=self.user1, likes_count=7
+        )
+
+        out = StringIO()
+        call_command("reconcile_post_counters", "--batch-size", "1", stdout=out)
+
+        self.post.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 2)
+        self.assertEqual(self.post.comments_count, 1)
+        self.assertEqual(other.likes_count, 0)
+        self.assertIn("Fixed 2 posts", out.getvalue())
+
+
+class PostCursorPaginationTestCase(APITestCase):
+    """Test cases for keyset (cursor) pagination of the post lists"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="pager", email="pager@test.com", password="testpass123"
+        )
+        self.category = Category.objects.create(name="Technology", slug="technology")
+        self.posts = [
+            Post.objects.create(
+                title=f"Post {i}",
+                content="Body",
+                author=self.user,
+                category=self.category if i % 2 else None,
+                is_published=True,
+            )
+            for i in range(12)
+        ]
+        # Force timestamp ties so the id tie-breaker is exercised.
+        tied_at = self.posts[5].created_at
+        Post.objects.filter(pk__in=[p.pk for p in self.posts[3:7]]).update(
+            created_at=tied_at
+        )
+
+    def _walk(self, url, params):
+        slugs = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            slugs.extend(post["slug"] for post in response.data["results"])
+            if not response.data["next"]:
+                return slugs, response
+            response = self.client.get(response.data["next"])
+
+    def _expected(self, queryset, ordering):
+        return list(
+            queryset.order_by(
+                ordering, ordering.replace("created_at", "id")
+            ).values_list("slug", flat=True)
+        )
+
+    def test_cursor_walk_descending(self):
+        """Walking the feed by cursor visits every post once, newest first"""
+        url = reverse("post-list-create")
+        slugs, _ = self._walk(url, {"pagination": "cursor"})
+
+        self.assertEqual(slugs, self._expected(Post.objects.all(), "-created_at"))
+
+    def test_cursor_walk_ascending(self):
+        """Cursor pagination honours ascending ordering"""
+        url = reverse("post-list-create")
+        slugs, _ = self._walk(url, {"pagination": "cursor", "ordering": "created_at"})
+
+        self.assertEqual(slugs, self._expected(Post.objects.all(), "created_at"))
+
+    def test_cursor_walk_with_category_filter(self):
+        """Cursor pagination works together with the category filter"""
+        url = reverse("post-list-create")
+        slugs, _ = self._walk(
+            url, {"pagination": "cursor", "category__slug": "technology"}
+        )
+
+        expected = self._expected(
+            Post.objects.filter(category=self.category), "-created_at"
+        )
+        self.assertEqual(slugs, expected)
+
+    def test_cursor_previous_link(self):
+        """Following the previous link returns the preceding page"""
+        url = reverse("post-list-create")
+        first = self.client.get(url, {"pagination": "cursor"})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(first.data["previous"])
+
+    def test_cursor_page_skips_count_query(self):
+        """Cursor pages should not run COUNT(*) over the feed"""
+        url = reverse("post-list-create")
+        first = self.client.get(url, {"pagination": "cursor"})
+
+        # page of posts, tag ids
+        with self.assertNumQueries(2):
+            self.client.get(first.data["next"])
+
+    def test_invalid_cursor(self):
+        """A malformed cursor should return 404"""
+        url = reverse("post-list-create")
+        response = self.client.get(url, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_my_posts_cursor_walk(self):
+        """My posts supports cursor pagination ordered by updated_at"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse("my-posts")
+        slugs, _ = self._walk(url, {"pagination": "cursor", "ordering": "-updated_at"})
+
+        expected = list(
+            Post.objects.order_by("-updated_at", "-id").values_list("slug", flat=True)
+        )
+        self.assertEqual(slugs, expected)
+
+
+class PostFullTextSearchTestCase(APITestCase):
+    """Test cases for full-text post search"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="searcher", email="searcher@test.com", password="testpass123"
+        )
+        self.body_match = Post.objects.create(
+            title="Weekend notes",
+            content="Some thoughts about django migrations and deployment.",
+            author=self.user,
+            is_published=True,
+        )
+        self.title_match = Post.objects.create(
+            title="Django migrations explained",
+            content="A walkthrough of schema changes.",
+            author=self.user,
+            is_published=True,
+        )
+        self.unrelated = Post.objects.create(
+            title="Gardening",
+            content="Tomatoes need sun.",
+            author=self.user,
+            is_published=True,
+        )
+
+    def _search(self, url, term, **params):
+        response = self.client.get(url, {"search": term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post["slug"] for post in response.data["results"]]
+
+    def test_search_ranks_title_matches_first(self):
+        """Title matches should outrank content-only matches"""
+        slugs = self._search(reverse("post-list-create"), "django migrations")
+
+        self.assertEqual(slugs, [self.title_match.slug, self.body_match.slug])
+
+    def test_search_with_explicit_ordering(self):
+        """An explicit ordering parameter overrides relevance ordering"""
+        slugs = self._search(
+            reverse("post-list-create"), "migrations", ordering="-created_at"
+        )
+
+        self.assertEqual(slugs, [self.title_match.slug, self.body_match.slug])
+        slugs = self._search(
+            reverse("post-list-create"), "migrations", ordering="created_at"
+        )
+        self.assertEqual(slugs, [self.body_match.slug, self.title_match.slug])
+
+    def test_ranked_search_rejects_cursor_pagination(self):
+        """Relevance order cannot be cursor-paged; explicit ordering can"""
+        url = reverse("post-list-create")
+        response = self.client.get(
+            url, {"search": "migrations", "pagination": "cursor"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("pagination", response.data)
+
+        slugs = self._search(
+            url, "migrations", pagination="cursor", ordering="-created_at"
+        )
+        self.assertEqual(slugs, [self.title_match.slug, self.body_match.slug])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        """Saving or deleting a post keeps the search index current"""
+        url = reverse("post-list-create")
+        self.unrelated.content = "Tomatoes grow well next to django plants."
+        self.unrelated.save()
+        self.assertIn(self.unrelated.slug, self._search(url, "django"))
+
+        self.title_match.delete()
+        self.assertNotIn(self.title_match.slug, self._search(url, "django"))
+
+    def test_search_ignores_query_syntax(self):
+        """Operator characters in the search term must not raise errors"""
+        slugs = self._search(reverse("post-list-create"), 'django" -(*')
+
+        self.assertEqual(len(slugs), 2)
+
+    def test_search_without_words_returns_nothing(self):
+        """A search term with no word characters matches no posts"""
+        for term in ['"*(', "!"]:
+            self.assertEqual(self._search(reverse("post-list-create"), term), [])
+
+    def test_my_posts_search(self):
+        """My posts uses the same full-text search"""
+        self.client.force_authenticate(user=self.user)
+        slugs = self._search(reverse("my-posts"), "tomatoes")
+
+        self.assertEqual(slugs, [self.unrelated.slug])
+
+
+class PostResponseCacheTestCase(CacheResetAPITestCase):
+    """Test cases for the anonymous post response cache"""
+
+    def setUp(self):
+        super().setUp()
+        response_cache.stats.reset()
+        self.stats = response_cache.stats
+
+        self.user = User.objects.create_user(
+            username="cacher", email="cacher@test.com", password="testpass123"
+        )
+        self.tech = Category.objects.create(name="Technology", slug="technology")
+        self.food = Category.objects.create(name="Food", slug="food")
+        self.post = Post.objects.create(
+            title="Cached Post",
+            content="Body",
+            author=self.user,
+            category=self.tech,
+            is_published=True,
+        )
+        Post.objects.create(
+            title="Recipe",
+            content="Body",
+            author=self.user,
+            category=self.food,
+            is_published=True,
+        )
+        self.list_url = reverse("post-list-create")
+        self.detail_url = reverse("post-detail", kwargs={"slug": self.post.slug})
+
+    def test_anonymous_list_is_cached(self):
+        """A repeated anonymous list request is served from the cache"""
+        first = self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.list_url)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(self.stats.snapshot(), {"hits": 1, "misses": 1})
+
+    def test_query_params_are_part_of_the_key(self):
+        """Different query strings are cached separately"""
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url, {"category__slug": "food"})
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_authenticated_requests_bypass_cache(self):
+        """Authenticated responses are never cached"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url)
+
+        self.assertNotIn("X-Cache", response)
+        self.assertEqual(self.stats.snapshot(), {"hits": 0, "misses": 0})
+
+    @override_settings(POST_CACHE_SHARED=False)
+    def test_unshared_cache_is_not_used(self):
+        """Without a cache shared by every worker nothing is cached"""
+        self.client.get(self.list_url)
+        response = self.client.get(self.list_url)
+
+        self.assertNotIn("X-Cache", response)
+        self.assertEqual(self.stats.snapshot(), {"hits": 0, "misses": 0})
+
+    def test_post_create_invalidates_list(self):
+        """Creating a post bumps the list generation"""
+        self.client.get(self.list_url)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post(
+            self.list_url, {"title": "Fresh", "content": "Body", "is_published": True}
+        )
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 3)
+
+    def test_like_invalidates_detail_and_list(self):
+        """A like write refreshes the cached counts"""
+        self.client.get(self.list_url)
+        self.client.get(self.detail_url)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse("post-like", kwargs={"slug": self.post.slug}))
+        self.client.force_authenticate(user=None)
+
+        detail = self.client.get(self.detail_url)
+        self.assertEqual(detail["X-Cache"], "MISS")
+        self.assertEqual(detail.data["likes_count"], 1)
+        self.assertEqual(self.client.get(self.list_url)["X-Cache"], "MISS")
+
+    def test_write_only_invalidates_affected_category(self):
+        """A write in one category leaves other category lists cached"""
+        self.client.get(self.list_url, {"category__slug": "technology"})
+        self.client.get(self.list_url, {"category__slug": "food"})
+
+        Comment.objects.create(post=self.post, user=self.user, content="Hi")
+
+        tech = self.client.get(self.list_url, {"category__slug": "technology"})
+        food = self.client.get(self.list_url, {"category__slug": "food"})
+        self.assertEqual(tech["X-Cache"], "MISS")
+        self.assertEqual(food["X-Cache"], "HIT")
+
+    def test_moving_category_invalidates_old_category(self):
+        """Moving a post out of a category refreshes that category's lists"""
+        self.client.get(self.list_url, {"category__slug": "technology"})
+
+        self.post.category = self.food
+        self.post.save()
+
+        response = self.client.get(self.list_url, {"category__slug": "technology"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 0)
+
+    def test_tag_change_invalidates_tag_list(self):
+        """Adding a tag refreshes lists filtered by that tag"""
+        tag = Tag.objects.create(name="Python", slug="python")
+        self.client.get(self.list_url, {"tags__slug": "python"})
+
+        self.post.tags.add(tag)
+
+        response = self.client.get(self.list_url, {"tags__slug": "python"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 1)
+
+    def test_category_rename_invalidates_lists_and_detail(self):
+        """Renaming a category refreshes cached bodies and their ETags"""
+        filtered = {"category__slug": "technology"}
+        self.client.get(self.list_url, filtered)
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        self.tech.name = "Tech"
+        self.tech.slug = "tech"
+        self.tech.save()
+
+        old = self.client.get(self.list_url, filtered)
+        self.assertEqual(old["X-Cache"], "MISS")
+        self.assertEqual(old.data["count"], 0)
+        detail = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+        self.assertEqual(detail.data["categories"][0]["name"], "Tech")
+        listed = self.client.get(self.list_url)
+        self.assertEqual(listed["X-Cache"], "MISS")
+        names = [post["categories"][0]["name"] for post in listed.data["results"]]
+        self.assertIn("Tech", names)
+
+
+class ConditionalGetTestCase(CacheResetAPITestCase):
+    """Test cases for ETag / Last-Modified conditional GETs"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="poller", email="poller@test.com", password="testpass123"
+        )
+        self.post = Post.objects.create(
+            title="Polled Post",
+            content="Body",
+            author=self.user,
+            is_published=True,
+        )
+
+    def _assert_revalidates(self, url):
+        """Return the ETag after checking both validator kinds yield 304"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        self.assertIn("Last-Modified", response)
+
+        etag = response["ETag"]
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], etag)
+
+        not_modified = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        return etag
+
+    def test_detail_conditional_get(self):
+        """Post detail answers matching validators with 304"""
+        url = reverse("post-detail", kwargs={"slug": self.post.slug})
+        etag = self._assert_revalidates(url)
+
+        # A single validator query, no serialization
+        with self.assertNumQueries(1):
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_detail_etag_changes_on_like(self):
+        """A like changes the detail ETag even though updated_at does not move"""
+        url = reverse("post-detail", kwargs={"slug": self.post.slug})
+        etag = self.client.get(url)["ETag"]
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse("post-like", kwargs={"slug": self.post.slug}))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["likes_count"], 1)
+
+    def test_list_conditional_get(self):
+        """Post list answers a matching ETag with 304 and no queries"""
+        url = reverse("post-list-create")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Post.objects.create(
+            title="Another", content="Body", author=self.user, is_published=True
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(POST_CACHE_SHARED=False)
+    def test_unshared_cache_sends_no_generation_etags(self):
+        """Lists and details carry no ETag unless every worker shares the cache"""
+        for url in [
+            reverse("post-list-create"),
+            reverse("post-detail", kwargs={"slug": self.post.slug}),
+        ]:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("ETag", response)
+
+    def test_comments_conditional_get(self):
+        """Comment list answers matching validators with 304"""
+        url = reverse("post-comments", kwargs={"slug": self.post.slug})
+        etag = self._assert_revalidates(url)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post(url, {"content": "New"})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_like_status_conditional_get(self):
+        """Like status validators are per user"""
+        url = reverse("post-like-status", kwargs={"slug": self.post.slug})
+        anonymous_etag = self._assert_revalidates(url)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=anonymous_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"liked": False, "likes_count": 0})
+
+
+class SparseFieldsetTestCase(CacheResetAPITestCase):
+    """Test cases for ?fields= / ?omit= on post endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="sparse", email="sparse@test.com", password="testpass123"
+        )
+        self.tag = Tag.objects.create(name="Python", slug="python")
+        self.post = Post.objects.create(
+            title="Sparse Post",
+            content="A very long body",
+            author=self.user,
+            is_published=True,
+        )
+        self.post.tags.add(self.tag)
+
+    def _get_with_queries(self, url, params):
+        response, queries = capture_sql(lambda: self.client.get(url, params))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, queries
+
+    def test_list_fields_narrows_output_and_select(self):
+        """?fields= trims the payload and never reads the content column"""
+        response, queries = self._get_with_queries(
+            reverse("post-list-create"), {"fields": "title,slug,author"}
+        )
+
+        self.assertEqual(set(response.data["results"][0]), {"title", "slug", "author"})
+        page_query = next(sql for sql in queries if '"posts_post"."title"' in sql)
+        self.assertNotIn('"posts_post"."content"', page_query)
+        self.assertFalse(any("posts_tag" in sql for sql in queries))
+
+    def test_list_omit_skips_tags_prefetch(self):
+        """?omit=tags,content drops the tags prefetch and the content column"""
+        response, queries = self._get_with_queries(
+            reverse("post-list-create"), {"omit": "tags,content"}
+        )
+
+        result = response.data["results"][0]
+        self.assertNotIn("tags", result)
+        self.assertNotIn("content", result)
+        self.assertEqual(result["title"], "Sparse Post")
+        self.assertFalse(any("posts_tag" in sql for sql in queries))
+
+    def test_my_posts_fields(self):
+        """My posts honours ?fields="""
+        self.client.force_authenticate(user=self.user)
+        response, _ = self._get_with_queries(
+            reverse("my-posts"), {"fields": "slug,tags"}
+        )
+
+        result = response.data["results"][0]
+        self.assertEqual(set(result), {"slug", "tags"})
+        self.assertEqual(result["tags"][0]["slug"], "python")
+
+    def test_detail_omit_comments(self):
+        """Omitting comments on detail skips both the field and its queries"""
+        Comment.objects.create(post=self.post, user=self.user, content="Hi")
+        Post.adjust_counters(self.post.pk, comments=1)
+        url = reverse("post-detail", kwargs={"slug": self.post.slug})
+        response, queries = self._get_with_queries(
+            url, {"omit": "comments,comments_next,content"}
+        )
+
+        self.assertNotIn("comments", response.data)
+        self.assertEqual(response.data["comments_count"], 1)
+        self.assertFalse(any("posts_comment" in sql for sql in queries))
+
+    def test_unknown_field_is_rejected(self):
+        """Unknown field names return 400"""
+        response = self.client.get(reverse("post-list-create"), {"fields": "nope"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class PostContentMetricsTestCase(TestCase):
+    """Test cases for the stored excerpt / word count / reading time"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="writer", email="writer@test.com", password="testpass123"
+        )
+
+    def test_metrics_computed_on_create(self):
+        """Saving a new post fills in the derived fields"""
+        post = Post.objects.create(
+            title="Long read",
+            content="<p>Hello <b>world</b></p> " + "word " * 450,
+            author=self.user,
+        )
+
+        self.assertEqual(post.word_count, 452)
+        self.assertEqual(post.reading_time_minutes, 3)
+        self.assertTrue(post.excerpt.startswith("Hello world word"))
+        self.assertLessEqual(len(post.excerpt), 280)
+        self.assertNotIn("<p>", post.excerpt)
+
+    def test_metrics_only_recomputed_when_content_changes(self):
+        """Saving without touching content leaves the derived fields alone"""
+        post = Post.objects.create(title="Short", content="one two", author=self.user)
+        Post.objects.filter(pk=post.pk).update(word_count=99)
+
+        post = Post.objects.get(pk=post.pk)
+        post.title = "Renamed"
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.word_count, 99)
+
+        post.content = "one two three"
+        post.save()
+        post.refresh_from_db()
+        self.assertEqual(post.word_count, 3)
+        self.assertEqual(post.excerpt, "one two three")
+
+    def test_backfill_post_excerpts_command(self):
+        """backfill_post_excerpts fills derived fields in batches"""
+        posts = [
+            Post.objects.create(title=f"Post {i}", content="a b c", author=self.user)
+            for i in range(3)
+        ]
+        Post.objects.update(excerpt="", word_count=0, reading_time_minutes=0)
+
+        out = StringIO()
+        call_command("backfill_post_excerpts", "--batch-size", "2", stdout=out)
+
+        for post in posts:
+            post.refresh_from_db()
+            self.assertEqual(post.excerpt, "a b c")
+            self.assertEqual(post.word_count, 3)
+            self.assertEqual(post.reading_time_minutes, 1)
+        self.assertIn("Backfilled 3 posts", out.getvalue())
+
+    def test_excerpt_exposed_in_list(self):
+        """List responses expose the excerpt so content can be omitted"""
+        Post.objects.create(
+            title="Listed", content="Body text", author=self.user, is_published=True
+        )
+        response = APIClient().get(
+            reverse("post-list-create"),
+            {"fields": "title,excerpt,reading_time_minutes"},
+        )
+
+        self.assertEqual(
+            response.data["results"][0],
+            {"title": "Listed", "excerpt": "Body text", "reading_time_minutes": 1},
+        )
+
+
+class QueryPlanTestCase(TestCase):
+    """Test the list endpoints are served by indexes"""
+
+    def test_no_sequential_scans(self):
+        """Every list-endpoint query has an index-backed plan"""
+        out = StringIO()
+        call_command("check_query_plans", "--posts", "60", stdout=out)
+
+        self.assertIn("No sequential scans found", out.getvalue())
+        self.assertFalse(Post.objects.exists())
+
+
+class PostTagFilterTestCase(CacheResetAPITestCase):
+    """Test multi-tag filtering on the post list"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="tagger", email="tagger@test.com", password="testpass123"
+        )
+        self.python = Tag.objects.create(name="Python", slug="python")
+        self.django = Tag.objects.create(name="Django", slug="django")
+        self.rust = Tag.objects.create(name="Rust", slug="rust")
+
+        self.both = self._post("Both", [self.python, self.django])
+        self.only_python = self._post("Only Python", [self.python])
+        self.only_rust = self._post("Only Rust", [self.rust])
+        self.list_url = reverse("post-list-create")
+
+    def _post(self, title, tags):
+        post = Post.objects.create(
+            title=title, content="Content", author=self.user, is_published=True
+        )
+        post.tags.set(tags)
+        return post
+
+    def _titles(self, params):
+        response = self.client.get(self.list_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(post["title"] for post in response.data["results"])
+
+    def test_any_mode_is_default(self):
+        """Posts with at least one tag match, each listed once"""
+        response = self.client.get(self.list_url, {"tags": "python,django"})
+
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            sorted(post["title"] for post in response.data["results"]),
+            ["Both", "Only Python"],
+        )
+
+    def test_all_mode(self):
+        """Only posts carrying every tag match"""
+        titles = self._titles({"tags": "python,django", "tags_mode": "all"})
+
+        self.assertEqual(titles, ["Both"])
+
+    def test_all_mode_with_unknown_tag(self):
+        """An unknown slug in all mode matches nothing"""
+        titles = self._titles({"tags": "python,missing", "tags_mode": "all"})
+
+        self.assertEqual(titles, [])
+
+    def test_single_tag_filter(self):
+        """The single-slug filter still works"""
+        titles = self._titles({"tags__slug": "rust"})
+
+        self.assertEqual(titles, ["Only Rust"])
+
+    def test_invalid_mode(self):
+        """Unknown modes are rejected"""
+        response = self.client.get(
+            self.list_url, {"tags": "python", "tags_mode": "some"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_no_join_or_distinct(self):
+        """Tag filters use subqueries, not a join plus DISTINCT"""
+        for mode in ("any", "all"):
+            _, queries = capture_sql(
+                lambda mode=mode: self.client.get(
+                    self.list_url, {"tags": "python", "tags_mode": mode}
+                )
+            )
+            page_sql = [
+                sql
+                for sql in queries
+                if "LIMIT" in sql and '"posts_post"."title"' in sql
+            ]
+            self.assertEqual(len(page_sql), 1)
+            self.assertNotIn("DISTINCT", page_sql[0])
+            self.assertNotIn('JOIN "posts_post_tags"', page_sql[0])
+
+    def test_tag_change_invalidates_multi_tag_list(self):
+        """Cached multi-tag lists are invalidated by their tags' changes"""
+        params = {"tags": "rust,django"}
+        self.client.get(self.list_url, params)
+
+        self.only_python.tags.add(self.django)
+        response = self.client.get(self.list_url, params)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 3)
+
+
+class FastPostRenderingTestCase(CacheResetAPITestCase):
+    """Test the values-based list rendering matches PostSerializer"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="renderer", email="renderer@test.com", password="testpass123"
+        )
+        category = Category.objects.create(name="Technology", slug="technology")
+        tags = [
+            Tag.objects.create(name="Python", slug="python"),
+            Tag.objects.create(name="Django", slug="django"),
+        ]
+        for i in range(4):
+            post = Post.objects.create(
+                title=f"Post {i}",
+                content=f"<p>Body {i}</p>",
+                author=self.user,
+                category=category if i % 2 else None,
+                is_published=i != 3,
+            )
+            post.tags.set(tags[: i % 3])
+        Post.adjust_counters(post.pk, likes=2, comments=1)
+
+    def _serialized(self, context=None):
+        queryset = (
+            Post.objects.select_related("author", "category")
+            .prefetch_related("tags")
+            .order_by("-created_at")
+        )
+        return PostSerializer(queryset, many=True, context=context or {}).data
+
+    def test_output_matches_serializer(self):
+        """Every field, value and key order matches the serializer"""
+        records = list(post_records(Post.objects.order_by("-created_at")))
+        rendered = render_posts(records)
+        expected = self._serialized()
+
+        self.assertEqual(rendered, expected)
+        self.assertEqual(
+            [list(post) for post in rendered], [list(post) for post in expected]
+        )
+
+    def test_sparse_output_matches_serializer(self):
+        """Sparse fieldsets render the same subset as the serializer"""
+        fields = {"title", "tags", "categories", "created_at"}
+        records = list(post_records(Post.objects.order_by("-created_at"), fields))
+
+        self.assertEqual(
+            render_posts(records, fields),
+            self._serialized({"sparse_fields": fields}),
+        )
+
+    def test_list_endpoints_use_fast_path(self):
+        """List and my-posts responses match the serializer output"""
+        expected = self._serialized()
+
+        response = self.client.get(reverse("post-list-create"))
+        self.assertEqual(
+            response.data["results"],
+            [post for post in expected if post["is_published"]][:5],
+        )
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse("my-posts"), {"pagination": "cursor"})
+        self.assertEqual(response.data["results"], expected[:5])
+
+    def test_benchmark_command(self):
+        """The rendering benchmark runs and reports both paths"""
+        out = StringIO()
+        call_command("benchmark_post_rendering", "--posts", "20", stdout=out)
+
+        self.assertIn("serializer", out.getvalue())
+        self.assertIn("fast path", out.getvalue())
+        self.assertFalse(Post.objects.filter(title__startswith="Bench").exists())
+
+
+class RendererTestCase(CacheResetAPITestCase):
+    """Test the orjson and MessagePack renderers and parsers"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="encoder", email="encoder@test.com", password="testpass123"
+        )
+        self.post = Post.objects.create(
+            title="Encoded", content="Body", author=self.user, is_published=True
+        )
+
+    def test_orjson_matches_stdlib_json(self):
+        """orjson output equals DRF's JSONRenderer for awkward types"""
+        data = {
+            "when": timezone.now(),
+            "day": datetime.date(2026, 1, 2),
+            "id": uuid.uuid4(),
+            "price": decimal.Decimal("1.50"),
+            "text": "naïve   line",
+            "nested": [{"n": 1}, None, True],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_list_as_msgpack(self):
+        """Accept: application/msgpack returns a MessagePack body"""
+        response = self.client.get(
+            reverse("post-list-create"), HTTP_ACCEPT="application/msgpack"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        body = msgpack.unpackb(response.content)
+        self.assertEqual(body["results"][0]["title"], "Encoded")
+
+    def test_etag_differs_per_media_type(self):
+        """JSON and MessagePack representations carry different ETags"""
+        url = reverse("post-detail", kwargs={"slug": self.post.slug})
+        as_json = self.client.get(url)
+        as_msgpack = self.client.get(url, HTTP_ACCEPT="application/msgpack")
+
+        self.assertNotEqual(as_json["ETag"], as_msgpack["ETag"])
+
+    def test_create_from_msgpack(self):
+        """MessagePack request bodies are parsed"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse("post-list-create"),
+            msgpack.packb({"title": "Packed", "content": "Body"}),
+            content_type="application/msgpack",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["title"], "Packed")
+
+    def test_invalid_json_body(self):
+        """Malformed JSON is a 400, not a 500"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse("post-list-create"), "{bad", content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_benchmark_command(self):
+        """The renderer benchmark reports every renderer for both payloads"""
+        out = StringIO()
+        call_command(
+            "benchmark_renderers", "--posts", "5", "--comments", "5", stdout=out
+        )
+
+        for label in ("post list", "post detail", "json", "orjson", "msgpack"):
+            self.assertIn(label, out.getvalue())
+
+    def test_benchmark_detail_size_follows_comments(self):
+        """Every seeded comment is part of the detail payload"""
+
+        def detail_bytes(comments):
+            out = StringIO()
+            call_command(
+                "benchmark_renderers",
+                "--posts",
+                "1",
+                "--comments",
+                str(comments),
+                "--repeat",
+                "1",
+                stdout=out,
+            )
+            detail = out.getvalue().split("post detail:")[1]
+            return int(detail.split(", ")[1].split(" bytes")[0])
+
+        # Each extra comment renders to well over 50 bytes of JSON.
+        extra = EMBEDDED_COMMENTS * 2
+        base = detail_bytes(EMBEDDED_COMMENTS)
+        self.assertGreater(detail_bytes(EMBEDDED_COMMENTS + extra) - base, extra * 50)
+
+
+class PostExportTestCase(APITestCase):
+    """Test the streaming NDJSON export"""
+
+    def setUp(self):
+        self.staff = User.objects.create_user(
+            username="staff", email="staff@test.com", password="testpass123"
+        )
+        self.staff.is_staff = True
+        self.staff.save()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@test.com", password="testpass123"
+        )
+        tag = Tag.objects.create(name="Python", slug="python")
+        self.published = Post.objects.create(
+            title="Public", content="Body", author=self.user, is_published=True
+        )
+        self.published.tags.add(tag)
+        Post.objects.create(
+            title="Untagged", content="Body", author=self.user, is_published=True
+        )
+        draft = Post.objects.create(title="Draft", content="Body", author=self.user)
+        Comment.objects.create(post=self.published, user=self.user, content="Hi")
+        Comment.objects.create(post=draft, user=self.user, content="Hidden")
+        Like.objects.create(post=self.published, user=self.user)
+        self.url = reverse("post-export")
+
+    def _records(self, lines):
+        return [json.loads(line) for line in lines if line]
+
+    def test_requires_staff(self):
+        """Anonymous and non-staff users cannot export"""
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN
+        )
+
+    def test_streams_published_posts(self):
+        """Only published posts are streamed, with their tags"""
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(self.url, HTTP_ACCEPT="application/x-ndjson")
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = self._records(b"".join(response.streaming_content).splitlines())
+        self.assertEqual(
+            [(r["type"], r["title"], r["tags"]) for r in records],
+            [("post", "Public", ["python"]), ("post", "Untagged", [])],
+        )
+
+    def test_include_comments_and_likes(self):
+        """Comments and likes of published posts follow the posts"""
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(self.url, {"include": "comments,likes"})
+
+        records = self._records(b"".join(response.streaming_content).splitlines())
+        self.assertEqual(
+            [r["type"] for r in records], ["post", "post", "comment", "like"]
+        )
+        self.assertEqual(records[2]["content"], "Hi")
+        self.assertEqual(records[3]["post_id"], self.published.pk)
+
+    def test_export_command(self):
+        """The command writes the same NDJSON to stdout"""
+        out = StringIO()
+        call_command(
+            "export_posts", "--include", "likes", "--chunk-size", "1", stdout=out
+        )
+
+        records = self._records(out.getvalue().splitlines())
+        self.assertEqual([r["type"] for r in records], ["post", "post", "like"])
+
+
+class PostBulkImportTestCase(CacheResetAPITestCase):
+    """Test bulk post creation through the endpoint and the command"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="importer", email="importer@test.com", password="testpass123"
+        )
+        self.category = Category.objects.create(name="Technology", slug="technology")
+        self.python = Tag.objects.create(name="Python", slug="python")
+        self.django = Tag.objects.create(name="Django", slug="django")
+        Post.objects.create(title="Taken Title", content="Body", author=self.user)
+        self.url = reverse("post-bulk-create")
+
+    def test_requires_authentication(self):
+        """Anonymous users cannot bulk create"""
+        response = self.client.post(self.url, [], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_create(self):
+        """Posts, tags, slugs and content metrics are created for the batch"""
+        self.client.force_authenticate(user=self.user)
+        items = [
+            {
+                "title": "Taken Title",
+                "content": "<p>One two three</p>",
+                "category": self.category.pk,
+                "tags_input": [self.python.pk, self.django.pk],
+                "is_published": True,
+            },
+            {"title": "Fresh", "content": "Body"},
+            {"title": "Fresh", "content": "Body"},
+        ]
+
+        response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+        slugs = response.data["slugs"]
+        self.assertEqual(len(set(slugs) | {"taken-title"}), 4)
+        self.assertTrue(slugs[0].startswith("taken-title-"))
+        self.assertIn("fresh", slugs)
+
+        first = Post.objects.get(slug=slugs[0])
+        self.assertEqual(first.category, self.category)
+        self.assertEqual(first.word_count, 3)
+        self.assertEqual(first.excerpt, "One two three")
+        self.assertEqual(first.author, self.user)
+        self.assertEqual(
+            sorted(first.tags.values_list("slug", flat=True)), ["django", "python"]
+        )
+
+    def test_fixed_query_count(self):
+        """The statement count does not grow with the batch size"""
+        self.client.force_authenticate(user=self.user)
+        # Load the category/tag snapshot up front; it is not per batch.
+        taxonomy_cache.current()
+        counts = []
+        for size in (2, 20):
+            items = [
+                {
+                    "title": f"Batch {size} post {i}",
+                    "content": "Body",
+                    "category": self.category.pk,
+                    "tags_input": [self.python.pk],
+                }
+                for i in range(size)
+            ]
+            response, queries = capture_sql(
+                lambda items=items: self.client.post(self.url, items, format="json")
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_unknown_ids_cost_one_query(self):
+        """Validating many unknown ids looks them up together"""
+        taxonomy_cache.current()
+        items = [
+            {
+                "title": f"Bad {i}",
+                "content": "Body",
+                "category": 900 + i,
+                "tags_input": [800 + i, self.python.pk],
+            }
+            for i in range(20)
+        ]
+
+        (rows, errors), queries = capture_sql(lambda: validate_batch(items))
+
+        self.assertEqual(rows, [])
+        self.assertEqual(len(errors), 20)
+        self.assertEqual(
+            errors[3]["tags_input"], ['Invalid pk "803" - object does not exist.']
+        )
+        # One id__in lookup for the missing categories, one for the tags.
+        self.assertEqual(len(queries), 2)
+
+    def test_invalid_items_reject_batch(self):
+        """Any invalid item rejects the whole request with indexed errors"""
+        self.client.force_authenticate(user=self.user)
+        items = [
+            {"title": "Good", "content": "Body"},
+            {"title": "Bad tag", "content": "Body", "tags_input": [999]},
+            {"content": "No title"},
+        ]
+
+        response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data["errors"]), {1, 2})
+        self.assertIn("tags_input", response.data["errors"][1])
+        self.assertIn("title", response.data["errors"][2])
+        self.assertFalse(Post.objects.filter(title="Good").exists())
+
+    def test_bulk_create_invalidates_cached_list(self):
+        """Bulk-created published posts show up in cached lists"""
+        list_url = reverse("post-list-create")
+        self.client.get(list_url)
+
+        self.client.force_authenticate(user=self.user)
+        self.client.post(
+            self.url,
+            [{"title": "Bulk", "content": "Body", "is_published": True}],
+            format="json",
+        )
+        self.client.force_authenticate(user=None)
+        response = self.client.get(list_url)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 1)
+
+    def test_import_command(self):
+        """The command imports valid lines and reports the rest"""
+        lines = [
+            json.dumps({"title": "Imported", "content": "Body"}),
+            "{not json",
+            json.dumps({"title": "No content"}),
+            json.dumps({"title": "Imported", "content": "Again"}),
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as source:
+            source.write("\n".join(lines))
+            source.flush()
+            out, err = StringIO(), StringIO()
+            call_command(
+                "import_posts",
+                source.name,
+                "--author",
+                "importer",
+                "--batch-size",
+                "2",
+                stdout=out,
+                stderr=err,
+            )
+
+        self.assertIn("Imported 2 posts, skipped 2", out.getvalue())
+        self.assertIn("line 2", err.getvalue())
+        self.assertIn("line 3", err.getvalue())
+        self.assertEqual(Post.objects.filter(title="Imported").count(), 2)
+
+
+class PostSlugAllocationTestCase(TestCase):
+    """Test unique slug allocation for single and bulk creation"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="slugger", email="slugger@test.com", password="testpass123"
+        )
+
+    def test_shared_title_costs_one_probe(self):
+        """Slug probing stays at one query however many posts share a title"""
+        for _ in range(5):
+            Post.objects.create(title="Weekly update", content="Body", author=self.user)
+
+        post, queries = capture_sql(
+            lambda: Post.objects.create(
+                title="Weekly update", content="Body", author=self.user
+            )
+        )
+
+        probes = [sql for sql in queries if '"posts_post"."slug" IN' in sql]
+        self.assertEqual(len(probes), 1)
+        self.assertTrue(post.slug.startswith("weekly-update-"))
+        self.assertEqual(
+            Post.objects.filter(slug__startswith="weekly-update").count(), 6
+        )
+
+    def test_long_title_suffix_fits_column(self):
+        """Suffixed slugs never exceed the slug column length"""
+        title = "x" * 80
+        Post.objects.create(title=title, content="Body", author=self.user)
+        post = Post.objects.create(title=title, content="Body", author=self.user)
+
+        self.assertLessEqual(len(post.slug), 50)
+        self.assertNotEqual(post.slug, "x" * 50)
+
+    def test_route_names_are_not_used_as_slugs(self):
+        """Titles matching a fixed route get a suffixed, reachable slug"""
+        for title in ["My posts", "Export", "Bulk", "Like status", "Trending"]:
+            post = Post.objects.create(
+                title=title, content="Body", author=self.user, is_published=True
+            )
+            self.assertNotEqual(post.slug, slugify(title))
+            response = self.client.get(
+                reverse("post-detail", kwargs={"slug": post.slug})
+            )
+            self.assertEqual(response.json()["title"], title)
+
+    def test_batch_slugs_are_unique(self):
+        """A batch of identical titles gets distinct slugs in one query"""
+        Post.objects.create(title="Daily", content="Body", author=self.user)
+        slugs, queries = capture_sql(
+            lambda: Post.generate_unique_slugs(["Daily"] * 10 + ["Other"])
+        )
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(set(slugs)), 11)
+        self.assertNotIn("daily", slugs)
+        self.assertEqual(slugs[-1], "other")
+
+    def test_insert_retries_when_slug_is_taken_concurrently(self):
+        """A slug taken between allocation and insert is re-allocated"""
+        Post.objects.create(title="Raced", content="Body", author=self.user)
+        with mock.patch.object(
+            Post, "generate_unique_slugs", side_effect=[["raced"], ["raced-2"]]
+        ):
+            post = Post.objects.create(title="Raced", content="Body", author=self.user)
+
+        self.assertEqual(post.slug, "raced-2")
+        self.assertEqual(Post.objects.filter(slug__startswith="raced").count(), 2)
+
+    def test_bulk_import_retries_when_slug_is_taken_concurrently(self):
+        """Bulk inserts re-allocate slugs after a concurrent insert"""
+        Post.objects.create(title="Raced", content="Body", author=self.user)
+        rows, _ = validate_batch([{"title": "Raced", "content": "Body"}])
+        with mock.patch.object(
+            Post, "generate_unique_slugs", side_effect=[["raced"], ["raced-2"]]
+        ):
+            posts = import_batch(rows, self.user)
+
+        self.assertEqual([post.slug for post in posts], ["raced-2"])
+        self.assertTrue(Post.objects.filter(slug="raced-2").exists())
+
+
+class EmbeddedCommentsTestCase(CacheResetAPITestCase):
+    """Test the bounded comments embedded in post detail"""
+
+    def setUp(self):
+        super().setUp()
+        self.users = [
+            User.objects.create_user(
+                username=f"commenter{i}",
+                email=f"commenter{i}@test.com",
+                password="testpass123",
+            )
+            for i in range(3)
+        ]
+        self.post = Post.objects.create(
+            title="Viral", content="Body", author=self.users[0], is_published=True
+        )
+        self.url = reverse("post-detail", kwargs={"slug": self.post.slug})
+
+    def _comment(self, count):
+        for i in range(count):
+            Comment.objects.create(
+                post=self.post, user=self.users[i % 3], content=f"Comment {i}"
+            )
+
+    def test_embeds_newest_comments_only(self):
+        """Detail embeds the newest comments and links to the rest"""
+        self._comment(EMBEDDED_COMMENTS + 5)
+        response = self.client.get(self.url)
+
+        contents = [comment["content"] for comment in response.data["comments"]]
+        self.assertEqual(
+            contents,
+            [f"Comment {i}" for i in reversed(range(5, EMBEDDED_COMMENTS + 5))],
+        )
+        self.assertIsNotNone(response.data["comments_next"])
+
+    def test_no_link_when_all_comments_embedded(self):
+        """comments_next is null when nothing older exists"""
+        self._comment(2)
+        response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data["comments"]), 2)
+        self.assertIsNone(response.data["comments_next"])
+
+    def test_next_link_continues_after_embedded(self):
+        """Following comments_next returns the older comments"""
+        self._comment(EMBEDDED_COMMENTS + 3)
+        next_url = self.client.get(self.url).data["comments_next"]
+        response = self.client.get(next_url)
+
+        self.assertEqual(
+            [comment["content"] for comment in response.data["results"]],
+            ["Comment 2", "Comment 1", "Comment 0"],
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_comment_queries_do_not_grow(self):
+        """Embedded comments and their users load in one query"""
+        self._comment(30)
+        response, queries = capture_sql(lambda: self.client.get(self.url))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        comment_queries = [sql for sql in queries if "posts_comment" in sql]
+        self.assertEqual(len(comment_queries), 1)
+        self.assertFalse(
+            any(sql.startswith('SELECT "accounts_user"') for sql in queries)
+        )
+
+
+class CommentPaginationTestCase(APITestCase):
+    """Test keyset pagination and since/before windows on comments"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="poller", email="poller@test.com", password="testpass123"
+        )
+        self.post = Post.objects.create(
+            title="Live", content="Body", author=self.user, is_published=True
+        )
+        start = timezone.now() - datetime.timedelta(hours=1)
+        self.comments = []
+        for i in range(7):
+            comment = Comment.objects.create(
+                post=self.post, user=self.user, content=f"Comment {i}"
+            )
+            # Two comments share a timestamp to exercise the id tie-break.
+            created_at = start + datetime.timedelta(minutes=min(i, 5))
+            Comment.objects.filter(pk=comment.pk).update(created_at=created_at)
+            comment.created_at = created_at
+            self.comments.append(comment)
+        self.url = reverse("post-comments", kwargs={"slug": self.post.slug})
+
+    def _contents(self, response):
+        return [comment["content"] for comment in response.data["results"]]
+
+    def test_pages_cover_every_comment_once(self):
+        """Following next links walks all comments newest first"""
+        seen = []
+        response = self.client.get(self.url, {"page_size": 3})
+        while True:
+            seen.extend(self._contents(response))
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+
+        self.assertEqual(seen, [f"Comment {i}" for i in reversed(range(7))])
+
+    def test_since_returns_only_newer(self):
+        """since= returns comments created after the given time"""
+        since = self.comments[3].created_at.isoformat()
+        response = self.client.get(self.url, {"since": since})
+
+        self.assertEqual(
+            self._contents(response), ["Comment 6", "Comment 5", "Comment 4"]
+        )
+
+    def test_before_returns_only_older(self):
+        """before= returns comments created before the given time"""
+        before = self.comments[2].created_at.isoformat()
+        response = self.client.get(self.url, {"before": before})
+
+        self.assertEqual(self._contents(response), ["Comment 1", "Comment 0"])
+
+    def test_invalid_window(self):
+        """Unparseable timestamps are rejected"""
+        response = self.client.get(self.url, {"since": "yesterday"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("since", response.data)
+
+        # Even when the client's validators match whatever the ETag is.
+        response = self.client.get(
+            self.url, {"since": "yesterday"}, HTTP_IF_NONE_MATCH="*"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_users_joined(self):
+        """A page costs one comment query with the user joined"""
+        _, queries = capture_sql(lambda: self.client.get(self.url))
+
+        comment_queries = [sql for sql in queries if "posts_comment" in sql]
+        self.assertEqual(len(comment_queries), 1)
+        self.assertIn("accounts_user", comment_queries[0])
+
+
+class CommentThreadTestCase(APITestCase):
+    """Test threaded replies stored with materialized paths"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="threader", email="threader@test.com", password="testpass123"
+        )
+        self.post = Post.objects.create(
+            title="Threads", content="Body", author=self.user, is_published=True
+        )
+        self.client.force_authenticate(user=self.user)
+        self.root = self._reply(None, "root")
+        self.first = self._reply(self.root, "first")
+        self.second = self._reply(self.root, "second")
+        self.nested = self._reply(self.first, "nested")
+        self.other_root = self._reply(None, "other root")
+
+    def _reply(self, parent, content):
+        url = reverse("post-comments", kwargs={"slug": self.post.slug})
+        data = {"content": content}
+        if parent is not None:
+            data["parent"] = parent.pk
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Comment.objects.get(pk=response.data["id"])
+
+    def _replies(self, comment, **params):
+        url = reverse("comment-replies", kwargs={"id": comment.pk})
+        return self.client.get(url, params)
+
+    def test_paths_and_depths(self):
+        """Replies extend their parent's path by their own padded id"""
+        self.assertEqual(self.root.depth, 0)
+        self.assertEqual(self.nested.depth, 2)
+        self.assertEqual(self.root.path, f"{self.root.pk:010d}")
+        self.assertEqual(self.nested.path, f"{self.first.path}{self.nested.pk:010d}")
+
+    def test_replies_in_thread_order(self):
+        """A subtree is read in display order with one comment query"""
+        response, queries = capture_sql(lambda: self._replies(self.root))
+
+        contents = [reply["content"] for reply in response.data["results"]]
+        self.assertEqual(contents, ["first", "nested", "second"])
+        comment_queries = [
+            sql
+            for sql in queries
+            if sql.startswith("SELECT") and '"posts_comment"."path" >' in sql
+        ]
+        self.assertEqual(len(comment_queries), 1)
+
+    def test_replies_depth_limit(self):
+        """depth=1 returns direct replies, flagged when they have their own"""
+        response = self._replies(self.root, depth=1)
+
+        results = response.data["results"]
+        self.assertEqual([reply["content"] for reply in results], ["first", "second"])
+        self.assertEqual([reply["has_replies"] for reply in results], [True, False])
+
+    def test_replies_pagination(self):
+        """Path cursors page through a thread without gaps"""
+        response = self._replies(self.root, page_size=2)
+        self.assertEqual(len(response.data["results"]), 2)
+
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [reply["content"] for reply in response.data["results"]], ["second"]
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_top_level_list(self):
+        """The comments list only pages top-level comments"""
+        url = reverse("post-comments", kwargs={"slug": self.post.slug})
+        response = self.client.get(url)
+
+        results = response.data["results"]
+        self.assertEqual(
+            [comment["content"] for comment in results], ["other root", "root"]
+        )
+        self.assertEqual([comment["has_replies"] for comment in results], [False, True])
+
+    def test_reply_to_other_post_rejected(self):
+        """A parent comment must belong to the same post"""
+        other = Post.objects.create(
+            title="Elsewhere", content="Body", author=self.user, is_published=True
+        )
+        url = reverse("post-comments", kwargs={"slug": other.slug})
+        response = self.client.post(url, {"content": "x", "parent": self.root.pk})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("parent", response.data)
+
+    def test_delete_subtree(self):
+        """Deleting a comment removes its replies in one statement"""
+        url = reverse("comment-delete", kwargs={"id": self.root.pk})
+        response, queries = capture_sql(lambda: self.client.delete(url))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            list(Comment.objects.values_list("content", flat=True)), ["other root"]
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comments_count, 1)
+        deletes = [
+            sql for sql in queries if sql.startswith('DELETE FROM "posts_comment"')
+        ]
+        self.assertEqual(len(deletes), 1)
+
+
+class LikeStatusBatchTestCase(CacheResetAPITestCase):
+    """Test the batch like-status endpoint and liked_by_me"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="batcher", email="batcher@test.com", password="testpass123"
+        )
+        self.other = User.objects.create_user(
+            username="other", email="other@test.com", password="testpass123"
+        )
+        self.posts = [
+            Post.objects.create(
+                title=f"Batch {i}", content="Body", author=self.user, is_published=True
+            )
+            for i in range(3)
+        ]
+        Like.objects.create(post=self.posts[0], user=self.user)
+        Like.objects.create(post=self.posts[0], user=self.other)
+        Like.objects.create(post=self.posts[1], user=self.other)
+        Post.adjust_counters(self.posts[0].pk, likes=2)
+        Post.adjust_counters(self.posts[1].pk, likes=1)
+        self.url = reverse("post-like-status-batch")
+
+    def test_batch_status_one_query(self):
+        """Statuses for many posts come from a single query"""
+        self.client.force_authenticate(user=self.user)
+        slugs = ",".join(post.slug for post in self.posts)
+        response, queries = capture_sql(
+            lambda: self.client.get(self.url, {"slugs": f"{slugs},missing"})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                self.posts[0].slug: {"liked": True, "likes_count": 2},
+                self.posts[1].slug: {"liked": False, "likes_count": 1},
+                self.posts[2].slug: {"liked": False, "likes_count": 0},
+            },
+        )
+        post_queries = [sql for sql in queries if "posts_post" in sql]
+        self.assertEqual(len(post_queries), 1)
+
+    def test_batch_status_post_body(self):
+        """Long lists can be sent in a POST body, also anonymously"""
+        response = self.client.post(
+            self.url, {"slugs": [self.posts[0].slug]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {self.posts[0].slug: {"liked": False, "likes_count": 2}}
+        )
+
+    def test_batch_status_limits(self):
+        """Empty and oversized slug lists are rejected"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        slugs = [f"post-{i}" for i in range(LIKE_STATUS_MAX_SLUGS + 1)]
+        response = self.client.post(self.url, {"slugs": slugs}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_liked_by_me_in_list_and_detail(self):
+        """List, my-posts and detail report the current user's likes"""
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse("post-list-create"))
+        liked = {post["slug"]: post["liked_by_me"] for post in response.data["results"]}
+        self.assertEqual(
+            liked,
+            {
+                self.posts[0].slug: True,
+                self.posts[1].slug: False,
+                self.posts[2].slug: False,
+            },
+        )
+
+        response = self.client.get(reverse("my-posts"), {"fields": "slug,liked_by_me"})
+        liked = {post["slug"]: post["liked_by_me"] for post in response.data["results"]}
+        self.assertTrue(liked[self.posts[0].slug])
+
+        url = reverse("post-detail", kwargs={"slug": self.posts[0].slug})
+        self.assertTrue(self.client.get(url).data["liked_by_me"])
+
+    def test_liked_by_me_anonymous_without_query(self):
+        """Anonymous users get false without touching the likes table"""
+        response, queries = capture_sql(
+            lambda: self.client.get(reverse("post-list-create"))
+        )
+
+        self.assertTrue(
+            all(post["liked_by_me"] is False for post in response.data["results"])
+        )
+        self.assertFalse(any("posts_like" in sql for sql in queries))
+
+    def test_etag_varies_by_user(self):
+        """Users with different likes never share list or detail ETags"""
+        urls = [
+            reverse("post-list-create"),
+            reverse("post-detail", kwargs={"slug": self.posts[0].slug}),
+        ]
+        for url in urls:
+            self.client.force_authenticate(user=self.user)
+            mine = self.client.get(url)["ETag"]
+            self.client.force_authenticate(user=self.other)
+            theirs = self.client.get(url, HTTP_IF_NONE_MATCH=mine)
+
+            self.assertEqual(theirs.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(theirs["ETag"], mine)
+
+
+class LikeBufferTestCase(CacheResetAPITestCase):
+    """Test write-behind likes and the buffer flush"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="buffered", email="buffered@test.com", password="testpass123"
+        )
+        self.other = User.objects.create_user(
+            username="buffered2", email="buffered2@test.com", password="testpass123"
+        )
+        self.post = Post.objects.create(
+            title="Hot", content="Body", author=self.user, is_published=True
+        )
+        self.like_url = reverse("post-like", kwargs={"slug": self.post.slug})
+        self.unlike_url = reverse("post-unlike", kwargs={"slug": self.post.slug})
+        self.client.force_authenticate(user=self.user)
+        write_behind = override_settings(POST_LIKE_WRITE_BEHIND=True)
+        write_behind.enable()
+        self.addCleanup(write_behind.disable)
+
+    def test_like_is_buffered(self):
+        """Likes answer optimistically and only reach Like on flush"""
+        response = self.client.post(self.like_url)
+        self.assertTrue(response.data["was_created"])
+        self.assertEqual(response.data["likes_count"], 1)
+        self.assertFalse(Like.objects.exists())
+
+        response = self.client.post(self.like_url)
+        self.assertFalse(response.data["was_created"])
+        self.assertEqual(response.data["likes_count"], 1)
+
+        self.assertEqual(like_buffer.flush(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertTrue(Like.objects.filter(post=self.post, user=self.user).exists())
+        self.assertFalse(PendingLike.objects.exists())
+
+    def test_own_reads_see_pending_likes(self):
+        """liked_by_me, like status and ETags follow unflushed toggles"""
+        detail_url = reverse("post-detail", kwargs={"slug": self.post.slug})
+        list_url = reverse("post-list-create")
+        status_url = reverse("post-like-status", kwargs={"slug": self.post.slug})
+        detail_etag = self.client.get(detail_url)["ETag"]
+        list_etag = self.client.get(list_url)["ETag"]
+
+        self.client.post(self.like_url)
+
+        detail = self.client.get(detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+        self.assertTrue(detail.data["liked_by_me"])
+        self.assertEqual(detail.data["likes_count"], 1)
+        listed = self.client.get(list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(listed.status_code, status.HTTP_200_OK)
+        self.assertTrue(listed.data["results"][0]["liked_by_me"])
+        self.assertEqual(listed.data["results"][0]["likes_count"], 1)
+        self.assertEqual(
+            self.client.get(status_url).data, {"liked": True, "likes_count": 1}
+        )
+        batch = self.client.get(
+            reverse("post-like-status-batch"), {"slugs": self.post.slug}
+        )
+        self.assertEqual(batch.data[self.post.slug], {"liked": True, "likes_count": 1})
+
+        # Other users are unaffected, and a pending unlike wins over a Like.
+        Like.objects.create(post=self.post, user=self.other)
+        Post.adjust_counters(self.post.pk, likes=1)
+        self.client.force_authenticate(user=self.other)
+        self.assertEqual(
+            self.client.get(status_url).data, {"liked": True, "likes_count": 1}
+        )
+        self.client.post(self.unlike_url)
+        self.assertEqual(
+            self.client.get(status_url).data, {"liked": False, "likes_count": 0}
+        )
+
+    def test_memory_buffer_overlay(self):
+        """The in-process buffer overlays pending intents the same way"""
+        buffer = like_buffer.MemoryLikeBuffer()
+        other = Post.objects.create(
+            title="Cold", content="Body", author=self.user, is_published=True
+        )
+        Like.objects.create(post=other, user=self.user)
+        Post.objects.filter(pk=other.pk).update(likes_count=2)
+        like_buffer.toggle(self.post.slug, self.user, True, buffer)
+        like_buffer.toggle(other.slug, self.user, False, buffer)
+
+        with mock.patch.object(like_buffer, "get_buffer", return_value=buffer):
+            states = likes.like_statuses([self.post.slug, other.slug], self.user)
+            self.assertEqual(states[self.post.slug], {"liked": True, "likes_count": 1})
+            self.assertEqual(states[other.slug], {"liked": False, "likes_count": 1})
+            states = likes.like_statuses([self.post.slug], self.other)
+            self.assertEqual(states[self.post.slug], {"liked": False, "likes_count": 0})
+
+    def test_flush_coalesces_toggles(self):
+        """Only the last intent per user and post is applied"""
+        Like.objects.create(post=self.post, user=self.other)
+        self.client.post(self.like_url)
+        self.client.post(self.unlike_url)
+        self.client.post(self.like_url)
+        self.client.force_authenticate(user=self.other)
+        response = self.client.post(self.unlike_url)
+        self.assertTrue(response.data["was_removed"])
+
+        self.assertEqual(like_buffer.flush(), 4)
+        self.assertEqual(
+            list(Like.objects.values_list("user", flat=True)), [self.user.pk]
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_interrupted_flush_is_replayed(self):
+        """Intents survive a failed flush and apply exactly once later"""
+        self.client.post(self.like_url)
+        # Already applied once, e.g. by a flush that died before acknowledging.
+        Like.objects.create(post=self.post, user=self.user)
+
+        with mock.patch(
+            "apps.posts.like_buffer._recount_likes", side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                like_buffer.flush()
+
+        self.assertEqual(like_buffer.flush(), 1)
+        self.assertEqual(Like.objects.count(), 1)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_memory_buffer(self):
+        """The in-process buffer supports the same toggle/flush cycle"""
+        buffer = like_buffer.MemoryLikeBuffer()
+        self.assertEqual(
+            like_buffer.toggle(self.post.slug, self.user, True, buffer)[1:], (True, 1)
+        )
+        self.assertEqual(
+            like_buffer.toggle(self.post.slug, self.other, True, buffer)[1:], (True, 1)
+        )
+        self.assertEqual(
+            like_buffer.toggle(self.post.slug, self.user, False, buffer)[1:], (True, 0)
+        )
+
+        self.assertEqual(like_buffer.flush(buffer=buffer), 3)
+        self.assertEqual(like_buffer.flush(buffer=buffer), 0)
+        self.assertEqual(
+            list(Like.objects.values_list("user", flat=True)), [self.other.pk]
+        )
+
+    def test_flush_command(self):
+        """flush_like_buffer drains the buffer in batches"""
+        self.client.post(self.like_url)
+        self.client.force_authenticate(user=self.other)
+        self.client.post(self.like_url)
+
+        out = StringIO()
+        call_command("flush_like_buffer", "--batch-size", "1", stdout=out)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 2)
+        self.assertIn("Applied 2 like intents in 2 batches", out.getvalue())
+
+
+class TrendingTestCase(APITestCase):
+    """Test trending scores and the trending feed"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="trender", email="trender@test.com", password="testpass123"
+        )
+        self.category = Category.objects.create(name="Tech", slug="tech")
+        self.tag = Tag.objects.create(name="Python", slug="python")
+        self.cold = Post.objects.create(
+            title="Cold", content="Body", author=self.user, is_published=True
+        )
+        self.warm = Post.objects.create(
+            title="Warm",
+            content="Body",
+            author=self.user,
+            is_published=True,
+            category=self.category,
+        )
+        self.warm.tags.add(self.tag)
+        self.hot = Post.objects.create(
+            title="Hot", content="Body", author=self.user, is_published=True
+        )
+        self.url = reverse("post-trending")
+
+    def score(self, post):
+        return (
+            PostTrending.objects.filter(post=post)
+            .values_list("score", flat=True)
+            .first()
+        )
+
+    def test_activity_updates_scores(self):
+        """Likes and comments raise the score; removing them lowers it"""
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse("post-like", kwargs={"slug": self.hot.slug}))
+        self.assertEqual(self.score(self.hot), trending.LIKE_WEIGHT)
+
+        comment = Comment.objects.create(post=self.hot, user=self.user, content="Hi")
+        self.assertEqual(
+            self.score(self.hot), trending.LIKE_WEIGHT + trending.COMMENT_WEIGHT
+        )
+
+        self.client.delete(reverse("comment-delete", kwargs={"id": comment.id}))
+        self.client.post(reverse("post-unlike", kwargs={"slug": self.hot.slug}))
+        # Scores that reach zero lose their row.
+        self.assertIsNone(self.score(self.hot))
+        self.assertIsNone(self.score(self.cold))
+
+    def test_losses_below_min_score_leave_feed(self):
+        """A decayed score cleared by a removal drops out of the feed"""
+        trending.add_activity({self.hot.pk: trending.LIKE_WEIGHT, self.warm.pk: 3})
+        trending.decay(trending.HALF_LIFE_HOURS)
+        trending.add_activity({self.hot.pk: -trending.LIKE_WEIGHT})
+
+        self.assertIsNone(self.score(self.hot))
+        response = self.client.get(self.url)
+        self.assertEqual(
+            [post["slug"] for post in response.data["results"]], [self.warm.slug]
+        )
+
+        # A row left below the threshold is not listed either.
+        PostTrending.objects.create(post=self.cold, score=0)
+        response = self.client.get(self.url)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_feed_orders_by_score(self):
+        """The feed lists scored posts, hottest first, and honours filters"""
+        trending.add_activity({self.hot.pk: 5, self.warm.pk: 2})
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        slugs = [post["slug"] for post in response.data["results"]]
+        self.assertEqual(slugs, [self.hot.slug, self.warm.slug])
+
+        response = self.client.get(self.url, {"category__slug": "tech"})
+        self.assertEqual(
+            [post["slug"] for post in response.data["results"]], [self.warm.slug]
+        )
+        response = self.client.get(self.url, {"tags": "python"})
+        self.assertEqual(
+            [post["slug"] for post in response.data["results"]], [self.warm.slug]
+        )
+
+    def test_buffered_likes_are_scored_on_flush(self):
+        """Write-behind likes reach the score once the buffer is flushed"""
+        self.client.force_authenticate(user=self.user)
+        with override_settings(POST_LIKE_WRITE_BEHIND=True):
+            self.client.post(reverse("post-like", kwargs={"slug": self.hot.slug}))
+        self.assertIsNone(self.score(self.hot))
+
+        like_buffer.flush()
+        self.assertEqual(self.score(self.hot), trending.LIKE_WEIGHT)
+
+    def test_update_command_decays_and_rebuilds(self):
+        """update_trending_scores halves scores per half-life and rebuilds"""
+        trending.add_activity({self.hot.pk: 4, self.cold.pk: 0.015})
+        call_command(
+            "update_trending_scores",
+            "--decay",
+            str(trending.HALF_LIFE_HOURS),
+            stdout=StringIO(),
+        )
+        self.assertAlmostEqual(self.score(self.hot), 2)
+        self.assertIsNone(self.score(self.cold))
+
+        Like.objects.create(post=self.warm, user=self.user)
+        out = StringIO()
+        call_command("update_trending_scores", "--rebuild", stdout=out)
+        self.assertIn("Rebuilt trending scores for 1 posts", out.getvalue())
+        self.assertIsNone(self.score(self.hot))
+        self.assertAlmostEqual(self.score(self.warm), trending.LIKE_WEIGHT, places=3)
+
+
+class TaxonomyCountsTestCase(APITestCase):
+    """Test category/tag post counters and the popularity listings"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="counter", email="counter@test.com", password="testpass123"
+        )
+        self.tech = Category.objects.create(name="Tech", slug="tech")
+        self.life = Category.objects.create(name="Life", slug="life")
+        self.python = Tag.objects.create(name="Python", slug="python")
+        self.django = Tag.objects.create(name="Django", slug="django")
+        self.client.force_authenticate(user=self.user)
+
+    def counts(self, *objects):
+        for obj in objects:
+            obj.refresh_from_db()
+        return [obj.posts_count for obj in objects]
+
+    def test_publishing_moves_counts(self):
+        """Only published posts count, in their category and every tag"""
+        post = Post.objects.create(
+            title="Draft", content="Body", author=self.user, category=self.tech
+        )
+        post.tags.set([self.python, self.django])
+        self.assertEqual(self.counts(self.tech, self.python, self.django), [0, 0, 0])
+
+        post.is_published = True
+        post.save()
+        self.assertEqual(self.counts(self.tech, self.python, self.django), [1, 1, 1])
+
+        post.category = self.life
+        post.save(update_fields=["category"])
+        self.assertEqual(self.counts(self.tech, self.life), [0, 1])
+
+        post.is_published = False
+        post.save()
+        self.assertEqual(self.counts(self.life, self.python, self.django), [0, 0, 0])
+
+    def test_retagging_and_deleting_move_counts(self):
+        """Tag changes from either side and deletes keep counts exact"""
+        post = Post.objects.create(
+            title="Live", content="Body", author=self.user, is_published=True
+        )
+        post.tags.add(self.python)
+        post.tags.add(self.python)
+        post.tags.set([self.django])
+        self.assertEqual(self.counts(self.python, self.django), [0, 1])
+
+        # Removing a tag the post does not carry changes nothing.
+        post.tags.remove(self.python)
+        self.python.posts.add(post)
+        self.assertEqual(self.counts(self.python, self.django), [1, 1])
+
+        self.django.posts.clear()
+        self.assertEqual(self.counts(self.python, self.django), [1, 0])
+
+        post.delete()
+        self.assertEqual(self.counts(self.python), [0])
+
+    def test_bulk_import_counts(self):
+        """Posts created by the bulk import are counted"""
+        rows, errors = validate_batch(
+            [
+                {
+                    "title": "One",
+                    "content": "Body",
+                    "category": self.tech.pk,
+                    "tags_input": [self.python.pk],
+                    "is_published": True,
+                },
+                {
+                    "title": "Two",
+                    "content": "Body",
+                    "category": self.tech.pk,
+                    "tags_input": [self.python.pk, self.django.pk],
+                },
+            ]
+        )
+        self.assertFalse(errors)
+        import_batch(rows, self.user)
+        self.assertEqual(self.counts(self.tech, self.python, self.django), [1, 1, 0])
+
+    def test_popularity_listing(self):
+        """?counts=true lists non-empty rows by count without paginating"""
+        for title, tags in (("A", [self.python]), ("B", [self.python, self.django])):
+            post = Post.objects.create(
+                title=title,
+                content="Body",
+                author=self.user,
+                category=self.life,
+                is_published=True,
+            )
+            post.tags.set(tags)
+        Tag.objects.create(name="Empty", slug="empty")
+
+        response = self.client.get("/api/tags/", {"counts": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(tag["slug"], tag["posts_count"]) for tag in response.data],
+            [("python", 2), ("django", 1)],
+        )
+
+        response = self.client.get("/api/categories/", {"counts": "1", "limit": 1})
+        self.assertEqual(
+            response.data,
+            [{"id": self.life.pk, "name": "Life", "slug": "life", "posts_count": 2}],
+        )
+
+        response = self.client.get("/api/tags/")
+        self.assertNotIn("posts_count", response.data["results"][0])
+
+        response = self.client.get("/api/tags/", {"counts": "true", "limit": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_listing_reads_counters(self):
+        """The popularity listing never aggregates posts"""
+        _, queries = capture_sql(
+            lambda: self.client.get("/api/tags/", {"counts": "true"})
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("posts_post", queries[0])
+
+    def test_reconcile_fixes_counts(self):
+        """reconcile_post_counters repairs drifted category/tag counts"""
+        post = Post.objects.create(
+            title="Live",
+            content="Body",
+            author=self.user,
+            category=self.tech,
+            is_published=True,
+        )
+        post.tags.add(self.python)
+        Category.objects.update(posts_count=5)
+        Tag.objects.filter(pk=self.python.pk).update(posts_count=0)
+
+        out = StringIO()
+        call_command("reconcile_post_counters", stdout=out)
+        self.assertEqual(
+            self.counts(self.tech, self.life, self.python, self.django), [1, 0, 1, 0]
+        )
+        self.assertIn("2 categories and 1 tags", out.getvalue())
+
+
+class TaxonomyCacheTestCase(CacheResetAPITestCase):
+    """Test the process-local category/tag cache"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="cached", email="cached@test.com", password="testpass123"
+        )
+        self.category = Category.objects.create(name="Technology", slug="technology")
+        self.tag = Tag.objects.create(name="Python", slug="python")
+        self.client.force_authenticate(user=self.user)
+
+    def _taxonomy_queries(self, request):
+        """Run ``request``; return it and the queries that read names/slugs."""
+        response, queries = capture_sql(request)
+        return response, [
+            sql
+            for sql in queries
+            if '"posts_category"."name"' in sql or '"posts_tag"."name"' in sql
+        ]
+
+    def test_create_resolves_ids_without_queries(self):
+        """A warm cache validates and renders category/tags with no lookups"""
+        taxonomy_cache.current()
+        response, queries = self._taxonomy_queries(
+            lambda: self.client.post(
+                reverse("post-list-create"),
+                {
+                    "title": "Cached",
+                    "content": "Body",
+                    "category": self.category.pk,
+                    "tags_input": [self.tag.pk],
+                    "is_published": True,
+                },
+                format="json",
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["categories"][0]["slug"], "technology")
+        self.assertEqual(response.data["tags"][0]["name"], "Python")
+        self.assertEqual(queries, [])
+
+        response = self.client.post(
+            reverse("post-list-create"),
+            {"title": "Bad", "content": "Body", "category": 999},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("does not exist", str(response.data["category"]))
+
+    @override_settings(POST_CACHE_SHARED=False)
+    def test_unshared_cache_checks_writes_and_expires(self):
+        """Without a shared stamp, writes re-check ids and snapshots expire"""
+        clock = mock.patch.object(taxonomy_cache, "time").start()
+        self.addCleanup(mock.patch.stopall)
+        clock.monotonic.return_value = 0.0
+        taxonomy_cache.current()
+        # Deleted and renamed by another worker: no signal reaches this one.
+        delete_rows(Category.objects.filter(pk=self.category.pk))
+        Tag.objects.filter(pk=self.tag.pk).update(name="Py")
+
+        response = self.client.post(
+            reverse("post-list-create"),
+            {
+                "title": "Stale",
+                "content": "Body",
+                "category": self.category.pk,
+                "tags_input": [self.tag.pk],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("does not exist", str(response.data["category"]))
+
+        self.assertEqual(taxonomy_cache.tag_row(self.tag.pk)[1], "Python")
+        clock.monotonic.return_value = taxonomy_cache.UNSHARED_SNAPSHOT_TTL
+        self.assertEqual(taxonomy_cache.tag_row(self.tag.pk)[1], "Py")
+
+    def test_writes_invalidate_snapshot(self):
+        """Renaming a category is visible to the next request"""
+        post = Post.objects.create(
+            title="Named",
+            content="Body",
+            author=self.user,
+            category=self.category,
+            is_published=True,
+        )
+        url = reverse("post-detail", kwargs={"slug": post.slug})
+        self.assertEqual(
+            self.client.get(url).data["categories"][0]["name"], "Technology"
+        )
+
+        self.category.name = "Tech"
+        self.category.save()
+        self.assertEqual(self.client.get(url).data["categories"][0]["name"], "Tech")
+
+    def test_unknown_id_reloads_once(self):
+        """Rows written without signals are found by a reload on miss"""
+        taxonomy_cache.current()
+        (late,) = Tag.objects.bulk_create([Tag(name="Late", slug="late")])
+
+        self.assertEqual(taxonomy_cache.tag_row(late.pk), (late.pk, "Late", "late"))
+        self.assertIsNone(taxonomy_cache.tag_row(999))
+
+        # Outside a request too, further misses under the same stamp are free.
+        with self.assertNumQueries(0):
+            self.assertIsNone(taxonomy_cache.tag_row(998))
+            self.assertIsNone(taxonomy_cache.category_row(997))
+
+    def test_stamp_checked_once_per_request(self):
+        """One request compares the version stamp a single time"""
+        post = Post.objects.create(
+            title="Tagged", content="Body", author=self.user, is_published=True
+        )
+        post.tags.add(self.tag)
+        Post.objects.create(
+            title="Also tagged", content="Body", author=self.user, is_published=True
+        ).tags.add(self.tag)
+
+        with mock.patch.object(
+            response_cache,
+            "get_generations",
+            wraps=response_cache.get_generations,
+        ) as generations:
+            response = self.client.get(reverse("my-posts"))
+
+        self.assertEqual(len(response.data["results"]), 2)
+        stamp_checks = [
+            call for call in generations.call_args_list if call.args[0] == ["taxonomy"]
+        ]
+        self.assertEqual(len(stamp_checks), 1)
+
+
+class PostTagAssignmentTestCase(CacheResetAPITestCase):
+    """Test batched tags_input validation and diff-based tag assignment"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(
+            username="tagger", email="tagger@test.com", password="testpass123"
+        )
+        self.tags = [
+            Tag.objects.create(name=f"Tag {i}", slug=f"tag-{i}") for i in range(20)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def _through_writes(self, request):
+        """Run ``request``; return it and its writes to the through table."""
+        response, queries = capture_sql(request)
+        writes = [
+            sql.split(" ", 1)[0]
+            for sql in queries
+            if '"posts_post_tags"' in sql and sql.startswith(("INSERT", "DELETE"))
+        ]
+        return response, writes
+
+    def test_missing_ids_reported_together(self):
+        """Every unknown tag id is listed in one error"""
+        response = self.client.post(
+            reverse("post-list-create"),
+            {
+                "title": "Bad tags",
+                "content": "Body",
+                "tags_input": [self.tags[0].pk, 998, 999, 998],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data["tags_input"],
+            [
+                'Invalid pk "998" - object does not exist.',
+                'Invalid pk "999" - object does not exist.',
+            ],
+        )
+
+        response = self.client.post(
+            reverse("post-list-create"),
+            {"title": "Bad", "content": "Body", "tags_input": ["x"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_inserts_tags_once(self):
+        """Twenty tags are validated without lookups and inserted in one statement"""
+        taxonomy_cache.current()
+        response, writes = self._through_writes(
+            lambda: self.client.post(
+                reverse("post-list-create"),
+                {
+                    "title": "Many tags",
+                    "content": "Body",
+                    "tags_input": [tag.pk for tag in self.tags],
+                },
+                format="json",
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["tags"]), 20)
+        self.assertEqual(writes, ["INSERT"])
+
+    def test_update_writes_only_the_difference(self):
+        """Retagging deletes and inserts just the changed links"""
+        post = Post.objects.create(
+            title="Retag", content="Body", author=self.user, is_published=True
+        )
+        post.assign_tags(self.tags[:3])
+        url = reverse("post-detail", kwargs={"slug": post.slug})
+
+        response, writes = self._through_writes(
+            lambda: self.client.patch(
+                url,
+                {"tags_input": [tag.pk for tag in self.tags[1:4]]},
+                format="json",
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(writes, ["DELETE", "INSERT"])
+        self.assertEqual(
+            sorted(post.tags.values_list("slug", flat=True)),
+            ["tag-1", "tag-2", "tag-3"],
+        )
+        # The m2m signals still move the published-post counts.
+        counts = dict(Tag.objects.values_list("slug", "posts_count"))
+        self.assertEqual(counts["tag-0"], 0)
+        self.assertEqual(counts["tag-3"], 1)
+
+        _, writes = self._through_writes(
+            lambda: self.client.patch(
+                url,
+                {"tags_input": [self.tags[3].pk, self.tags[1].pk, self.tags[2].pk]},
+                format="json",
+            )
+        )
+        self.assertEqual(writes, [])
@@ -0,0 +1,100 @@
+"""Trending ("hot") scores: time-decayed likes and comments per post.
+
+Each like adds ``LIKE_WEIGHT`` and each comment ``COMMENT_WEIGHT`` to the
+post's ``PostTrending.score`` as it happens (removals subtract), so the
+feed never aggregates ``Like``/``Comment`` at request time. Scores are
+decayed by a common factor, halving every ``HALF_LIFE_HOURS``, by
+``update_trending_scores`` run on a schedule; since every score shrinks by
+the same factor, the order between decay runs stays correct. Rebuilding
+recomputes every score exactly from the activity of the last
+``REBUILD_HALF_LIVES`` half-lives, repairing drift from missed decays.
+
+ORM writes reach ``add_activity`` through the ``signals`` receivers; the
+raw-SQL like paths and subtree deletes call it themselves.
+"""
+
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from .models import Comment, Like, PostTrending
+
+HALF_LIFE_HOURS = 24
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+# Rows that decayed below this are dropped; the feed only lists live posts.
+MIN_SCORE = 0.01
+REBUILD_HALF_LIVES = 10
+
+TRENDING_TABLE = connection.ops.quote_name(PostTrending._meta.db_table)
+
+
+def add_activity(deltas):
+    """Add ``{post_id: delta}`` to the posts' scores.
+
+    Gains are upserted in one statement. Losses only update existing rows:
+    a post without a row has nothing to lose, and deletes cascading from a
+    removed post must not insert a row for it. Losses subtract undecayed
+    weights from decayed scores, so rows they push below ``MIN_SCORE`` are
+    dropped rather than left listed at zero.
+    """
+    gains = [(post_id, delta) for post_id, delta in deltas.items() if delta > 0]
+    if gains:
+        values = ", ".join(["(%s, %s)"] * len(gains))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {TRENDING_TABLE} (post_id, score) VALUES {values} "
+                f"ON CONFLICT (post_id) DO UPDATE SET "
+                f"score = {TRENDING_TABLE}.score + excluded.score",
+                [param for gain in gains for param in gain],
+            )
+    losses = {post_id: delta for post_id, delta in deltas.items() if delta < 0}
+    for post_id, delta in losses.items():
+        PostTrending.objects.filter(post_id=post_id).update(
+            score=Case(
+                When(score__gt=-delta, then=F("score") + delta),
+                default=Value(0.0),
+            )
+        )
+    if losses:
+        PostTrending.objects.filter(post_id__in=losses, score__lt=MIN_SCORE).delete()
+
+
+def decay(hours):
+    """Age every score by ``hours`` and drop the ones that faded out."""
+    factor = 0.5 ** (hours / HALF_LIFE_HOURS)
+    with transaction.atomic():
+        PostTrending.objects.update(score=F("score") * factor)
+        PostTrending.objects.filter(score__lt=MIN_SCORE).delete()
+
+
+def rebuild(now=None):
+    """Recompute every score from recent likes and comments.
+
+    Streams ``(post_id, created_at)`` of the activity inside the window and
+    replaces the table in one transaction; returns the number of posts
+    scored.
+    """
+    now = now or timezone.now()
+    since = now - timedelta(hours=HALF_LIFE_HOURS * REBUILD_HALF_LIVES)
+    scores = {}
+    for model, weight in ((Like, LIKE_WEIGHT), (Comment, COMMENT_WEIGHT)):
+        rows = model.objects.filter(created_at__gte=since).values_list(
+            "post_id", "created_at"
+        )
+        for post_id, created_at in rows.iterator(chunk_size=2000):
+            age = (now - created_at).total_seconds() / 3600
+            score = weight * 0.5 ** (age / HALF_LIFE_HOURS)
+            scores[post_id] = scores.get(post_id, 0.0) + score
+
+    rows = [
+        PostTrending(post_id=post_id, score=score)
+        for post_id, score in scores.items()
+        if score >= MIN_SCORE
+    ]
+    with transaction.atomic():
+        PostTrending.objects.all().delete()
+        PostTrending.objects.bulk_create(rows)
+    return len(rows)
@@ -2,21 +2,39 @@ from django.urls import path
 
 from .views import (
     CommentDeleteAPIView,
+    CommentRepliesAPIView,
     LikePostAPIView,
     MyPostsListAPIView,
+    PostBulkCreateAPIView,
     PostCommentsAPIView,
+    PostExportAPIView,
     PostLikeStatusAPIView,
+    PostLikeStatusBatchAPIView,
     PostListCreateAPIView,
     PostRetrieveUpdateDeleteAPIView,
+    PostTrendingListAPIView,
     UnlikePostAPIView,
 )
 
 urlpatterns = [
     path("", PostListCreateAPIView.as_view(), name="post-list-create"),
     path("my-posts/", MyPostsListAPIView.as_view(), name="my-posts"),
+    path("export/", PostExportAPIView.as_view(), name="post-export"),
+    path("bulk/", PostBulkCreateAPIView.as_view(), name="post-bulk-create"),
+    path(
+        "like-status/",
+        PostLikeStatusBatchAPIView.as_view(),
+        name="post-like-status-batch",
+    ),
+    path("trending/", PostTrendingListAPIView.as_view(), name="post-trending"),
     path("<slug:slug>/", PostRetrieveUpdateDeleteAPIView.as_view(), name="post-detail"),
     path("<slug:slug>/comments/", PostCommentsAPIView.as_view(), name="post-comments"),
     path("comments/<int:id>/", CommentDeleteAPIView.as_view(), name="comment-delete"),
+    path(
+        "comments/<int:id>/replies/",
+        CommentRepliesAPIView.as_view(),
+        name="comment-replies",
+    ),
     path("<slug:slug>/like/", LikePostAPIView.as_view(), name="post-like"),
     path("<slug:slug>/unlike/", UnlikePostAPIView.as_view(), name="post-unlike"),
     path(
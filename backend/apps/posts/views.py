@@ -1,26 +1,60 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics, permissions, status
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.generics import ListCreateAPIView
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import (
+    IsAdminUser,
+    IsAuthenticated,
+    IsAuthenticatedOrReadOnly,
+)
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Category, Comment, Like, Post, Tag
+from config.renderers import ORJSONRenderer
+
+from . import cache as response_cache
+from . import like_buffer, likes, trending
+from .bulk import BULK_MAX_POSTS, import_batch, validate_batch
+from .cache import CachedPostDetailMixin, CachedPostListMixin
+from .conditional import ConditionalGetMixin, conditional_response, make_etag
+from .export import EXPORT_SECTIONS, NDJSONRenderer, export_lines
+from .fieldsets import SparseFieldsetMixin
+from .filters import PostFilter, comment_window
+from .models import Category, Comment, Post, Tag
+from .pagination import CommentThreadPagination, KeysetPagination, PostPagination
 from .permissions import IsAuthorOrReadOnly
+from .rendering import FastPostListMixin
+from .search import PostSearchFilter
 from .serializers import (
+    CategoryCountSerializer,
     CategorySerializer,
     CommentSerializer,
     PostDetailSerializer,
     PostSerializer,
+    TagCountSerializer,
     TagSerializer,
+    recent_comments_queryset,
+    with_reply_flags,
 )
+from .signals import invalidate_posts
+from .taxonomy import PostCountListMixin
 
 
 @extend_schema(tags=["Posts"])
-class PostListCreateAPIView(generics.ListCreateAPIView):
+class PostListCreateAPIView(
+    ConditionalGetMixin,
+    CachedPostListMixin,
+    FastPostListMixin,
+    SparseFieldsetMixin,
+    generics.ListCreateAPIView,
+):
     """API view for listing and creating blog posts.
 
     GET: Returns a paginated list of published posts. Supports filtering
@@ -29,22 +63,35 @@ class PostListCreateAPIView(generics.ListCreateAPIView):
 
     Filtering:
         - category__slug: Filter posts by category slug
+        - tags: Comma-separated tag slugs, matched with tags_mode=any
+          (default) or all, via subqueries rather than joins
 
     Search Fields:
-        - title, content
+        - title, content (full-text, ranked by relevance unless ordering
+          is given explicitly)
 
     Ordering:
         - created_at (default: descending)
+
+    Pagination:
+        - page: Page number (default mode)
+        - pagination=cursor / cursor: Keyset pagination on (created_at, id)
+
+    Sparse fieldsets:
+        - fields / omit: Comma-separated field names to include / exclude.
+          Unused columns, joins and prefetches are skipped in SQL too.
+
+    GET responses carry ETag/Last-Modified validators; anonymous responses
+    are served from the versioned response cache. List rows are rendered
+    from ``values_list()`` records rather than model instances.
     """
 
     serializer_class = PostSerializer
+    pagination_class = PostPagination
 
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, PostSearchFilter]
 
-    filterset_fields = {
-        "category__slug": ["exact"],
-        "tags__slug": ["exact"],
-    }
+    filterset_class = PostFilter
 
     search_fields = ["title", "content"]
     ordering_fields = ["created_at"]
@@ -52,12 +99,32 @@ class PostListCreateAPIView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         """Return published posts with optimized related data fetching."""
-        return (
-            Post.objects.filter(is_published=True)
-            .select_related("author", "category")
-            .prefetch_related("tags")
+        return self.narrow_queryset(
+            likes.with_liked_by_me(
+                Post.objects.filter(is_published=True).select_related("author"),
+                self.request.user,
+            )
         )
 
+    def get_validators(self, request, *args, **kwargs):
+        """Validate the list by the response-cache generations it depends on.
+
+        Every write that can change a list page bumps one of these, so no
+        query runs; there is no cheap timestamp, so no Last-Modified either.
+        Generations kept per worker would answer 304 after another worker's
+        write, so lists are not validated unless the cache is shared.
+        """
+        if not settings.POST_CACHE_SHARED:
+            return None
+        scopes = [
+            *response_cache.list_scopes(request),
+            response_cache.TAXONOMY_SCOPE,
+            *like_buffer.pending_scopes(request.user),
+        ]
+        generations = response_cache.get_generations(scopes)
+        # liked_by_me differs per user, so the user is part of the ETag.
+        return make_etag(request, request.user.pk, *generations), None
+
     def get_permissions(self):
         """Allow anyone to list posts, but require auth to create."""
         if self.request.method == "POST":
@@ -69,14 +136,63 @@ class PostListCreateAPIView(generics.ListCreateAPIView):
         serializer.save(author=self.request.user)
 
 
-class PostRetrieveUpdateDeleteAPIView(generics.RetrieveUpdateDestroyAPIView):
+@extend_schema(tags=["Posts"])
+class PostBulkCreateAPIView(APIView):
+    """API view for creating many posts in one request.
+
+    POST: Accepts a JSON list of up to ``BULK_MAX_POSTS`` posts with the
+          same fields as post creation. The batch is all-or-nothing: any
+          invalid item rejects the request with per-item errors (keyed by
+          list index). Requires authentication.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """Validate and create the whole batch.
+
+        Returns:
+            201 with the created count and slugs (in request order), or 400
+            with ``{"errors": {index: field errors}}``.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"detail": "Expected a non-empty list of posts."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > BULK_MAX_POSTS:
+            return Response(
+                {"detail": f"At most {BULK_MAX_POSTS} posts per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        rows, errors = validate_batch(items)
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        posts = import_batch(rows, request.user)
+        return Response(
+            {"created": len(posts), "slugs": [post.slug for post in posts]},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class PostRetrieveUpdateDeleteAPIView(
+    ConditionalGetMixin,
+    CachedPostDetailMixin,
+    SparseFieldsetMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     """API view for retrieving, updating, and deleting a single post.
 
     GET: Retrieve a post by slug. Authors can view their own drafts.
     PUT/PATCH: Update a post. Only the author can modify their posts.
     DELETE: Remove a post. Only the author can delete their posts.
 
-    Note: The slug field is immutable and cannot be updated.
+    Note: The slug field is immutable and cannot be updated. GET responses
+    carry ETag/Last-Modified validators; anonymous responses are served from
+    the versioned response cache. GET supports ?fields= / ?omit=.
     """
 
     serializer_class = PostDetailSerializer
@@ -90,60 +206,119 @@ class PostRetrieveUpdateDeleteAPIView(generics.RetrieveUpdateDestroyAPIView):
         any post by slug regardless of published status or author.
         This enables proper viewing of draft posts from the dashboard.
         """
-        return (
-            Post.objects.all()
-            .select_related("author", "category")
-            .prefetch_related("tags", "comments")
-            .order_by("-created_at")
+        return self.narrow_queryset(
+            likes.with_liked_by_me(
+                Post.objects.all()
+                .select_related("author")
+                .prefetch_related(
+                    Prefetch(
+                        "comments",
+                        queryset=recent_comments_queryset(Comment.objects.all()),
+                        to_attr="recent_comments",
+                    ),
+                )
+                .order_by("-created_at"),
+                self.request.user,
+            )
+        )
+
+    def get_validators(self, request, *args, **kwargs):
+        """Validate the post from its timestamps and counters in one row read."""
+        if not settings.POST_CACHE_SHARED:
+            return None
+        state = (
+            Post.objects.filter(slug=kwargs["slug"])
+            .values_list(
+                "pk", "updated_at", "last_activity_at", "likes_count", "comments_count"
+            )
+            .first()
         )
+        if state is None:
+            return None
+        # Category/tag renames and buffered likes change the body without
+        # touching the post row; only a shared cache tracks them for every
+        # worker.
+        generations = response_cache.get_generations(
+            [response_cache.TAXONOMY_SCOPE, *like_buffer.pending_scopes(request.user)]
+        )
+        etag = make_etag(request, request.user.pk, *state, *generations)
+        return etag, max(state[1], state[2])
 
 
-class CategoryListCreateAPIView(ListCreateAPIView):
+class CategoryListCreateAPIView(PostCountListMixin, ListCreateAPIView):
     """API view for listing and creating categories.
 
-    GET: Returns all categories.
+    GET: Returns all categories. With ?counts=true, returns up to ?limit=
+         categories that have published posts, with their posts_count,
+         most popular first and unpaginated.
     POST: Creates a new category. Requires authentication.
     """
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    count_serializer_class = CategoryCountSerializer
     permission_classes = [IsAuthenticated]
 
 
-class TagListCreateAPIView(ListCreateAPIView):
+class TagListCreateAPIView(PostCountListMixin, ListCreateAPIView):
     """API view for listing and creating tags.
 
-    GET: Returns all tags.
+    GET: Returns all tags. With ?counts=true, returns up to ?limit= tags
+         that have published posts, with their posts_count, most popular
+         first and unpaginated.
     POST: Creates a new tag. Requires authentication.
     """
 
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
+    count_serializer_class = TagCountSerializer
     permission_classes = [IsAuthenticated]
 
 
 class PostCommentsAPIView(APIView):
     """API view for listing and creating comments on a post.
 
-    GET: Returns all comments for a post, ordered by most recent first.
-    POST: Creates a new comment on a post. Requires authentication.
+    GET: Returns a post's top-level comments, most recent first,
+         keyset-paginated. Supports ``cursor`` (including a post's
+         ``comments_next`` link), ``page_size`` and ``since``/``before``
+         windows for polling. Replies are loaded from ``CommentRepliesAPIView``.
+    POST: Creates a new comment on a post, or a reply when ``parent`` is
+          given. Requires authentication.
     """
 
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get(self, request, slug):
-        """Retrieve all comments for a specific post.
+        """Retrieve a page of comments for a specific post.
 
         Args:
             slug: The unique slug identifier of the post.
 
         Returns:
-            List of comments ordered by creation date (newest first).
+            Top-level comments newest first, keyset-paginated on
+            (created_at, id) with ``next``/``previous`` cursor links.
+            ``since``/``before`` restrict the page to a created_at window.
         """
-        post = get_object_or_404(Post, slug=slug)
-        comments = post.comments.all().order_by("-created_at")
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        post = get_object_or_404(
+            Post.objects.only("pk", "comments_count", "last_activity_at"), slug=slug
+        )
+        # Reject a malformed window before a matching ETag can answer 304.
+        window = comment_window(request.query_params)
+
+        def render():
+            comments = (
+                with_reply_flags(post.comments.filter(parent__isnull=True, **window))
+                .select_related("user")
+                .order_by("-created_at")
+            )
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(comments, request, self)
+            serializer = CommentSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        # Every comment write moves comments_count and last_activity_at.
+        etag = make_etag(request, post.pk, post.comments_count, post.last_activity_at)
+        return conditional_response(request, etag, post.last_activity_at, render)
 
     def post(self, request, slug):
         """Create a new comment on a post.
@@ -157,18 +332,73 @@ class PostCommentsAPIView(APIView):
         """
         post = get_object_or_404(Post, slug=slug)
 
-        serializer = CommentSerializer(data=request.data)
+        serializer = CommentSerializer(data=request.data, context={"post": post})
         if serializer.is_valid():
-            serializer.save(user=request.user, post=post)
+            with transaction.atomic():
+                serializer.save(user=request.user, post=post)
+                Post.adjust_counters(post.pk, comments=1)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class CommentRepliesAPIView(APIView):
+    """API view for lazily loading the replies below a comment.
+
+    GET: Returns the comment's whole reply subtree in thread order (each
+         reply right after its parent), paged with path cursors. ``depth``
+         limits how many levels below the comment are included; replies
+         with ``has_replies`` set can be expanded with another request.
+    """
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get(self, request, id):
+        """Retrieve a page of replies below a comment.
+
+        Args:
+            id: The unique identifier of the comment.
+
+        Returns:
+            Replies in thread order, each page a single range query on the
+            comment's materialized path, with a ``next`` cursor link.
+        """
+        comment = get_object_or_404(
+            Comment.objects.only("pk", "post_id", "path", "depth"), id=id
+        )
+        low, high = comment.subtree_range()
+        replies = Comment.objects.filter(
+            post_id=comment.post_id, path__gt=low, path__lt=high
+        )
+        levels = self.get_depth(request)
+        if levels is not None:
+            replies = replies.filter(depth__lte=comment.depth + levels)
+
+        paginator = CommentThreadPagination()
+        page = paginator.paginate_queryset(
+            with_reply_flags(replies).select_related("user"), request, self
+        )
+        serializer = CommentSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    def get_depth(self, request):
+        raw = request.query_params.get("depth")
+        if not raw:
+            return None
+        try:
+            levels = int(raw)
+        except ValueError:
+            levels = 0
+        if levels < 1:
+            raise ValidationError({"depth": ["Enter a positive integer."]})
+        return levels
+
+
 class CommentDeleteAPIView(APIView):
     """API view for deleting a comment.
 
-    DELETE: Removes a comment. Only the comment author can delete it.
+    DELETE: Removes a comment together with all of its replies. Only the
+            comment author can delete it.
     """
 
     permission_classes = [IsAuthenticated]
@@ -190,7 +420,12 @@ class CommentDeleteAPIView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        comment.delete()
+        with transaction.atomic():
+            deleted = comment.delete_subtree()
+            Post.adjust_counters(comment.post_id, comments=-deleted)
+            trending.add_activity({comment.post_id: -deleted * trending.COMMENT_WEIGHT})
+        # The range delete sends no per-comment signals; invalidate once.
+        invalidate_posts([comment.post_id])
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -198,7 +433,8 @@ class LikePostAPIView(APIView):
     """API view for liking a post.
 
     POST: Adds a like to a post. Duplicate likes are ignored (idempotent).
-          Requires authentication.
+          Requires authentication. See ``likes`` for the write path, or
+          ``like_buffer`` when POST_LIKE_WRITE_BEHIND is on.
     """
 
     permission_classes = [IsAuthenticated]
@@ -212,15 +448,18 @@ class LikePostAPIView(APIView):
         Returns:
             Success message with current like status and count.
         """
-        post = get_object_or_404(Post, slug=slug)
-
-        like, created = Like.objects.get_or_create(
-            post=post,
-            user=request.user,
-        )
-
-        # Get current total likes count
-        total_likes = post.likes.count()
+        write_behind = settings.POST_LIKE_WRITE_BEHIND
+        if write_behind:
+            result = like_buffer.toggle(slug, request.user, liked=True)
+        else:
+            result = likes.like(slug, request.user.pk)
+        if result is None:
+            raise Http404
+        post_id, created, total_likes = result
+        # Buffered likes are scored and invalidated when the flush applies them.
+        if created and not write_behind:
+            trending.add_activity({post_id: trending.LIKE_WEIGHT})
+            invalidate_posts([post_id])
 
         return Response(
             {
@@ -250,28 +489,57 @@ class UnlikePostAPIView(APIView):
         Returns:
             Success message with current like status and count.
         """
-        post = get_object_or_404(Post, slug=slug)
-
-        deleted_count, _ = Like.objects.filter(
-            post=post,
-            user=request.user,
-        ).delete()
-
-        # Get current total likes count
-        total_likes = post.likes.count()
+        write_behind = settings.POST_LIKE_WRITE_BEHIND
+        if write_behind:
+            result = like_buffer.toggle(slug, request.user, liked=False)
+        else:
+            result = likes.unlike(slug, request.user.pk)
+        if result is None:
+            raise Http404
+        post_id, removed, total_likes = result
+        if removed and not write_behind:
+            trending.add_activity({post_id: -trending.LIKE_WEIGHT})
+            invalidate_posts([post_id])
 
         return Response(
             {
-                "message": "Post unliked"
-                if deleted_count > 0
-                else "Post was not liked",
+                "message": "Post unliked" if removed else "Post was not liked",
                 "liked": False,
                 "likes_count": total_likes,
-                "was_removed": deleted_count > 0,
+                "was_removed": removed,
             }
         )
 
 
+class PostLikeStatusBatchAPIView(APIView):
+    """API view for the like status of many posts at once.
+
+    GET: ``?slugs=a,b,c``. POST: ``{"slugs": [...]}`` for lists too long for
+         a query string. Either way at most ``LIKE_STATUS_MAX_SLUGS`` slugs.
+         Returns ``{slug: {liked, likes_count}}`` from one query; unknown
+         slugs are left out and ``liked`` is false for anonymous users.
+    """
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        """Get like statuses for the comma-separated ``slugs`` parameter."""
+        raw = request.query_params.get("slugs", "")
+        slugs = [slug.strip() for slug in raw.split(",") if slug.strip()]
+        return self.statuses(request, {"slugs": slugs})
+
+    def post(self, request):
+        """Get like statuses for the ``slugs`` list in the request body."""
+        return self.statuses(request, request.data)
+
+    def statuses(self, request, data):
+        serializer = likes.LikeStatusRequestSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return Response(
+            likes.like_statuses(serializer.validated_data["slugs"], request.user)
+        )
+
+
 class PostLikeStatusAPIView(APIView):
     """API view for checking if user has liked a post.
 
@@ -290,38 +558,111 @@ class PostLikeStatusAPIView(APIView):
         Returns:
             Current like status and count for the user.
         """
-        post = get_object_or_404(Post, slug=slug)
-
-        # Check if user has liked this post
-        if request.user.is_authenticated:
-            liked = Like.objects.filter(post=post, user=request.user).exists()
-        else:
-            liked = False
-
-        # Get total likes count
-        likes_count = post.likes.count()
+        # Check if user has liked this post in the same query
+        posts = likes.with_liked_by_me(Post.objects.filter(slug=slug), request.user)
+        state = get_object_or_404(
+            posts.values(
+                "pk", "likes_count", "last_activity_at", *posts.query.annotations
+            )
+        )
+        liked = state["liked_by_me"]
+        likes_count = likes.shown_likes_count(
+            state["likes_count"], state.get("likes_delta", 0)
+        )
 
-        return Response({"liked": liked, "likes_count": likes_count})
+        etag = make_etag(request, request.user.pk, likes_count, liked)
+        return conditional_response(
+            request,
+            etag,
+            state["last_activity_at"],
+            lambda: Response({"liked": liked, "likes_count": likes_count}),
+        )
 
 
-class MyPostsListAPIView(generics.ListAPIView):
+class MyPostsListAPIView(FastPostListMixin, SparseFieldsetMixin, generics.ListAPIView):
     """API view for listing the authenticated user's posts.
 
     GET: Returns a paginated list of posts created by the authenticated user,
-         including both published and draft posts.
+         including both published and draft posts. Supports the same
+         keyset pagination mode, ?fields= / ?omit= parameters and fast
+         values-based rendering as the public post list.
     """
 
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [SearchFilter, OrderingFilter]
+    pagination_class = PostPagination
+    filter_backends = [OrderingFilter, PostSearchFilter]
     search_fields = ["title", "content"]
     ordering_fields = ["created_at", "updated_at"]
     ordering = ["-created_at"]
 
     def get_queryset(self):
         """Return posts created by the authenticated user."""
-        return (
-            Post.objects.filter(author=self.request.user)
-            .select_related("author", "category")
-            .prefetch_related("tags")
+        return self.narrow_queryset(
+            likes.with_liked_by_me(
+                Post.objects.filter(author=self.request.user).select_related("author"),
+                self.request.user,
+            )
+        )
+
+
+@extend_schema(tags=["Posts"])
+class PostTrendingListAPIView(
+    FastPostListMixin, SparseFieldsetMixin, generics.ListAPIView
+):
+    """API view for listing trending posts, hottest first.
+
+    GET: Returns a paginated list of published posts ordered by their
+         time-decayed like/comment score (see ``trending``). Posts with no
+         recent activity are left out. Supports the category and tag
+         filters and the ?fields= / ?omit= parameters of the post list.
+
+    Scores are read from the indexed ``PostTrending`` table, so the feed is
+    one ordered join rather than an aggregate over likes and comments.
+    Scores shift between requests, so only page-number pagination is
+    offered.
+    """
+
+    serializer_class = PostSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PostFilter
+
+    def get_queryset(self):
+        """Return scored published posts, highest score first."""
+        return self.narrow_queryset(
+            likes.with_liked_by_me(
+                Post.objects.filter(
+                    is_published=True, trending__score__gte=trending.MIN_SCORE
+                )
+                .select_related("author")
+                .order_by("-trending__score", "-pk"),
+                self.request.user,
+            )
+        )
+
+
+class PostExportAPIView(APIView):
+    """API view streaming every published post as NDJSON.
+
+    GET: Streams one JSON object per line. Staff only.
+
+    Query Parameters:
+        - include: Comma-separated extra sections, ``comments`` and/or
+          ``likes``, streamed after the posts.
+    """
+
+    permission_classes = [IsAdminUser]
+    renderer_classes = [NDJSONRenderer, ORJSONRenderer]
+
+    def get(self, request):
+        """Stream the export without loading it into memory."""
+        requested = request.query_params.get("include", "")
+        include = [
+            section for section in EXPORT_SECTIONS if section in requested.split(",")
+        ]
+        response = StreamingHttpResponse(
+            export_lines(include), content_type=NDJSONRenderer.media_type
         )
+        response["Content-Disposition"] = 'attachment; filename="posts.ndjson"'
+        return response
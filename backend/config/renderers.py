@@ -0,0 +1,87 @@
+"""Project-wide renderers and parsers.
+
+JSON goes through ``orjson``, which encodes datetimes, dates, times and
+UUIDs natively. Anything it cannot encode (``Decimal``, lazy translation
+strings, ``timedelta``, querysets...) is handed to DRF's ``JSONEncoder``
+so the output matches the stock ``JSONRenderer``. Pretty-printed
+responses (``; indent=N`` or the browsable API) keep the stock stdlib
+path.
+
+``application/msgpack`` is offered for internal consumers; values are
+converted exactly as for JSON, so datetimes arrive as ISO 8601 strings.
+"""
+
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    """Encode values ``orjson``/``msgpack`` do not know the way DRF does."""
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``application/json`` rendered with ``orjson``."""
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        # orjson cannot indent by N or escape non-ASCII; keep the stdlib path.
+        if indent is not None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=self.options)
+        # Escape U+2028/U+2029 like JSONRenderer so output stays valid JS.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """``application/json`` request bodies parsed with ``orjson``."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """``application/msgpack`` responses for internal consumers."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """``application/msgpack`` request bodies."""
+
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(f"MessagePack parse error - {exc}")
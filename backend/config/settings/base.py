@@ -88,6 +88,51 @@ DATABASES = {
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+#
+# Local memory works for a single process and for tests. Set REDIS_URL in
+# multi-worker deployments so response-cache invalidation is shared.
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Whether every server process shares the default cache. The post response
+# cache and the post list/detail ETags are only used when it does: with
+# local memory, a write bumps the generations of one worker while the others
+# keep serving (or answering 304 for) what they saw before. ``runserver``
+# answers from one process, so dev settings turn this on.
+POST_CACHE_SHARED = bool(os.environ.get("REDIS_URL"))
+
+# Seconds an anonymous post list/detail response stays cached
+POST_RESPONSE_CACHE_TIMEOUT = int(os.environ.get("POST_RESPONSE_CACHE_TIMEOUT", "300"))
+
+# Like write-behind: like/unlike only record an intent in the buffer and
+# answer with an optimistic count; ``flush_like_buffer`` applies intents in
+# batches. The database buffer survives restarts. The in-process
+# ``apps.posts.like_buffer.MemoryLikeBuffer`` is for tests only: the flush
+# command runs in another process and would never see its intents.
+POST_LIKE_WRITE_BEHIND = os.environ.get("POST_LIKE_WRITE_BEHIND", "").lower() == "true"
+POST_LIKE_BUFFER = os.environ.get(
+    "POST_LIKE_BUFFER", "apps.posts.like_buffer.DatabaseLikeBuffer"
+)
+
+if POST_LIKE_WRITE_BEHIND and POST_LIKE_BUFFER.endswith(".MemoryLikeBuffer"):
+    raise ValueError(
+        "MemoryLikeBuffer is for tests; flush_like_buffer cannot read its intents"
+    )
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -132,6 +177,17 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.ORJSONRenderer",
+        "config.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.renderers.ORJSONParser",
+        "config.renderers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
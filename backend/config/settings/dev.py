@@ -13,4 +13,7 @@ if not SECRET_KEY:
 
 DEBUG = True
 
+# runserver answers from one process, so local memory is a shared cache.
+POST_CACHE_SHARED = True
+
 ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
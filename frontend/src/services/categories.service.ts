@@ -48,11 +48,12 @@ export class CategoriesService {
     await apiClient.delete(`${this.BASE_PATH}/${id}/`);
   }
 
-  static async getCategoriesWithPostCount(): Promise<
-    (Category & { post_count: number })[]
-  > {
-    return await apiClient.get<(Category & { post_count: number })[]>(
-      `${this.BASE_PATH}/with-counts/`
+  static async getCategoriesWithPostCount(
+    limit?: number
+  ): Promise<(Category & { posts_count: number })[]> {
+    return await apiClient.get<(Category & { posts_count: number })[]>(
+      `${this.BASE_PATH}/`,
+      { counts: true, limit }
     );
   }
 }
@@ -1,13 +1,35 @@
 import apiClient from '@/lib/api-client';
-import { Comment } from '@/types/api';
+import { Comment, CursorPage } from '@/types/api';
 
 export interface CreateCommentRequest {
   content: string;
+  parent?: number | null;
 }
 
 export class CommentsService {
-  static async getPostComments(postSlug: string): Promise<Comment[]> {
-    return await apiClient.get<Comment[]>(`/posts/${postSlug}/comments/`);
+  static async getPostComments(
+    postSlug: string,
+    params?: {
+      cursor?: string;
+      page_size?: number;
+      since?: string;
+      before?: string;
+    }
+  ): Promise<CursorPage<Comment>> {
+    return await apiClient.get<CursorPage<Comment>>(
+      `/posts/${postSlug}/comments/`,
+      params
+    );
+  }
+
+  static async getCommentReplies(
+    commentId: number,
+    params?: { cursor?: string; page_size?: number; depth?: number }
+  ): Promise<CursorPage<Comment>> {
+    return await apiClient.get<CursorPage<Comment>>(
+      `/posts/comments/${commentId}/replies/`,
+      params
+    );
   }
 
   static async createComment(
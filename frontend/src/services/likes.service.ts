@@ -8,6 +8,11 @@ export interface LikeResponse {
   was_removed?: boolean;
 }
 
+export interface LikeStatus {
+  liked: boolean;
+  likes_count: number;
+}
+
 export class LikesService {
   static async likePost(postSlug: string): Promise<LikeResponse> {
     return await apiClient.post<LikeResponse>(`/posts/${postSlug}/like/`);
@@ -17,11 +22,16 @@ export class LikesService {
     return await apiClient.post<LikeResponse>(`/posts/${postSlug}/unlike/`);
   }
 
-  static async getLikeStatus(
-    postSlug: string
-  ): Promise<{ liked: boolean; likes_count: number }> {
-    return await apiClient.get<{ liked: boolean; likes_count: number }>(
-      `/posts/${postSlug}/like-status/`
+  static async getLikeStatus(postSlug: string): Promise<LikeStatus> {
+    return await apiClient.get<LikeStatus>(`/posts/${postSlug}/like-status/`);
+  }
+
+  static async getLikeStatuses(
+    postSlugs: string[]
+  ): Promise<Record<string, LikeStatus>> {
+    return await apiClient.post<Record<string, LikeStatus>>(
+      '/posts/like-status/',
+      { slugs: postSlugs }
     );
   }
 }
@@ -59,6 +59,18 @@ export class PostsService {
     return await apiClient.get<Post[]>(`${this.BASE_PATH}/featured/`);
   }
 
+  static async getTrendingPosts(params?: {
+    page?: number;
+    category__slug?: string;
+    tags?: string;
+    tags_mode?: 'any' | 'all';
+  }): Promise<PaginatedResponse<Post>> {
+    return await apiClient.get<PaginatedResponse<Post>>(
+      `${this.BASE_PATH}/trending/`,
+      params
+    );
+  }
+
   static async getMyPosts(params?: {
     page?: number;
     page_size?: number;
@@ -40,15 +40,16 @@ export class TagsService {
     await apiClient.delete(`${this.BASE_PATH}/${id}/`);
   }
 
-  static async getTagsWithPostCount(): Promise<
-    (Tag & { post_count: number })[]
-  > {
-    return await apiClient.get<(Tag & { post_count: number })[]>(
-      `${this.BASE_PATH}/with-counts/`
+  static async getTagsWithPostCount(
+    limit?: number
+  ): Promise<(Tag & { posts_count: number })[]> {
+    return await apiClient.get<(Tag & { posts_count: number })[]>(
+      `${this.BASE_PATH}/`,
+      { counts: true, limit }
     );
   }
 
   static async getPopularTags(limit?: number): Promise<Tag[]> {
-    return await apiClient.get<Tag[]>(`${this.BASE_PATH}/popular/`, { limit });
+    return await this.getTagsWithPostCount(limit);
   }
 }
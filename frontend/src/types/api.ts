@@ -29,7 +29,10 @@ export interface Comment {
   content: string;
   user: string; // Username as string
   post: number;
+  parent: number | null;
+  depth: number;
   created_at: string;
+  has_replies: boolean;
 }
 
 export interface Like {
@@ -54,6 +57,7 @@ export interface Post {
   comments_count?: number;
   likes?: Like[];
   likes_count?: number;
+  liked_by_me?: boolean;
   created_at: string;
   updated_at: string;
   published_at?: string;
@@ -67,6 +71,12 @@ export interface PaginatedResponse<T> {
   results: T[];
 }
 
+export interface CursorPage<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
 export interface ApiResponse<T> {
   data: T;
   message?: string;